@@ -0,0 +1 @@
+"""VulcanBox benchmark suite."""
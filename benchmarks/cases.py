@@ -0,0 +1,288 @@
+"""Benchmark cases.
+
+Each case does one unit of work per call and is timed by the runner.
+Cases that touch Docker run against a mocked client, so they measure
+VulcanBox's own overhead rather than the daemon's.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from unittest.mock import MagicMock, patch
+
+from docker.errors import ImageNotFound
+
+from vulcanbox.core.client import close_client
+from vulcanbox.core.templating import render_cache
+
+COMPOSE_COUNTS = (1, 100, 10_000)
+TEMPLATE_FILES_PER_OP = 100
+REPLICAS_PER_OP = 100
+
+
+@dataclass(frozen=True)
+class Case:
+    """A benchmark: `setup` returns the function to time and a cleanup."""
+
+    name: str
+    description: str
+    setup: Callable[[], "Prepared"]
+    # Work items per call, to report throughput
+    ops: int = 1
+
+
+@dataclass
+class Prepared:
+    run: Callable[[], None]
+    cleanup: Optional[Callable[[], None]] = None
+
+
+@contextmanager
+def __working_dir() -> Iterator[str]:
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="vulcanbox-bench-") as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(previous)
+
+
+def __in_temp_dir(prepare: Callable[[str], Callable[[], None]]) -> Prepared:
+    """Run a case inside a temporary working dir, removed on cleanup."""
+    context = __working_dir()
+    directory = context.__enter__()
+    return Prepared(prepare(directory), lambda: context.__exit__(None, None, None))
+
+
+def __template_write_cold() -> Prepared:
+    from vulcanbox.core.models import DockerImage
+
+    def prepare(directory: str) -> Callable[[], None]:
+        def run() -> None:
+            render_cache.clear()
+            for i in range(TEMPLATE_FILES_PER_OP):
+                context = {"base_image": f"alpine:3.{i}", "ports": [8000 + i]}
+                DockerImage(f"app{i}.Dockerfile", context).write()
+
+        return run
+
+    return __in_temp_dir(prepare)
+
+
+def __template_write_unchanged() -> Prepared:
+    from vulcanbox.core.models import DockerImage
+
+    def prepare(directory: str) -> Callable[[], None]:
+        context = {"base_image": "alpine:3.20", "ports": [8000]}
+        for i in range(TEMPLATE_FILES_PER_OP):
+            DockerImage(f"app{i}.Dockerfile", context).write()
+
+        def run() -> None:
+            for i in range(TEMPLATE_FILES_PER_OP):
+                DockerImage(f"app{i}.Dockerfile", context).write()
+
+        return run
+
+    return __in_temp_dir(prepare)
+
+
+def __compose_write(count: int) -> Callable[[], Prepared]:
+    def setup() -> Prepared:
+        from vulcanbox.core.models import DockerCompose
+
+        def prepare(directory: str) -> Callable[[], None]:
+            context = {
+                "image": "app.Dockerfile",
+                "count": count,
+                "port": 22,
+                "with_network": True,
+                "host_ports": list(range(5050, 5050 + count)),
+                "build_mode": "per-service",
+                "image_tag": None,
+                "build": True,
+                "labels": {"io.vulcanbox.managed": "true"},
+                "service_label": "io.vulcanbox.service",
+            }
+
+            def run() -> None:
+                render_cache.clear()
+                if os.path.exists("docker-compose.yml"):
+                    os.remove("docker-compose.yml")
+                DockerCompose(context).write()
+
+            return run
+
+        return __in_temp_dir(prepare)
+
+    return setup
+
+
+def __startup(warm: bool) -> Callable[[], Prepared]:
+    """Time `vulcanbox --help` in a new interpreter.
+
+    Cold runs start from an empty bytecode cache, so every module is
+    compiled; warm runs reuse a cache that was filled before timing.
+    """
+
+    def setup() -> Prepared:
+        cache = tempfile.TemporaryDirectory(prefix="vulcanbox-pycache-")
+        command = [sys.executable, "-c", "from vulcanbox.main import cli; cli()"]
+
+        def run() -> None:
+            env = dict(os.environ)
+            env.pop("PYTHONDONTWRITEBYTECODE", None)
+            if warm:
+                env["PYTHONPYCACHEPREFIX"] = cache.name
+            else:
+                env["PYTHONPYCACHEPREFIX"] = tempfile.mkdtemp(dir=cache.name)
+            subprocess.run(
+                [*command, "--help"],
+                env=env,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+
+        if warm:
+            run()
+        return Prepared(run, cache.cleanup)
+
+    return setup
+
+
+def __build_events() -> List[Dict[str, Any]]:
+    return [
+        {"stream": "Step 1/2 : FROM alpine\n"},
+        {"stream": " ---> a1b2c3d4e5f6\n"},
+        {"stream": 'Step 2/2 : CMD ["/bin/sh"]\n'},
+        {"stream": " ---> Running in 0f9e8d7c6b5a\n"},
+        {"aux": {"ID": "sha256:0123456789ab"}},
+        {"stream": "Successfully built 0123456789ab\n"},
+    ]
+
+
+@contextmanager
+def __mock_client() -> Iterator[MagicMock]:
+    client = MagicMock()
+
+    def get_image(name: str) -> MagicMock:
+        if name.startswith("sha256:"):
+            return MagicMock(id=name, tags=[])
+        raise ImageNotFound(f"No such image: {name}")
+
+    client.images.get.side_effect = get_image
+    client.images.list.return_value = []
+    client.api.build.side_effect = lambda **_: iter(__build_events())
+    client.containers.run.return_value = MagicMock(id="0" * 64)
+    with patch("vulcanbox.core.client.docker") as docker:
+        docker.from_env.return_value = client
+        close_client()
+        yield client
+    close_client()
+
+
+def __with_mock_client(prepare: Callable[[str], Callable[[], None]]) -> Prepared:
+    mock = __mock_client()
+    mock.__enter__()
+    prepared = __in_temp_dir(prepare)
+
+    def cleanup() -> None:
+        prepared.cleanup()
+        mock.__exit__(None, None, None)
+
+    return Prepared(prepared.run, cleanup)
+
+
+def __image_build(cache: str) -> Callable[[], Prepared]:
+    def setup() -> Prepared:
+        from vulcanbox.core.models import BuildCachePolicy, DockerImage
+
+        policy = BuildCachePolicy.parse(cache)
+
+        def prepare(directory: str) -> Callable[[], None]:
+            for i in range(20):
+                with open(f"module{i}.py", "w") as f:
+                    f.write("x = 1\n" * 100)
+            image = DockerImage("app.Dockerfile", {"base_image": "alpine"})
+            image.write()
+
+            def run() -> None:
+                image.build("app", cache=policy, echo=False)
+
+            return run
+
+        return __with_mock_client(prepare)
+
+    return setup
+
+
+def __run_replicas() -> Prepared:
+    from vulcanbox.core.client import get_client
+    from vulcanbox.core.fleet import start_containers
+
+    def prepare(directory: str) -> Callable[[], None]:
+        def run() -> None:
+            start_containers(
+                get_client(), "vulcanbox-app:latest", REPLICAS_PER_OP, "bench", 8
+            )
+
+        return run
+
+    return __with_mock_client(prepare)
+
+
+CASES: List[Case] = [
+    Case(
+        "template_write_cold",
+        "Render and write distinct Dockerfiles with an empty render cache",
+        __template_write_cold,
+        ops=TEMPLATE_FILES_PER_OP,
+    ),
+    Case(
+        "template_write_unchanged",
+        "Re-render Dockerfiles whose contents are unchanged on disk",
+        __template_write_unchanged,
+        ops=TEMPLATE_FILES_PER_OP,
+    ),
+    *[
+        Case(
+            f"compose_write_{count}",
+            f"Render and write a Compose file with {count} services",
+            __compose_write(count),
+        )
+        for count in COMPOSE_COUNTS
+    ],
+    Case("startup_cold", "'vulcanbox --help' with no bytecode cache", __startup(False)),
+    Case("startup_warm", "'vulcanbox --help' with a bytecode cache", __startup(True)),
+    Case(
+        "image_build",
+        "DockerImage.build against a mocked client, cache off",
+        __image_build("off"),
+    ),
+    Case(
+        "image_build_cached",
+        "DockerImage.build against a mocked client, indexed image reused",
+        __image_build("on"),
+    ),
+    Case(
+        "run_replicas",
+        "Start replicas against a mocked client",
+        __run_replicas,
+        ops=REPLICAS_PER_OP,
+    ),
+]
+
+
+def get_cases(names: Optional[List[str]] = None) -> List[Case]:
+    """Get the cases to run, all of them by default."""
+    if not names:
+        return CASES
+    by_name: Dict[str, Case] = {case.name: case for case in CASES}
+    unknown = sorted(set(names) - set(by_name))
+    if unknown:
+        raise KeyError(f"Unknown benchmarks: {', '.join(unknown)}")
+    return [by_name[name] for name in names]
@@ -0,0 +1,588 @@
+"""A fake Docker Engine for load tests.
+
+Serves the subset of the Engine API that VulcanBox uses over a Unix
+socket, keeping images and containers in memory. Builds stream classic
+builder output with a configurable number of log lines and delay per
+step, so parallel builds, fleet launches and log streaming can be load
+tested without a daemon:
+
+    python -m benchmarks.fake_engine --socket /tmp/fake-docker.sock &
+    DOCKER_HOST=unix:///tmp/fake-docker.sock vulcanbox build *.Dockerfile
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import socketserver
+import tarfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+import click
+
+logger = logging.getLogger(__name__)
+
+API_VERSION = "1.45"
+VERSION_PREFIX = re.compile(r"^/v\d+\.\d+")
+
+
+@dataclass
+class EngineConfig:
+    """Simulated costs of the engine."""
+
+    # Delay added to every request
+    latency: float = 0.0
+    # Delay per build step
+    step_seconds: float = 0.0
+    # Log lines streamed per build step
+    log_lines: int = 2
+    # Delay of starting a container
+    start_seconds: float = 0.0
+
+
+@dataclass
+class EngineState:
+    """In-memory images and containers, guarded by one lock."""
+
+    images: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    tags: Dict[str, str] = field(default_factory=dict)
+    containers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    networks: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    built_steps: set = field(default_factory=set)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    requests: int = 0
+
+    def find_image(self, reference: str) -> Optional[Dict[str, Any]]:
+        if ":" not in reference.split("/")[-1] and not reference.startswith("sha256"):
+            reference = f"{reference}:latest"
+        image_id = self.tags.get(reference, reference)
+        if image_id in self.images:
+            return self.images[image_id]
+        matches = [
+            image
+            for image_id, image in self.images.items()
+            if image_id.split(":", 1)[-1].startswith(reference)
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+    def find_container(self, reference: str) -> Optional[Dict[str, Any]]:
+        for container in self.containers.values():
+            if container["Id"].startswith(reference) or container["Name"] == (
+                f"/{reference}"
+            ):
+                return container
+        return None
+
+    def tag_image(self, image: Dict[str, Any], reference: str) -> None:
+        previous = self.tags.get(reference)
+        if previous and previous != image["Id"] and previous in self.images:
+            self.images[previous]["RepoTags"].remove(reference)
+        self.tags[reference] = image["Id"]
+        if reference not in image["RepoTags"]:
+            image["RepoTags"].append(reference)
+
+
+def __matches_labels(labels: Dict[str, str], filters: Dict[str, List[str]]) -> bool:
+    for label in filters.get("label", []):
+        key, _, value = label.partition("=")
+        if key not in labels or (value and labels[key] != value):
+            return False
+    return True
+
+
+def __parse_filters(query: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    raw = query.get("filters", ["{}"])[0]
+    filters = json.loads(raw)
+    # Older clients send {"key": {"value": true}}
+    return {
+        key: list(value) if isinstance(value, (list, dict)) else [value]
+        for key, value in filters.items()
+    }
+
+
+def __parse_dockerfile(context: bytes, dockerfile: str) -> List[str]:
+    """List the instructions of the Dockerfile in a build context."""
+    with tarfile.open(fileobj=io.BytesIO(context)) as archive:
+        member = archive.extractfile(dockerfile)
+        if member is None:
+            raise KeyError(dockerfile)
+        text = member.read().decode("utf-8")
+    instructions = []
+    for line in text.replace("\\\n", " ").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            instructions.append(line)
+    return instructions
+
+
+class EngineHandler(BaseHTTPRequestHandler):
+    """Routes Engine API requests to the shared state."""
+
+    protocol_version = "HTTP/1.1"
+    server: "FakeEngine"
+
+    def address_string(self) -> str:
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format % args)
+
+    def do_GET(self) -> None:
+        self.__dispatch("GET")
+
+    def do_HEAD(self) -> None:
+        self.__dispatch("HEAD")
+
+    def do_POST(self) -> None:
+        self.__dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self.__dispatch("DELETE")
+
+    def __dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        path = VERSION_PREFIX.sub("", unquote(url.path))
+        query = parse_qs(url.query)
+        body = self.__read_body()
+        state, config = self.server.state, self.server.config
+        with state.lock:
+            state.requests += 1
+        if config.latency:
+            time.sleep(config.latency)
+        for route_method, pattern, route in ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                try:
+                    route(self, query, body, *match.groups())
+                except (KeyError, ValueError, tarfile.TarError) as err:
+                    self.send_json(400, {"message": f"bad request: {err}"})
+                return
+        self.send_json(404, {"message": f"page not found: {method} {path}"})
+
+    def __read_body(self) -> bytes:
+        if "chunked" in self.headers.get("Transfer-Encoding", ""):
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def send_json(self, status: int, data: Any) -> None:
+        content = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def send_empty(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_stream(self, events: Iterator[Dict[str, Any]]) -> None:
+        """Stream events as chunked JSON lines, one chunk per event."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in events:
+            data = json.dumps(event).encode("utf-8") + b"\r\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def __ping(handler: EngineHandler, query, body) -> None:
+    content = b"OK"
+    handler.send_response(200)
+    handler.send_header("Api-Version", API_VERSION)
+    handler.send_header("Builder-Version", "1")
+    handler.send_header("Content-Type", "text/plain")
+    handler.send_header("Content-Length", str(len(content)))
+    handler.end_headers()
+    if handler.command != "HEAD":
+        handler.wfile.write(content)
+
+
+def __version(handler: EngineHandler, query, body) -> None:
+    handler.send_json(
+        200,
+        {"ApiVersion": API_VERSION, "MinAPIVersion": "1.24", "Version": "fake"},
+    )
+
+
+def __info(handler: EngineHandler, query, body) -> None:
+    state = handler.server.state
+    handler.send_json(
+        200,
+        {
+            "ServerVersion": "fake",
+            "Driver": "memory",
+            "DockerRootDir": os.path.dirname(handler.server.server_address),
+            "Images": len(state.images),
+            "Containers": len(state.containers),
+        },
+    )
+
+
+def __system_df(handler: EngineHandler, query, body) -> None:
+    state = handler.server.state
+    with state.lock:
+        images = [dict(image) for image in state.images.values()]
+    handler.send_json(
+        200,
+        {
+            "LayersSize": sum(image["Size"] for image in images),
+            "Images": images,
+            "Containers": [],
+            "Volumes": [],
+            "BuildCache": [],
+        },
+    )
+
+
+def __build(handler: EngineHandler, query, body) -> None:
+    state, config = handler.server.state, handler.server.config
+    dockerfile = query.get("dockerfile", ["Dockerfile"])[0]
+    tag = query.get("t", [None])[0]
+    nocache = query.get("nocache", ["false"])[0] in ("1", "true", "True")
+    labels = json.loads(query.get("labels", ["{}"])[0])
+    try:
+        instructions = __parse_dockerfile(body, dockerfile)
+    except KeyError:
+        handler.send_stream(
+            iter([{"error": f"Cannot locate specified Dockerfile: {dockerfile}"}])
+        )
+        return
+
+    def events() -> Iterator[Dict[str, Any]]:
+        layer = hashlib.sha256()
+        total = len(instructions)
+        for number, instruction in enumerate(instructions, start=1):
+            layer.update(instruction.encode("utf-8"))
+            if instruction.upper().startswith(("COPY", "ADD")):
+                layer.update(body)
+            layer_id = layer.hexdigest()
+            yield {"stream": f"Step {number}/{total} : {instruction}\n"}
+            with state.lock:
+                cached = not nocache and layer_id in state.built_steps
+                state.built_steps.add(layer_id)
+            if cached:
+                yield {"stream": " ---> Using cache\n"}
+            elif number > 1:
+                yield {"stream": f" ---> Running in {uuid.uuid4().hex[:12]}\n"}
+                for line in range(config.log_lines):
+                    yield {"stream": f"fake output line {line + 1} of step {number}\n"}
+                if config.step_seconds:
+                    time.sleep(config.step_seconds)
+            yield {"stream": f" ---> {layer_id[:12]}\n"}
+
+        image_id = f"sha256:{layer.hexdigest()}"
+        with state.lock:
+            image = state.images.setdefault(
+                image_id,
+                {
+                    "Id": image_id,
+                    "RepoTags": [],
+                    "Created": int(time.time()),
+                    "Size": len(body),
+                    "Labels": labels,
+                    "Config": {"Labels": labels},
+                },
+            )
+            if tag:
+                state.tag_image(image, tag if ":" in tag else f"{tag}:latest")
+        yield {"aux": {"ID": image_id}}
+        yield {"stream": f"Successfully built {layer.hexdigest()[:12]}\n"}
+        if tag:
+            yield {"stream": f"Successfully tagged {tag}\n"}
+
+    handler.send_stream(events())
+
+
+def __image_inspect(handler: EngineHandler, query, body, reference: str) -> None:
+    state = handler.server.state
+    with state.lock:
+        image = state.find_image(reference)
+        image = dict(image) if image else None
+    if image is None:
+        handler.send_json(404, {"message": f"No such image: {reference}"})
+    else:
+        handler.send_json(200, image)
+
+
+def __image_list(handler: EngineHandler, query, body) -> None:
+    state = handler.server.state
+    filters = __parse_filters(query)
+    references = filters.get("reference", [])
+    with state.lock:
+        images = [
+            dict(image)
+            for image in state.images.values()
+            if __matches_labels(image["Labels"], filters)
+            and (
+                not references
+                or any(
+                    tag.split(":")[0] == reference
+                    for tag in image["RepoTags"]
+                    for reference in references
+                )
+            )
+        ]
+    handler.send_json(200, images)
+
+
+def __image_tag(handler: EngineHandler, query, body, reference: str) -> None:
+    state = handler.server.state
+    with state.lock:
+        image = state.find_image(reference)
+        if image is not None:
+            repo = query["repo"][0]
+            state.tag_image(image, f"{repo}:{query.get('tag', ['latest'])[0]}")
+    if image is None:
+        handler.send_json(404, {"message": f"No such image: {reference}"})
+    else:
+        handler.send_empty(201)
+
+
+def __image_remove(handler: EngineHandler, query, body, reference: str) -> None:
+    state = handler.server.state
+    with state.lock:
+        image = state.find_image(reference)
+        if image is not None:
+            del state.images[image["Id"]]
+            for tag in image["RepoTags"]:
+                state.tags.pop(tag, None)
+    if image is None:
+        handler.send_json(404, {"message": f"No such image: {reference}"})
+    else:
+        handler.send_json(200, [{"Deleted": image["Id"]}])
+
+
+def __container_create(handler: EngineHandler, query, body) -> None:
+    state = handler.server.state
+    config = json.loads(body or b"{}")
+    name = query.get("name", [None])[0]
+    with state.lock:
+        if state.find_image(config.get("Image", "")) is None:
+            handler.send_json(404, {"message": f"No such image: {config.get('Image')}"})
+            return
+        container_id = uuid.uuid4().hex + uuid.uuid4().hex
+        name = name or container_id[:12]
+        if state.find_container(name) is not None:
+            handler.send_json(409, {"message": f"Conflict: name {name} is in use"})
+            return
+        state.containers[container_id] = {
+            "Id": container_id,
+            "Name": f"/{name}",
+            "Image": config.get("Image"),
+            "Created": int(time.time()),
+            "Config": {
+                "Image": config.get("Image"),
+                "Labels": config.get("Labels") or {},
+            },
+            "State": {"Status": "created", "Running": False},
+            "HostConfig": {"LogConfig": {"Type": "json-file"}},
+        }
+    handler.send_json(201, {"Id": container_id, "Warnings": []})
+
+
+def __container_inspect(handler: EngineHandler, query, body, reference: str) -> None:
+    state = handler.server.state
+    with state.lock:
+        container = state.find_container(reference)
+        container = json.loads(json.dumps(container)) if container else None
+    if container is None:
+        handler.send_json(404, {"message": f"No such container: {reference}"})
+    else:
+        handler.send_json(200, container)
+
+
+def __container_state(running: bool) -> Callable:
+    def route(handler: EngineHandler, query, body, reference: str) -> None:
+        state, config = handler.server.state, handler.server.config
+        if running and config.start_seconds:
+            time.sleep(config.start_seconds)
+        with state.lock:
+            container = state.find_container(reference)
+            if container is not None:
+                container["State"] = {
+                    "Status": "running" if running else "exited",
+                    "Running": running,
+                }
+        if container is None:
+            handler.send_json(404, {"message": f"No such container: {reference}"})
+        else:
+            handler.send_empty(204)
+
+    return route
+
+
+def __container_list(handler: EngineHandler, query, body) -> None:
+    state = handler.server.state
+    filters = __parse_filters(query)
+    show_all = query.get("all", ["0"])[0] in ("1", "true", "True")
+    limit = int(query.get("limit", ["-1"])[0])
+    with state.lock:
+        containers = [
+            {
+                "Id": container["Id"],
+                "Names": [container["Name"]],
+                "Image": container["Image"],
+                "Created": container["Created"],
+                "Labels": container["Config"]["Labels"],
+                "State": container["State"]["Status"],
+                "Status": container["State"]["Status"],
+                "SizeRw": 0,
+            }
+            for container in state.containers.values()
+            if __matches_labels(container["Config"]["Labels"], filters)
+            and (show_all or container["State"]["Running"])
+        ]
+    containers.sort(key=lambda container: container["Created"], reverse=True)
+    handler.send_json(200, containers[:limit] if limit > 0 else containers)
+
+
+def __container_remove(handler: EngineHandler, query, body, reference: str) -> None:
+    state = handler.server.state
+    with state.lock:
+        container = state.find_container(reference)
+        if container is not None:
+            del state.containers[container["Id"]]
+    if container is None:
+        handler.send_json(404, {"message": f"No such container: {reference}"})
+    else:
+        handler.send_empty(204)
+
+
+def __network_list(handler: EngineHandler, query, body) -> None:
+    state = handler.server.state
+    filters = __parse_filters(query)
+    with state.lock:
+        networks = [
+            dict(network)
+            for network in state.networks.values()
+            if __matches_labels(network["Labels"], filters)
+        ]
+    handler.send_json(200, networks)
+
+
+def __network_remove(handler: EngineHandler, query, body, reference: str) -> None:
+    state = handler.server.state
+    with state.lock:
+        network = state.networks.pop(reference, None)
+    if network is None:
+        handler.send_json(404, {"message": f"No such network: {reference}"})
+    else:
+        handler.send_empty(204)
+
+
+ROUTES: List[Tuple[str, re.Pattern, Callable]] = [
+    (method, re.compile(f"^{pattern}$"), route)
+    for method, pattern, route in [
+        ("GET", r"/_ping", __ping),
+        ("HEAD", r"/_ping", __ping),
+        ("GET", r"/version", __version),
+        ("GET", r"/info", __info),
+        ("GET", r"/system/df", __system_df),
+        ("POST", r"/build", __build),
+        ("GET", r"/images/json", __image_list),
+        ("GET", r"/images/(.+)/json", __image_inspect),
+        ("POST", r"/images/(.+)/tag", __image_tag),
+        ("DELETE", r"/images/(.+)", __image_remove),
+        ("POST", r"/containers/create", __container_create),
+        ("GET", r"/containers/json", __container_list),
+        ("GET", r"/containers/([^/]+)/json", __container_inspect),
+        ("POST", r"/containers/([^/]+)/start", __container_state(True)),
+        ("POST", r"/containers/([^/]+)/stop", __container_state(False)),
+        ("DELETE", r"/containers/([^/]+)", __container_remove),
+        ("GET", r"/networks", __network_list),
+        ("DELETE", r"/networks/([^/]+)", __network_remove),
+    ]
+]
+
+
+class FakeEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A threaded HTTP server for the fake engine on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, config: Optional[EngineConfig] = None):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        self.config = config or EngineConfig()
+        self.state = EngineState()
+        super().__init__(socket_path, EngineHandler)
+
+    @property
+    def base_url(self) -> str:
+        return f"unix://{self.server_address}"
+
+    def start(self) -> threading.Thread:
+        """Serve on a background thread."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default="/tmp/vulcanbox-fake-docker.sock",
+    show_default=True,
+    help="Unix socket to listen on.",
+)
+@click.option("--latency", type=float, default=0.0, help="Seconds added per request.")
+@click.option("--step-seconds", type=float, default=0.0, help="Seconds per build step.")
+@click.option(
+    "--log-lines", type=int, default=2, help="Log lines streamed per build step."
+)
+@click.option(
+    "--start-seconds", type=float, default=0.0, help="Seconds to start a container."
+)
+def main(
+    socket_path: str,
+    latency: float,
+    step_seconds: float,
+    log_lines: int,
+    start_seconds: float,
+) -> None:
+    """Run a fake Docker Engine until interrupted."""
+    config = EngineConfig(latency, step_seconds, log_lines, start_seconds)
+    engine = FakeEngine(socket_path, config)
+    click.echo(f"Fake Docker Engine listening, use DOCKER_HOST={engine.base_url}")
+    try:
+        engine.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.server_close()
+        os.remove(socket_path)
+        click.echo(f"Served {engine.state.requests} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Run the benchmark suite and compare it against a baseline.
+
+Usage:
+    python -m benchmarks.run [--only NAME ...] [--baseline FILE] [--threshold 0.2]
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+
+from benchmarks.cases import Case, get_cases
+from vulcanbox import __version__
+from vulcanbox.core.cache import CACHE_DIR_ENV_VAR
+from vulcanbox.core.files import atomic_write
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "latest.json")
+
+
+def time_case(case: Case, repeat: int) -> Dict[str, Any]:
+    """Time a case, after one untimed warm-up call."""
+    prepared = case.setup()
+    try:
+        prepared.run()
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            prepared.run()
+            samples.append(time.perf_counter() - start)
+    finally:
+        if prepared.cleanup is not None:
+            prepared.cleanup()
+    median = statistics.median(samples)
+    return {
+        "description": case.description,
+        "median": median,
+        "min": min(samples),
+        "max": max(samples),
+        "repeat": repeat,
+        "ops": case.ops,
+        "ops_per_second": case.ops / median if median else None,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[Tuple[str, float]]:
+    """List cases whose median is more than `threshold` slower than the baseline.
+
+    Returns (name, ratio) pairs, where ratio is current / baseline median.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("median"):
+            continue
+        ratio = result["median"] / previous["median"]
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+@click.command()
+@click.option("--only", multiple=True, help="Run only these benchmarks.")
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Timed runs per benchmark.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    default=DEFAULT_OUTPUT,
+    show_default=True,
+    help="File to write results to as JSON.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Results of an earlier run to compare against.",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.2,
+    show_default=True,
+    help="Allowed slowdown against the baseline, e.g. 0.2 for 20%.",
+)
+def main(
+    only: Tuple[str, ...],
+    repeat: int,
+    output: str,
+    baseline: Optional[str],
+    threshold: float,
+) -> None:
+    """Run the VulcanBox benchmarks."""
+    try:
+        cases = get_cases(list(only))
+    except KeyError as err:
+        raise click.BadParameter(str(err.args[0]), param_hint="--only")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="vulcanbox-bench-cache-") as cache_dir:
+        # Keep the user's caches out of the measurements
+        os.environ[CACHE_DIR_ENV_VAR] = cache_dir
+        for case in cases:
+            result = time_case(case, repeat)
+            results[case.name] = result
+            click.echo(
+                f"{case.name:<26} {result['median'] * 1000:10.2f}ms median "
+                f"({result['min'] * 1000:.2f}-{result['max'] * 1000:.2f}ms)"
+            )
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.time(),
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    atomic_write(output, (json.dumps(report, indent=4) + "\n").encode("utf-8"))
+    click.echo(f"Results written: {output}")
+
+    if baseline:
+        with open(baseline, "r") as f:
+            baseline_results = json.load(f)["results"]
+        regressions = compare(results, baseline_results, threshold)
+        for name, ratio in regressions:
+            click.echo(f"REGRESSION {name}: {ratio:.2f}x the baseline median")
+        if regressions:
+            sys.exit(1)
+        click.echo(f"No regressions beyond {threshold:.0%} against {baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Poetry build script: precompile the bundled Jinja2 templates."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from vulcanbox.core.template_loader import COMPILED_TEMPLATE_DIR, compile_templates
+
+if __name__ == "__main__":
+    count = compile_templates()
+    print(f"Compiled {count} templates to {COMPILED_TEMPLATE_DIR}")
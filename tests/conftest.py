@@ -1,12 +1,15 @@
 import logging
 from copy import deepcopy
-from typing import Generator, List, Tuple
+from typing import Any, Dict, Generator, Iterator, List, Tuple
 from unittest.mock import MagicMock, patch
 
 import pytest
 from click.testing import CliRunner, Result
+from docker.errors import ImageNotFound
 
-from vulcanbox.core.output import ColorHandler
+from vulcanbox.core.cache import CACHE_DIR_ENV_VAR
+from vulcanbox.core.client import close_client
+from vulcanbox.core.output import ColorHandler, set_output_mode
 from vulcanbox.main import cli
 
 
@@ -25,7 +28,11 @@ class TestRunner:
     def run_cli(self, cli_args: List[str]) -> Result:
         """Run the VulcanBox CLI with envs set."""
         env = deepcopy(self.env)
-        return self.__runner.invoke(cli, cli_args, env=env)
+        try:
+            return self.__runner.invoke(cli, cli_args, env=env)
+        finally:
+            # --output sets a process-wide mode; keep it from leaking
+            set_output_mode("text")
 
 
 class MockLogger:
@@ -39,6 +46,16 @@ class MockLogger:
         return self.logger, self.handler
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> str:
+    """Keep each test's on-disk caches out of the user's cache dir."""
+    directory = str(tmp_path_factory.mktemp("cache"))
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, directory)
+    return directory
+
+
 @pytest.fixture
 def runner() -> TestRunner:
     return TestRunner()
@@ -50,12 +67,39 @@ def logger() -> MockLogger:
 
 
 @pytest.fixture
-def mock_datetime() -> Generator[MagicMock, None, None]:
-    with patch("vulcanbox.core.models.dt.datetime") as mock_datetime:
-        yield mock_datetime
+def mock_docker() -> Generator[MagicMock, None, None]:
+    with patch("vulcanbox.core.client.docker") as mock_docker:
+        close_client()
+        yield mock_docker
+        close_client()
+
+
+def build_events(image_id: str = "sha256:0123456789ab") -> List[Dict[str, Any]]:
+    """Decoded events of a successful classic-builder build."""
+    return [
+        {"stream": "Step 1/2 : FROM alpine\n"},
+        {"stream": " ---> a1b2c3d4e5f6\n"},
+        {"stream": 'Step 2/2 : CMD ["/bin/sh"]\n'},
+        {"stream": " ---> Running in 0f9e8d7c6b5a\n"},
+        {"aux": {"ID": image_id}},
+        {"stream": "Successfully built 0123456789ab\n"},
+    ]
 
 
 @pytest.fixture
-def mock_docker() -> Generator[MagicMock, None, None]:
-    with patch("vulcanbox.core.models.docker") as mock_docker:
-        yield mock_docker
+def mock_client(mock_docker: MagicMock) -> MagicMock:
+    """A mocked Docker client with no vulcanbox images, where builds succeed."""
+    client = MagicMock()
+
+    def get_image(name: str) -> MagicMock:
+        if name.startswith("sha256:"):
+            return MagicMock(id=name)
+        raise ImageNotFound(f"No such image: {name}")
+
+    def build(**_) -> Iterator[Dict[str, Any]]:
+        return iter(build_events())
+
+    client.images.get.side_effect = get_image
+    client.api.build.side_effect = build
+    mock_docker.from_env.return_value = client
+    return client
@@ -0,0 +1,23 @@
+import pytest
+
+from benchmarks.cases import get_cases
+from benchmarks.run import compare
+
+
+def test_compare_flags_regressions() -> None:
+    baseline = {"fast": {"median": 1.0}, "slow": {"median": 1.0}, "gone": {}}
+    results = {
+        "fast": {"median": 1.1},
+        "slow": {"median": 1.5},
+        "new": {"median": 9.0},
+    }
+    assert compare(results, baseline, threshold=0.2) == [("slow", 1.5)]
+    assert compare(results, baseline, threshold=0.6) == []
+
+
+def test_get_cases() -> None:
+    names = [case.name for case in get_cases()]
+    assert "compose_write_10000" in names
+    assert [case.name for case in get_cases(["startup_warm"])] == ["startup_warm"]
+    with pytest.raises(KeyError):
+        get_cases(["missing"])
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from pytest import MonkeyPatch
+
+from tests.conftest import TestRunner
+
+
+def test_build_dependency_order(
+    mock_client: MagicMock,
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path(tmp_path, "base.Dockerfile").write_text("FROM alpine\n")
+    Path(tmp_path, "api.Dockerfile").write_text("FROM vulcanbox-base\n")
+    report_path = Path(tmp_path, "build.json")
+
+    result = runner.run_cli(
+        [
+            "build",
+            "api.Dockerfile",
+            "base.Dockerfile",
+            "--build-report",
+            str(report_path),
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    built_tags = [call.kwargs["tag"] for call in mock_client.api.build.call_args_list]
+    assert [tag.split(":")[0] for tag in built_tags] == [
+        "vulcanbox-base",
+        "vulcanbox-api",
+    ]
+    assert "Built 2/2 images" in result.output
+    reports = json.loads(report_path.read_text())
+    assert [report["dockerfile"] for report in reports] == [
+        "api.Dockerfile",
+        "base.Dockerfile",
+    ]
+
+
+def test_build_outside_context(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    (tmp_path / "project").mkdir()
+    outside = Path(tmp_path, "outside.Dockerfile")
+    outside.write_text("FROM alpine\n")
+    monkeypatch.chdir(tmp_path / "project")
+
+    result = runner.run_cli(["build", str(outside)])
+
+    assert result.exit_code == 2
+
+
+def test_build_reports_reused_images(
+    mock_client: MagicMock,
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path(tmp_path, "base.Dockerfile").write_text("FROM alpine\n")
+    args = ["--output", "ndjson", "build", "base.Dockerfile"]
+
+    first = runner.run_cli(args)
+    second = runner.run_cli(args)
+
+    assert first.exit_code == second.exit_code == 0, second.stderr
+    assert mock_client.api.build.call_count == 1
+    statuses = [
+        [
+            event["status"]
+            for event in map(json.loads, result.output.splitlines())
+            if event["event"] == "build_result"
+        ]
+        for result in (first, second)
+    ]
+    assert statuses == [["built"], ["reused"]]
+    assert "reused    base" in second.stderr
+    assert "(1 reused)" in second.stderr
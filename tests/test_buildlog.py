@@ -0,0 +1,165 @@
+import json
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pytest import CaptureFixture, MonkeyPatch
+
+from tests.conftest import TestRunner, build_events
+from vulcanbox.core.buildlog import BuildOutput, BuildReport, BuildStep, StepTimer
+from vulcanbox.core.errors import VulcanBoxRuntimeError
+from vulcanbox.core.models import DockerImage
+
+
+def test_build_output_streams_to_log_file(tmp_path: Path) -> None:
+    log_path = str(tmp_path / "build.log")
+    with BuildOutput(log_path=log_path, echo=False, tail_lines=2) as output:
+        for event in build_events("sha256:feed"):
+            output.feed(event)
+
+    assert output.image_id == "sha256:feed"
+    assert output.error is None
+    assert output.line_count == 5
+    assert list(output.tail) == [
+        " ---> Running in 0f9e8d7c6b5a",
+        "Successfully built 0123456789ab",
+    ]
+    assert Path(log_path).read_text().splitlines()[0] == "Step 1/2 : FROM alpine"
+
+
+def test_build_output_joins_partial_lines() -> None:
+    with BuildOutput(echo=False) as output:
+        output.feed({"stream": "Step 1/1 : FR"})
+        output.feed({"stream": "OM alpine\n --->"})
+        output.feed({"stream": " abc"})
+
+    assert list(output.tail) == ["Step 1/1 : FROM alpine", " ---> abc"]
+
+
+def test_build_output_rate_limits_echo(capsys: CaptureFixture) -> None:
+    output = BuildOutput(echo=True, refresh_interval=3600)
+    output.feed({"stream": "first\n"})
+    output.feed({"stream": "second\n"})
+    assert capsys.readouterr().out == ""
+
+    output.close()
+    assert capsys.readouterr().out == "first\nsecond\n"
+
+
+def test_build_output_flushes_without_further_events(capsys: CaptureFixture) -> None:
+    output = BuildOutput(echo=True, refresh_interval=0.05)
+    output.feed({"stream": "Step 5/9 : RUN make\n"})
+    assert capsys.readouterr().out == ""
+
+    time.sleep(0.3)
+    assert capsys.readouterr().out == "Step 5/9 : RUN make\n"
+    output.close()
+    assert capsys.readouterr().out == ""
+
+
+def test_build_output_records_errors_and_skips_progress() -> None:
+    with BuildOutput(echo=False) as output:
+        output.feed({"status": "Downloading", "progress": "[==>  ]", "id": "abc"})
+        output.feed({"status": "Pull complete", "id": "abc"})
+        output.feed({"error": "The command '/bin/sh -c false' returned 1"})
+
+    assert output.error == "The command '/bin/sh -c false' returned 1"
+    assert list(output.tail) == [
+        "abc: Pull complete",
+        "ERROR: The command '/bin/sh -c false' returned 1",
+    ]
+
+
+def test_build_failure_raises_with_log(
+    mock_client: MagicMock, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    mock_client.api.build.side_effect = lambda **_: iter(
+        [{"stream": "Step 1/1 : RUN false\n"}, {"error": "returned a non-zero code"}]
+    )
+    log_path = str(tmp_path / "build.log")
+    image = DockerImage(name="test.Dockerfile", context={"base_image": "alpine"})
+    image.write()
+
+    with pytest.raises(VulcanBoxRuntimeError, match="returned a non-zero code") as err:
+        image.build("app", log_file=log_path, echo=False)
+
+    assert "Step 1/1 : RUN false" in err.value.help_text
+    assert log_path in err.value.help_text
+    assert "Step 1/1 : RUN false" in Path(log_path).read_text()
+
+
+def test_step_timer_records_timing_and_cache() -> None:
+    ticks = iter([0.0, 0.5, 1.0, 1.25, 4.0, 4.5])
+    timer = StepTimer(clock=lambda: next(ticks))
+    for line in [
+        "Step 1/2 : FROM alpine",
+        " ---> a1b2c3d4e5f6",
+        "Step 2/2 : RUN apk add git",
+        " ---> Using cache",
+        "Successfully built 0123456789ab",
+        "Successfully tagged vulcanbox-app:latest",
+    ]:
+        timer.observe(line)
+
+    assert [step.instruction for step in timer.steps] == [
+        "FROM alpine",
+        "RUN apk add git",
+    ]
+    assert [step.seconds for step in timer.steps] == [1.0, 3.0]
+    assert [step.cached for step in timer.steps] == [None, True]
+
+
+def test_build_report_table() -> None:
+    report = BuildReport(
+        image="vulcanbox-app:abc",
+        dockerfile="app.Dockerfile",
+        seconds=3.5,
+        steps=[
+            BuildStep(1, 2, "FROM alpine", 0.5),
+            BuildStep(2, 2, "RUN " + "x" * 100, 3.0, cached=False),
+        ],
+    )
+    lines = report.format_table().splitlines()
+
+    assert lines[1].split() == ["1/2", "0.50s", "-", "FROM", "alpine"]
+    assert "miss" in lines[2] and lines[2].endswith("...")
+    assert lines[-1].split()[:2] == ["Total", "3.50s"]
+    assert "(0/2 steps cached)" in lines[-1]
+
+
+def test_new_image_build_report(
+    mock_client: MagicMock,
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    report_path = tmp_path / "build.json"
+
+    result = runner.run_cli(
+        [
+            "new",
+            "image",
+            "--name",
+            "test.Dockerfile",
+            "--base",
+            "alpine",
+            "--build",
+            "app",
+            "--build-report",
+            str(report_path),
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "steps cached" in result.output
+    (report,) = json.loads(report_path.read_text())
+    assert report["image"].startswith("vulcanbox-app:")
+    assert report["skipped"] is False
+    assert [step["instruction"] for step in report["steps"]] == [
+        "FROM alpine",
+        'CMD ["/bin/sh"]',
+    ]
+    assert report["steps"][1]["cached"] is False
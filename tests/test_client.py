@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pytest import MonkeyPatch
+
+from vulcanbox.core.client import (
+    DEFAULT_POOL_SIZE,
+    POOL_SIZE_ENV_VAR,
+    get_client,
+    get_pool_size,
+)
+from vulcanbox.core.errors import VulcanBoxInputError
+from vulcanbox.core.models import DockerCompose, DockerImage
+
+
+def test_client_not_created_on_model_init(mock_docker: MagicMock) -> None:
+    DockerImage(name="test.Dockerfile", context={"foo": "bar"})
+    DockerCompose(context={"foo": "bar"})
+    mock_docker.from_env.assert_not_called()
+
+
+def test_client_shared_between_models(mock_docker: MagicMock) -> None:
+    image = DockerImage(name="test.Dockerfile", context={})
+    compose = DockerCompose(context={})
+    assert image.client is compose.client
+    assert get_client() is image.client
+    mock_docker.from_env.assert_called_once_with(max_pool_size=DEFAULT_POOL_SIZE)
+
+
+def test_client_pool_size_from_env(
+    mock_docker: MagicMock, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setenv(POOL_SIZE_ENV_VAR, "32")
+    get_client()
+    mock_docker.from_env.assert_called_once_with(max_pool_size=32)
+
+
+@pytest.mark.parametrize("value", ["many", "0"])
+def test_client_pool_size_invalid(monkeypatch: MonkeyPatch, value: str) -> None:
+    monkeypatch.setenv(POOL_SIZE_ENV_VAR, value)
+    with pytest.raises(VulcanBoxInputError):
+        get_pool_size()
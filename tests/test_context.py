@@ -0,0 +1,106 @@
+import os
+import tarfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from pytest import MonkeyPatch
+
+from vulcanbox.core.context import (
+    DOCKERIGNORE_FILE,
+    digest_build_context,
+    pack_build_context,
+    write_default_dockerignore,
+)
+from vulcanbox.core.models import BuildCachePolicy, DockerImage
+from vulcanbox.core.output import format_size
+
+
+def __make_tree(root: Path) -> None:
+    (root / "app").mkdir()
+    (root / "app" / "main.py").write_text("print('hello')\n")
+    (root / ".git").mkdir()
+    (root / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (root / "data.bin").write_bytes(b"\0" * 1024)
+    (root / "test.Dockerfile").write_text("FROM alpine\n")
+
+
+def __member_names(root: Path, dockerfile: str) -> list:
+    with pack_build_context(str(root), dockerfile) as context:
+        with tarfile.open(fileobj=context.fileobj, mode="r") as archive:
+            return sorted(archive.getnames())
+
+
+def test_pack_context_honors_dockerignore(tmp_path: Path) -> None:
+    __make_tree(tmp_path)
+    (tmp_path / DOCKERIGNORE_FILE).write_text("# comment\n.git\n*.bin\n*.Dockerfile\n")
+
+    names = __member_names(tmp_path, "test.Dockerfile")
+
+    assert "app/main.py" in names
+    assert "test.Dockerfile" in names, "Dockerfile must always be sent"
+    assert not any(name.startswith(".git") for name in names)
+    assert "data.bin" not in names
+
+
+def test_pack_context_reports_size(tmp_path: Path) -> None:
+    __make_tree(tmp_path)
+
+    with pack_build_context(str(tmp_path), "test.Dockerfile") as context:
+        assert context.file_count == 4
+        assert context.size > 1024
+        assert context.fileobj.tell() == 0
+        assert context.dockerfile == "test.Dockerfile"
+
+
+def test_pack_context_digest_ignores_timestamps(tmp_path: Path) -> None:
+    __make_tree(tmp_path)
+    with pack_build_context(str(tmp_path), "test.Dockerfile") as context:
+        first_digest = context.digest
+
+    os.utime(tmp_path / "app" / "main.py", (0, 0))
+    with pack_build_context(str(tmp_path), "test.Dockerfile") as context:
+        assert context.digest == first_digest
+
+    (tmp_path / "app" / "main.py").write_text("print('changed')\n")
+    with pack_build_context(str(tmp_path), "test.Dockerfile") as context:
+        assert context.digest != first_digest
+
+
+def test_digest_matches_packed_context(tmp_path: Path) -> None:
+    __make_tree(tmp_path)
+    (tmp_path / "link").symlink_to("app/main.py")
+    (tmp_path / DOCKERIGNORE_FILE).write_text(".git\n")
+
+    with pack_build_context(str(tmp_path), "test.Dockerfile") as context:
+        assert digest_build_context(str(tmp_path), "test.Dockerfile") == context.digest
+
+
+def test_default_dockerignore_not_overwritten(tmp_path: Path) -> None:
+    assert write_default_dockerignore(str(tmp_path))
+    ignore_file = tmp_path / DOCKERIGNORE_FILE
+    assert ".git" in ignore_file.read_text().splitlines()
+
+    ignore_file.write_text("custom\n")
+    assert not write_default_dockerignore(str(tmp_path))
+    assert ignore_file.read_text() == "custom\n"
+
+
+def test_build_uploads_packed_context(
+    mock_client: MagicMock, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    image = DockerImage(name="test.Dockerfile", context={"base_image": "alpine"})
+    image.write()
+    image.build("test", cache=BuildCachePolicy.parse("off"))
+
+    _, kwargs = mock_client.api.build.call_args
+    assert kwargs["custom_context"] is True
+    assert kwargs["dockerfile"] == "test.Dockerfile"
+    assert "path" not in kwargs
+
+
+def test_format_size() -> None:
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KB"
+    assert format_size(5 * 1024**3) == "5.0 GB"
@@ -1,3 +1,5 @@
+import os
+import subprocess
 from unittest.mock import MagicMock, Mock, patch
 
 from tests.conftest import TestRunner
@@ -60,3 +62,84 @@ def test_doctor_missing_dependencies(
     assert "Vulcanbox Doctor found 3 missing dependencies" in result.output
     for service in services:
         assert f"Install {service}" in result.output
+
+
+@patch("shutil.which")
+@patch("subprocess.run")
+def test_doctor_caches_results(
+    mock_subproc_run: MagicMock,
+    mock_which: MagicMock,
+    runner: TestRunner,
+    tmp_path,
+    monkeypatch,
+) -> None:
+    """Tests that a second run reuses results until --no-cache is passed."""
+    binary = tmp_path / "tool"
+    binary.write_text("")
+    mock_which.return_value = str(binary)
+    plugin = tmp_path / "cli-plugins" / "docker-compose"
+    plugin.parent.mkdir()
+    plugin.write_text("")
+    monkeypatch.setenv("DOCKER_CONFIG", str(tmp_path))
+    mock_subproc_run.side_effect = lambda command, **_: __new_mock_subprocess(
+        command[0]
+    )
+
+    result = runner.run_cli(["doctor"])
+    assert "All 3 dependencies ready" in result.output
+    assert mock_subproc_run.call_count == 3
+
+    result = runner.run_cli(["doctor"])
+    assert "All 3 dependencies ready" in result.output
+    assert "(cached)" in result.output
+    assert mock_subproc_run.call_count == 3
+
+    result = runner.run_cli(["doctor", "--no-cache"])
+    assert "(cached)" not in result.output
+    assert mock_subproc_run.call_count == 6
+
+    # Upgrading the compose plugin invalidates only its check
+    stat = plugin.stat()
+    os.utime(plugin, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    result = runner.run_cli(["doctor"])
+    assert mock_subproc_run.call_count == 7
+    assert mock_subproc_run.call_args.args[0] == ["docker", "compose", "version"]
+
+
+@patch("shutil.which")
+@patch("subprocess.run")
+def test_doctor_skips_cache_without_compose_plugin(
+    mock_subproc_run: MagicMock,
+    mock_which: MagicMock,
+    runner: TestRunner,
+    tmp_path,
+    monkeypatch,
+) -> None:
+    """Tests that 'docker compose' is checked every run if its plugin is not found."""
+    binary = tmp_path / "tool"
+    binary.write_text("")
+    mock_which.return_value = str(binary)
+    mock_subproc_run.side_effect = lambda command, **_: __new_mock_subprocess(
+        command[0]
+    )
+    monkeypatch.setenv("DOCKER_CONFIG", str(tmp_path))
+    monkeypatch.setattr("vulcanbox.doctor.DOCKER_PLUGIN_DIRS", [])
+
+    runner.run_cli(["doctor"])
+    runner.run_cli(["doctor"])
+    assert mock_subproc_run.call_count == 4
+
+
+@patch("subprocess.run")
+def test_doctor_timeout(
+    mock_subproc_run: MagicMock,
+    runner: TestRunner,
+) -> None:
+    """Tests that a hanging check is reported instead of blocking."""
+    mock_subproc_run.side_effect = subprocess.TimeoutExpired("docker", 0.5)
+
+    result = runner.run_cli(["doctor", "--timeout", "0.5"])
+    assert "Docker did not respond within 0.5s" in result.output
+    assert "Vulcanbox Doctor found 3 missing dependencies" in result.output
+    for call in mock_subproc_run.call_args_list:
+        assert call.kwargs["timeout"] == 0.5
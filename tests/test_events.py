@@ -0,0 +1,152 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import click
+from docker.errors import APIError
+from pytest import CaptureFixture, MonkeyPatch
+
+from tests.conftest import TestRunner
+from vulcanbox.core.output import emit_event, set_output_mode
+
+
+def __parse_events(output: str) -> List[Dict[str, Any]]:
+    """Parse NDJSON output, failing on any line that is not an event."""
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def test_emit_event_text_mode(capsys: CaptureFixture) -> None:
+    set_output_mode("text")
+    emit_event("file_written", path="Dockerfile")
+    assert capsys.readouterr().out == ""
+
+
+def test_ndjson_new_image(
+    tmp_path: Path, monkeypatch: MonkeyPatch, runner: TestRunner
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    result = runner.run_cli(
+        [
+            "--output",
+            "ndjson",
+            "new",
+            "image",
+            "--name",
+            "app.Dockerfile",
+            "--base",
+            "alpine",
+        ]
+    )
+
+    assert result.exit_code == 0, result.stderr
+    events = __parse_events(result.output)
+    written = [event for event in events if event["event"] == "file_written"]
+    assert written[0]["path"] == str(tmp_path / "app.Dockerfile")
+    assert written[0]["written"] is True
+    assert events[-1]["event"] == "message"
+    assert events[-1]["level"] == "success"
+    assert "Created new Dockerfile" in result.stderr
+
+
+def test_ndjson_build_steps(
+    mock_client: MagicMock,
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path(tmp_path, "app.Dockerfile").write_text("FROM alpine\n")
+    result = runner.run_cli(["--output", "ndjson", "build", "app.Dockerfile"])
+
+    assert result.exit_code == 0, result.stderr
+    events = __parse_events(result.output)
+    steps = [event for event in events if event["event"] == "build_step"]
+    assert [step["number"] for step in steps] == [1, 2]
+    assert steps[0]["image"].startswith("vulcanbox-app:")
+    finished = [event for event in events if event["event"] == "build_finished"]
+    assert finished[0]["image_id"] == "sha256:0123456789ab"
+
+
+def test_ndjson_error(tmp_path: Path, monkeypatch: MonkeyPatch, runner: TestRunner):
+    monkeypatch.chdir(tmp_path)
+    result = runner.run_cli(
+        [
+            "--output",
+            "ndjson",
+            "new",
+            "compose",
+            "--image",
+            "missing.Dockerfile",
+            "--expose",
+            "22",
+            "--count",
+            "1",
+        ]
+    )
+
+    assert result.exit_code == 2
+    error = __parse_events(result.output)[-1]
+    assert error["event"] == "error"
+    assert error["exit_code"] == 2
+    assert "Specified Dockerfile does not exist" in error["message"]
+
+
+def test_ndjson_refuses_overwrite_prompt(
+    tmp_path: Path, monkeypatch: MonkeyPatch, runner: TestRunner
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path(tmp_path, "app.Dockerfile").touch()
+    Path(tmp_path, "docker-compose.yml").touch()
+    args = ["--output", "ndjson", "new", "compose", "--image", "app.Dockerfile"]
+    args += ["--expose", "22", "--count", "1"]
+
+    result = runner.run_cli(args)
+    assert result.exit_code == 2
+    error = __parse_events(result.output)[-1]
+    assert "Compose file already exists" in error["message"]
+    assert "--force" in error["help"]
+
+    result = runner.run_cli([*args, "--force"])
+    assert result.exit_code == 0, result.stderr
+    assert __parse_events(result.output)[-1]["level"] == "success"
+
+
+def test_ndjson_unexpected_error(mock_client: MagicMock, runner: TestRunner) -> None:
+    mock_client.images.get.side_effect = APIError("daemon exploded")
+    result = runner.run_cli(["--output", "ndjson", "run", "--image", "app"])
+
+    assert isinstance(result.exception, APIError)
+    error = __parse_events(result.output)[-1]
+    assert error["event"] == "error"
+    assert error["type"] == "APIError"
+    assert "daemon exploded" in error["message"]
+
+
+def test_ndjson_disables_prompts(
+    tmp_path: Path, monkeypatch: MonkeyPatch, runner: TestRunner
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    result = runner.run_cli(["--output", "ndjson", "new", "image"])
+
+    assert result.exit_code == 1
+    error = __parse_events(result.output)[-1]
+    assert error["event"] == "error"
+    assert "--name" in error["message"]
+    assert "Prompts are disabled" in error["message"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_ndjson_abort(
+    tmp_path: Path, monkeypatch: MonkeyPatch, runner: TestRunner
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        "vulcanbox.core.models.DockerImage.write", MagicMock(side_effect=click.Abort)
+    )
+    args = ["--output", "ndjson", "new", "image", "--name", "app.Dockerfile"]
+    result = runner.run_cli([*args, "--base", "alpine"])
+
+    assert result.exit_code == 1
+    error = __parse_events(result.output)[-1]
+    assert error == {**error, "event": "error", "message": "Aborted", "exit_code": 1}
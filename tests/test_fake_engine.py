@@ -0,0 +1,83 @@
+from pathlib import Path
+from typing import Iterator, List
+
+import docker
+import pytest
+from pytest import MonkeyPatch
+
+from benchmarks.fake_engine import EngineConfig, FakeEngine
+from tests.conftest import TestRunner
+from vulcanbox.core.client import close_client
+
+
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch: MonkeyPatch) -> Iterator[FakeEngine]:
+    engine = FakeEngine(str(tmp_path / "docker.sock"), EngineConfig(log_lines=3))
+    engine.start()
+    monkeypatch.setenv("DOCKER_HOST", engine.base_url)
+    close_client()
+    yield engine
+    close_client()
+    engine.stop()
+
+
+def test_build_run_and_prune(
+    engine: FakeEngine,
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path(tmp_path, "base.Dockerfile").write_text("FROM alpine\nRUN make\n")
+    Path(tmp_path, "api.Dockerfile").write_text("FROM vulcanbox-base\nCMD serve\n")
+
+    result = runner.run_cli(["build", "base.Dockerfile", "api.Dockerfile"])
+    assert result.exit_code == 0, result.output
+    assert "Built 2/2 images" in result.output
+    assert len(engine.state.images) == 2
+
+    result = runner.run_cli(
+        ["run", "--image", "vulcanbox-api", "--replicas", "4", "--workers", "2"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Started 4/4 containers" in result.output
+    assert all(
+        container["State"]["Running"] for container in engine.state.containers.values()
+    )
+
+    result = runner.run_cli(["prune"])
+    assert result.exit_code == 0, result.output
+    assert engine.state.containers == {}
+    assert engine.state.images == {}
+
+
+def test_build_stream(engine: FakeEngine, tmp_path: Path) -> None:
+    Path(tmp_path, "Dockerfile").write_text("FROM alpine\nRUN make\n")
+    client = docker.DockerClient(base_url=engine.base_url)
+
+    def build(**kwargs) -> List[str]:
+        events = client.api.build(path=str(tmp_path), tag="app", decode=True, **kwargs)
+        return [event.get("stream", "") for event in events]
+
+    first = build()
+    assert first[0] == "Step 1/2 : FROM alpine\n"
+    assert sum(line.startswith("fake output") for line in first) == 3
+    assert " ---> Using cache\n" in build()
+    assert " ---> Using cache\n" not in build(nocache=True)
+    assert client.images.get("app").tags == ["app:latest"]
+    client.close()
+
+
+def test_list_images(
+    engine: FakeEngine,
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path(tmp_path, "app.Dockerfile").write_text("FROM alpine\n")
+    assert runner.run_cli(["build", "app.Dockerfile"]).exit_code == 0
+
+    result = runner.run_cli(["list", "images"])
+    assert result.exit_code == 0, result.output
+    assert "vulcanbox-app" in result.output
@@ -0,0 +1,55 @@
+import json
+import os
+import time
+
+from tests.conftest import TestRunner
+from vulcanbox.core.index import BuildIndex
+
+
+def test_index_put_get(tmp_path) -> None:
+    index = BuildIndex(os.path.join(str(tmp_path), "builds.db"))
+    assert index.get("abc") is None
+
+    index.put("abc", "sha256:1", "vulcanbox-app:abc", "Dockerfile", 12.5)
+    before = time.time()
+    record = index.get("abc")
+    assert record.image_id == "sha256:1"
+    assert record.seconds == 12.5
+    assert record.last_used >= before
+
+    index.put("abc", "sha256:2", "vulcanbox-app:abc", "Dockerfile", None)
+    assert index.get("abc").image_id == "sha256:2"
+
+
+def test_index_find_and_remove(tmp_path) -> None:
+    index = BuildIndex(os.path.join(str(tmp_path), "builds.db"))
+    index.put("abc123", "sha256:1", "vulcanbox-app:abc123", "Dockerfile", 1.0)
+    index.put("def456", "sha256:2", "vulcanbox-api:def456", "api.Dockerfile", 2.0)
+
+    assert [record.digest for record in index.find("vulcanbox-api:def456")] == [
+        "def456"
+    ]
+    assert [record.digest for record in index.find("abc")] == ["abc123"]
+    assert [record.digest for record in index.find("sha256:2")] == ["def456"]
+    assert index.remove(["abc123"]) == 1
+    assert [record.digest for record in index.list()] == ["def456"]
+
+
+def test_builds_cli(runner: TestRunner) -> None:
+    index = BuildIndex()
+    index.put("abc123", "sha256:1", "vulcanbox-app:abc123", "Dockerfile", 3.2)
+
+    result = runner.run_cli(["builds", "list"])
+    assert result.exit_code == 0, result.output
+    assert "vulcanbox-app:abc123" in result.output
+    assert "3.2s" in result.output
+
+    result = runner.run_cli(["builds", "show", "abc", "--format", "json"])
+    assert json.loads(result.output)[0]["image_id"] == "sha256:1"
+
+    result = runner.run_cli(["builds", "forget", "vulcanbox-app:abc123"])
+    assert result.exit_code == 0, result.output
+    assert index.list() == []
+
+    result = runner.run_cli(["builds", "show", "abc"])
+    assert result.exit_code == 2
@@ -0,0 +1,95 @@
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.conftest import TestRunner
+
+
+@pytest.fixture
+def listed_client(mock_client: MagicMock) -> MagicMock:
+    now = int(time.time())
+    mock_client.api.images.return_value = [
+        {
+            "Id": f"sha256:{index:064x}",
+            "RepoTags": [f"vulcanbox-app:{index:012x}"],
+            "Size": 1024 * (index + 1),
+            "Created": now - 3600 * index,
+            "Labels": {"io.vulcanbox.context": f"{index:064x}"},
+        }
+        for index in range(5)
+    ]
+    mock_client.api.containers.return_value = [
+        {
+            "Id": "c" * 64,
+            "Names": ["/vulcanbox-app-f00d-0"],
+            "Image": "vulcanbox-app:latest",
+            "State": "running",
+            "Status": "Up 2 minutes",
+            "SizeRw": 2048,
+            "Created": now - 120,
+            "Labels": {"io.vulcanbox.fleet": "f00d"},
+        }
+    ]
+    return mock_client
+
+
+def test_list_images_paged(listed_client: MagicMock, runner: TestRunner) -> None:
+    result = runner.run_cli(
+        ["list", "images", "--page", "2", "--per-page", "2", "--format", "json"]
+    )
+
+    assert result.exit_code == 0, result.output
+    entries = json.loads(result.output)
+    assert [entry["tags"] for entry in entries] == [
+        ["vulcanbox-app:000000000002"],
+        ["vulcanbox-app:000000000003"],
+    ]
+    assert entries[0]["context"] == f"{2:064x}"
+    filters = listed_client.api.images.call_args.kwargs["filters"]
+    assert filters == {"label": ["io.vulcanbox.managed=true"]}
+
+
+def test_list_images_table(listed_client: MagicMock, runner: TestRunner) -> None:
+    result = runner.run_cli(["list", "images", "--per-page", "1"])
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].split() == ["IMAGE", "ID", "SIZE", "AGE", "CONTEXT"]
+    assert len(lines) == 2
+    assert "vulcanbox-app:000000000000" in lines[1]
+    assert "1.0 KB" in lines[1]
+
+
+def test_list_images_rejects_fleet(
+    listed_client: MagicMock, runner: TestRunner
+) -> None:
+    result = runner.run_cli(["list", "images", "--fleet", "f00d"])
+
+    assert result.exit_code != 0
+    assert "No such option: --fleet" in result.stderr
+    listed_client.api.images.assert_not_called()
+
+
+def test_list_containers(listed_client: MagicMock, runner: TestRunner) -> None:
+    result = runner.run_cli(
+        ["list", "containers", "--fleet", "f00d", "--page", "3", "--per-page", "10"]
+    )
+
+    assert result.exit_code == 0, result.output
+    kwargs = listed_client.api.containers.call_args.kwargs
+    assert kwargs["limit"] == 30
+    assert kwargs["filters"] == {
+        "label": ["io.vulcanbox.managed=true", "io.vulcanbox.fleet=f00d"]
+    }
+
+
+def test_list_containers_table(listed_client: MagicMock, runner: TestRunner) -> None:
+    result = runner.run_cli(["list", "containers"])
+
+    assert result.exit_code == 0, result.output
+    row = result.output.splitlines()[1]
+    assert "vulcanbox-app-f00d-0" in row
+    assert "Up 2 minutes" in row
+    assert "2m" in row
@@ -1,7 +1,13 @@
-import datetime as dt
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from unittest.mock import MagicMock
 
-from vulcanbox.core.models import DockerImage
+import pytest
+from pytest import MonkeyPatch
+
+from vulcanbox.core import context
+from vulcanbox.core.constants import VulcanBoxLabels
+from vulcanbox.core.errors import VulcanBoxInputError, VulcanBoxRuntimeError
+from vulcanbox.core.models import BuildCachePolicy, DockerImage
 
 
 def test_docker_object_properties():
@@ -21,13 +27,141 @@ def test_docker_object_json() -> None:
     assert test_image.json() == expected_json
 
 
-@patch("vulcanbox.core.models.dt.datetime")
-def test_docker_object_container_naming(mock_datetime: MagicMock):
-    # Mock datetime for control
-    fixed_timestamp = "20240801-123456"
-    mock_datetime_instance = MagicMock()
-    mock_datetime_instance.strftime.return_value = fixed_timestamp
-    mock_datetime.now.return_value = mock_datetime_instance
+def test_docker_object_container_naming():
+    digest = "0123456789abcdef" * 4
+    result = DockerImage._DockerImage__get_image_name("Base:latest", digest)
+    assert result == "vulcanbox-base-latest:0123456789ab"
+
+
+@pytest.mark.parametrize(
+    "value, mode, image",
+    [
+        ("on", "on", None),
+        ("off", "off", None),
+        ("from:vulcanbox-app:abc", "from", "vulcanbox-app:abc"),
+    ],
+)
+def test_build_cache_policy_parse(value: str, mode: str, image: str) -> None:
+    policy = BuildCachePolicy.parse(value)
+    assert policy.mode == mode
+    assert policy.image == image
+
+
+@pytest.mark.parametrize("value", ["", "yes", "from:"])
+def test_build_cache_policy_invalid(value: str) -> None:
+    with pytest.raises(VulcanBoxInputError):
+        BuildCachePolicy.parse(value)
+
+
+def __new_built_image(tmp_path: Path, monkeypatch: MonkeyPatch) -> DockerImage:
+    monkeypatch.chdir(tmp_path)
+    image = DockerImage(name="test.Dockerfile", context={"base_image": "alpine"})
+    image.write()
+    return image
+
+
+def test_build_skipped_when_tag_exists(
+    mock_docker: MagicMock, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    mock_client = MagicMock()
+    existing_image = MagicMock()
+    mock_client.images.get.return_value = existing_image
+    mock_docker.from_env.return_value = mock_client
+
+    image = __new_built_image(tmp_path, monkeypatch)
+    assert image.build("app") is existing_image
+    mock_client.api.build.assert_not_called()
+    assert image.image_tag.startswith("vulcanbox-app:")
+
+
+def test_build_tag_stable_for_same_inputs(
+    mock_client: MagicMock, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    image = __new_built_image(tmp_path, monkeypatch)
+    image.build("app")
+    first_tag = image.image_tag
+    image.build("app")
+    assert image.image_tag == first_tag
+
+    Path(tmp_path, "main.py").write_text("print('hello')\n")
+    image.build("app")
+    assert image.image_tag != first_tag
+
+
+def test_build_seeds_cache_from_previous_images(
+    mock_client: MagicMock, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    older = MagicMock(attrs={"Created": "2024-01-01"}, tags=["vulcanbox-app:old"])
+    newer = MagicMock(attrs={"Created": "2024-06-01"}, tags=["vulcanbox-app:new"])
+    mock_client.images.list.return_value = [older, newer]
+
+    image = __new_built_image(tmp_path, monkeypatch)
+    image.build("app")
+
+    mock_client.images.list.assert_called_once_with(name="vulcanbox-app")
+    _, kwargs = mock_client.api.build.call_args
+    assert kwargs["cache_from"] == ["vulcanbox-app:new", "vulcanbox-app:old"]
+    assert kwargs["nocache"] is False
+
+
+def test_build_cache_off_forces_build(
+    mock_client: MagicMock, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    image = __new_built_image(tmp_path, monkeypatch)
+    image.build("app", cache=BuildCachePolicy.parse("off"))
+
+    assert mock_client.images.get.call_count == 1, "only the built image is fetched"
+    mock_client.images.list.assert_not_called()
+    _, kwargs = mock_client.api.build.call_args
+    assert kwargs["nocache"] is True
+    assert kwargs["cache_from"] is None
+
+
+def test_start_requires_build(mock_client: MagicMock) -> None:
+    image = DockerImage(name="test.Dockerfile", context={})
+    with pytest.raises(VulcanBoxRuntimeError, match="has not been built"):
+        image.start()
+    mock_client.containers.run.assert_not_called()
+
+
+def test_start_labels_container(mock_client: MagicMock) -> None:
+    image = DockerImage(name="test.Dockerfile", context={})
+    image.image_tag = "vulcanbox-app:0123456789ab"
+    image.start()
+
+    call = mock_client.containers.run.call_args
+    assert call.args == ("vulcanbox-app:0123456789ab",)
+    assert call.kwargs["detach"]
+    assert call.kwargs["name"].startswith("vulcanbox-app-")
+    assert call.kwargs["labels"][VulcanBoxLabels.MANAGED] == "true"
+    mock_client.containers.run.return_value.logs.assert_not_called()
+
+
+def test_build_labels_image(
+    mock_client: MagicMock, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    image = __new_built_image(tmp_path, monkeypatch)
+    image.build("app")
+
+    labels = mock_client.api.build.call_args.kwargs["labels"]
+    assert labels[VulcanBoxLabels.MANAGED] == "true"
+    assert labels[VulcanBoxLabels.IMAGE] == "vulcanbox-app"
+    assert image.image_tag.endswith(labels[VulcanBoxLabels.CONTEXT][:12])
+
+
+def test_build_reuses_indexed_image(
+    mock_client: MagicMock, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    image = __new_built_image(tmp_path, monkeypatch)
+    image.build("app")
+    assert mock_client.api.build.call_count == 1
+    assert not image.build_report.skipped
 
-    result = DockerImage._DockerImage__get_image_name("base:latest")
-    assert result == f"vulcanbox-base-latest-{fixed_timestamp}"
+    mock_client.images.get.reset_mock()
+    pack_build_context = MagicMock()
+    monkeypatch.setattr(context, "pack_build_context", pack_build_context)
+    image.build("app")
+    assert mock_client.api.build.call_count == 1
+    assert image.build_report.skipped
+    pack_build_context.assert_not_called()
+    mock_client.images.get.assert_called_once_with("sha256:0123456789ab")
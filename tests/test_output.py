@@ -1,8 +1,10 @@
+import logging
 from io import StringIO
 
 from colorama import Fore, Style
 
 from tests.conftest import MockLogger
+from vulcanbox.core.output import ColorHandler, format_age
 
 
 def test_color_handler_debug(logger: MockLogger):
@@ -28,3 +30,30 @@ def test_color_handler_error(logger: MockLogger):
     assert Fore.RED in log_output
     assert Style.RESET_ALL in log_output
     assert "This is an error message" in log_output
+
+
+def test_format_age():
+    assert format_age(5) == "5s"
+    assert format_age(-1) == "0s"
+    assert format_age(150) == "2m"
+    assert format_age(7200) == "2h"
+    assert format_age(3 * 86400 + 5) == "3d"
+
+
+def test_color_handler_does_not_mutate_records():
+    handler = ColorHandler(stream=StringIO())
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello", None, None)
+
+    handler.emit(record)
+    handler.emit(record)
+    assert record.msg == "hello"
+    assert handler.stream.getvalue().count(Fore.GREEN) == 2
+
+
+def test_color_handler_without_color():
+    stream = StringIO()
+    handler = ColorHandler(stream=stream, use_color=False)
+    record = logging.LogRecord("test", logging.ERROR, __file__, 1, "plain", None, None)
+
+    handler.emit(record)
+    assert stream.getvalue() == "plain\n"
@@ -0,0 +1,78 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.conftest import TestRunner
+from vulcanbox.core.perf import measure_host, percentile
+
+
+@pytest.fixture
+def host_client(mock_client: MagicMock, tmp_path) -> MagicMock:
+    """A mocked Docker host with BuildKit, some images and build cache."""
+    mock_client.api.base_url = "http+docker://localhost"
+    mock_client.api.get.return_value.headers = {"Builder-Version": "2"}
+    mock_client.info.return_value = {
+        "ServerVersion": "27.0.1",
+        "Driver": "overlay2",
+        "DockerRootDir": str(tmp_path),
+    }
+    mock_client.df.return_value = {
+        "LayersSize": 3 * 1024**3,
+        "Images": [{"Size": 1}, {"Size": 2}],
+        "BuildCache": [
+            {"Size": 1024, "InUse": True},
+            {"Size": 2048, "InUse": False},
+        ],
+    }
+    return mock_client
+
+
+def test_percentile() -> None:
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 95) == 5.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([], 95) == 0.0
+
+
+def test_measure_host(host_client: MagicMock, monkeypatch, tmp_path) -> None:
+    monkeypatch.delenv("DOCKER_BUILDKIT", raising=False)
+    report = measure_host(host_client, pings=4)
+
+    assert host_client.api.get.call_count == 4
+    host_client.api.get.assert_called_with("http+docker://localhost/_ping")
+    assert len(report.ping_ms) == 4
+    assert report.buildkit
+    assert report.storage_driver == "overlay2"
+    assert report.image_count == 2
+    assert report.build_cache_bytes == 3072
+    assert report.build_cache_reclaimable_bytes == 2048
+    assert report.root_free_bytes is not None
+    assert "3.0 GB" in report.format_table()
+
+
+def test_measure_host_remote_root(host_client: MagicMock, monkeypatch) -> None:
+    monkeypatch.setenv("DOCKER_BUILDKIT", "0")
+    host_client.info.return_value["DockerRootDir"] = "/does/not/exist"
+    report = measure_host(host_client, pings=1)
+
+    assert report.root_free_bytes is None
+    assert not report.buildkit
+    assert "BuildKit is disabled, builds use the legacy builder" in report.warnings
+    assert "unknown" in report.format_table()
+
+
+def test_doctor_perf(host_client: MagicMock, runner: TestRunner, tmp_path) -> None:
+    report_path = tmp_path / "perf.json"
+    result = runner.run_cli(
+        ["doctor", "--perf", "--pings", "3", "--perf-report", str(report_path)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Storage driver" in result.output
+    assert "overlay2" in result.output
+
+    report = json.loads(report_path.read_text())
+    assert len(report["ping_ms"]) == 3
+    assert report["ping_p95_ms"] == max(report["ping_ms"])
+    assert report["build_cache_bytes"] == 3072
@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import Set
+
+import pytest
+from pytest import MonkeyPatch
+
+from vulcanbox.core import ports
+from vulcanbox.core.errors import VulcanBoxInputError, VulcanBoxRuntimeError
+from vulcanbox.core.ports import PortAllocator, PortRange, get_listening_ports
+
+PROC_NET_TCP = """\
+  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid
+   0: 00000000:13BA 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0
+   1: 0100007F:13BB 0100007F:9C40 01 00000000:00000000 00:00000000 00000000     0
+   2: 0100007F:1F90 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0
+"""
+
+
+def __listening(monkeypatch: MonkeyPatch, bound: Set[int]) -> None:
+    monkeypatch.setattr(ports, "get_listening_ports", lambda: set(bound))
+
+
+def test_get_listening_ports_parses_socket_table(tmp_path: Path) -> None:
+    proc_file = tmp_path / "tcp"
+    proc_file.write_text(PROC_NET_TCP)
+    assert get_listening_ports([str(proc_file)]) == {5050, 8080}
+    assert get_listening_ports([str(tmp_path / "missing")]) is None
+
+
+@pytest.mark.parametrize("value", ["5050", "a-b", "6000-5050", "0-10", "1-70000"])
+def test_port_range_invalid(value: str) -> None:
+    with pytest.raises(VulcanBoxInputError):
+        PortRange.parse(value)
+
+
+def test_allocate_skips_bound_and_reserved_ports(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    __listening(monkeypatch, {5050, 5052})
+    allocator = PortAllocator(PortRange.parse("5050-5060"), state_dir=str(tmp_path))
+
+    first = allocator.allocate("fleet-a", 2)
+    second = allocator.allocate("fleet-b", 3)
+
+    assert first == [5051, 5053]
+    assert second == [5054, 5055, 5056]
+
+
+def test_allocate_is_stable_for_same_project(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    __listening(monkeypatch, set())
+    allocator = PortAllocator(PortRange.parse("5050-5060"), state_dir=str(tmp_path))
+    first = allocator.allocate("fleet-a", 3)
+
+    # The fleet is now running and holds its own ports
+    __listening(monkeypatch, set(first))
+    assert allocator.allocate("fleet-a", 3) == first
+    assert allocator.allocate("fleet-a", 4) == first + [5053]
+    assert allocator.allocate("fleet-a", 2) == first[:2]
+
+
+def test_allocate_contiguous_block(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    __listening(monkeypatch, {5052, 5056})
+    allocator = PortAllocator(PortRange.parse("5050-5070"), state_dir=str(tmp_path))
+
+    assert allocator.allocate("fleet-a", 3, contiguous=True) == [5053, 5054, 5055]
+    assert allocator.allocate("fleet-b", 4, contiguous=True) == [5057, 5058, 5059, 5060]
+
+
+def test_allocate_large_fleet(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    __listening(monkeypatch, set(range(10000, 20000, 7)))
+    allocator = PortAllocator(PortRange.parse("10000-20000"), state_dir=str(tmp_path))
+
+    allocated = allocator.allocate("fleet", 5000)
+
+    assert len(set(allocated)) == 5000
+    assert not any(port % 7 == 10000 % 7 for port in allocated)
+
+
+def test_allocate_exhausted(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    __listening(monkeypatch, {5051})
+    allocator = PortAllocator(PortRange.parse("5050-5052"), state_dir=str(tmp_path))
+
+    with pytest.raises(VulcanBoxRuntimeError, match="Only 2 of 3 ports"):
+        allocator.allocate("fleet", 3)
+    with pytest.raises(VulcanBoxRuntimeError, match="No block of 2"):
+        allocator.allocate("fleet", 2, contiguous=True)
+
+
+def test_release_and_deleted_compose_files(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    __listening(monkeypatch, set())
+    allocator = PortAllocator(PortRange.parse("5050-5060"), state_dir=str(tmp_path))
+    compose_file = tmp_path / "docker-compose.yml"
+    compose_file.touch()
+
+    assert allocator.allocate(str(compose_file), 2) == [5050, 5051]
+    assert allocator.allocate("fleet-a", 2) == [5052, 5053]
+    assert allocator.release("fleet-a")
+    assert not allocator.release("fleet-a")
+    assert allocator.allocate("fleet-b", 2) == [5052, 5053]
+
+    compose_file.unlink()
+    assert allocator.allocate("fleet-c", 2) == [5050, 5051]
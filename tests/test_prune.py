@@ -0,0 +1,101 @@
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock, call
+
+import pytest
+from docker.errors import APIError
+
+from tests.conftest import TestRunner
+from vulcanbox.core.ports import PortAllocator, PortRange
+
+
+@pytest.fixture
+def labelled_client(mock_client: MagicMock) -> MagicMock:
+    """A mocked Docker host with a running and a stopped container, a network
+    and an image that has a child image."""
+    mock_client.api.containers.return_value = [
+        {"Id": "c1", "Names": ["/app-1"], "State": "running", "SizeRw": 1024},
+        {"Id": "c2", "Names": ["/app-2"], "State": "exited", "SizeRw": 2048},
+    ]
+    mock_client.api.networks.return_value = [{"Id": "n1", "Name": "private"}]
+    mock_client.api.images.return_value = [
+        {"Id": "sha256:base", "RepoTags": ["vulcanbox-base:latest"], "Size": 4096},
+        {"Id": "sha256:api", "RepoTags": ["vulcanbox-api:latest"], "Size": 8192},
+    ]
+    removed_images: List[str] = []
+
+    def remove_image(image: str, **_) -> None:
+        if image == "sha256:base" and "sha256:api" not in removed_images:
+            raise APIError("conflict: image has dependent child images")
+        removed_images.append(image)
+
+    mock_client.api.remove_image.side_effect = remove_image
+    return mock_client
+
+
+def test_prune_dry_run(labelled_client: MagicMock, runner: TestRunner) -> None:
+    result = runner.run_cli(["prune", "--dry-run"])
+
+    assert result.exit_code == 0, result.output
+    assert "Would remove 2 containers, 1 networks, 2 images" in result.output
+    assert "reclaiming up to 15.0 KB" in result.output
+    labelled_client.api.remove_container.assert_not_called()
+    labelled_client.api.remove_image.assert_not_called()
+    filters = labelled_client.api.containers.call_args.kwargs["filters"]
+    assert filters == {"label": ["io.vulcanbox.managed=true"]}
+
+
+def test_prune(labelled_client: MagicMock, runner: TestRunner) -> None:
+    result = runner.run_cli(["prune"])
+
+    assert result.exit_code == 0, result.output
+    labelled_client.api.stop.assert_called_once_with("c1", timeout=10)
+    labelled_client.api.remove_container.assert_has_calls(
+        [call("c1", v=True), call("c2", v=True)], any_order=True
+    )
+    labelled_client.api.remove_network.assert_called_once_with("n1")
+    assert labelled_client.api.remove_image.call_count == 3
+    assert "Removed 2 containers, 1 networks, 2 images" in result.output
+
+
+def test_down_keeps_images(labelled_client: MagicMock, runner: TestRunner) -> None:
+    result = runner.run_cli(["down", "--fleet", "f00d"])
+
+    assert result.exit_code == 0, result.output
+    labelled_client.api.images.assert_not_called()
+    labelled_client.api.remove_image.assert_not_called()
+    filters = labelled_client.api.containers.call_args.kwargs["filters"]
+    assert filters == {
+        "label": ["io.vulcanbox.managed=true", "io.vulcanbox.fleet=f00d"]
+    }
+
+
+def test_down_reports_failures(labelled_client: MagicMock, runner: TestRunner) -> None:
+    labelled_client.api.remove_network.side_effect = APIError("network in use")
+    result = runner.run_cli(["down"])
+
+    assert result.exit_code == 1
+    assert "network in use" in result.output
+    assert "Removed 2 containers" in result.output
+
+
+def test_down_releases_compose_ports(
+    labelled_client: MagicMock, runner: TestRunner, tmp_path: Path
+) -> None:
+    compose_file = tmp_path / "docker-compose.yml"
+    compose_file.touch()
+    allocator = PortAllocator(PortRange.parse("5050-5060"))
+    allocator.allocate(str(compose_file), 2)
+    labelled_client.api.containers.return_value = [
+        {
+            "Id": "c1",
+            "Names": ["/app-1"],
+            "State": "running",
+            "Labels": {"com.docker.compose.project.config_files": str(compose_file)},
+        }
+    ]
+
+    result = runner.run_cli(["down"])
+
+    assert result.exit_code == 0, result.output
+    assert not allocator.release(str(compose_file))
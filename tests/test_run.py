@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+from docker.errors import APIError
+
+from tests.conftest import TestRunner
+from vulcanbox.core.constants import VulcanBoxLabels
+from vulcanbox.core.fleet import get_container_name
+
+
+def test_container_name() -> None:
+    assert get_container_name("vulcanbox-app:abc", "f00d", 2) == "vulcanbox-app-f00d-2"
+    assert (
+        get_container_name("ghcr.io/org/api:1.0@sha256:ff", "f00d", 0) == "api-f00d-0"
+    )
+
+
+def test_run_replicas(mock_client: MagicMock, runner: TestRunner) -> None:
+    mock_client.images.get.side_effect = None
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def run_container(image: str, **kwargs: Any) -> MagicMock:
+        with lock:
+            running.append(image)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.pop()
+        return MagicMock(id=f"{kwargs['labels'][VulcanBoxLabels.REPLICA]:0>64}")
+
+    mock_client.containers.run.side_effect = run_container
+    result = runner.run_cli(
+        ["run", "--image", "vulcanbox-app:latest", "--replicas", "6", "--workers", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert mock_client.containers.run.call_count == 6
+    assert max(peak) <= 2
+    replicas = set()
+    for call in mock_client.containers.run.call_args_list:
+        labels = call.kwargs["labels"]
+        assert labels[VulcanBoxLabels.MANAGED] == "true"
+        assert labels[VulcanBoxLabels.IMAGE] == "vulcanbox-app:latest"
+        assert call.kwargs["detach"]
+        replicas.add(labels[VulcanBoxLabels.REPLICA])
+    assert replicas == {str(replica) for replica in range(6)}
+    assert "Started 6/6 containers" in result.output
+    assert "p95" in result.output
+
+
+def test_run_reports_failed_replicas(
+    mock_client: MagicMock, runner: TestRunner
+) -> None:
+    mock_client.images.get.side_effect = None
+
+    def run_container(image: str, **kwargs: Any) -> MagicMock:
+        if kwargs["labels"][VulcanBoxLabels.REPLICA] == "1":
+            raise APIError("port is already allocated")
+        return MagicMock(id="0" * 64)
+
+    mock_client.containers.run.side_effect = run_container
+    result = runner.run_cli(["run", "--image", "app", "--replicas", "3"])
+
+    assert result.exit_code == 1
+    assert "Started 2/3 containers" in result.output
+    assert "port is already allocated" in result.output
+
+
+def test_run_missing_image(mock_client: MagicMock, runner: TestRunner) -> None:
+    result = runner.run_cli(["run", "--image", "vulcanbox-missing:latest"])
+    assert result.exit_code == 2
+    mock_client.containers.run.assert_not_called()
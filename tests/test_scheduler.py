@@ -0,0 +1,123 @@
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from vulcanbox.core.errors import VulcanBoxInputError
+from vulcanbox.core.models import DockerImage
+from vulcanbox.core.scheduler import (
+    BuildNode,
+    get_image_name,
+    parse_base_images,
+    plan_builds,
+    run_builds,
+)
+
+
+def __write(path: Path, content: str) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("api.Dockerfile", "api"),
+        ("Dockerfile.worker", "worker"),
+        ("services/web/Dockerfile", "web"),
+    ],
+)
+def test_get_image_name(path: str, expected: str) -> None:
+    assert get_image_name(path) == expected
+
+
+def test_parse_base_images_skips_stages(tmp_path: Path) -> None:
+    dockerfile = __write(
+        tmp_path / "app.Dockerfile",
+        "FROM --platform=linux/amd64 python:3.11 AS build-stage\n"
+        "RUN pip wheel .\n"
+        "from build-stage AS test\n"
+        "FROM vulcanbox-base:latest\n",
+    )
+    assert parse_base_images(dockerfile) == ["python:3.11", "vulcanbox-base:latest"]
+
+
+def test_plan_builds_links_vulcanbox_images(tmp_path: Path) -> None:
+    base = __write(tmp_path / "base.Dockerfile", "FROM ubuntu:22.04\n")
+    api = __write(tmp_path / "api.Dockerfile", "FROM vulcanbox-base\n")
+    worker = __write(tmp_path / "worker.Dockerfile", "FROM vulcanbox-base:abc\n")
+
+    nodes = plan_builds([worker, api, base], DockerImage.get_repository)
+
+    assert nodes["base"].parents == set()
+    assert nodes["api"].parents == {"base"}
+    assert nodes["worker"].parents == {"base"}
+
+
+def test_plan_builds_rejects_cycles(tmp_path: Path) -> None:
+    a = __write(tmp_path / "a.Dockerfile", "FROM vulcanbox-b\n")
+    b = __write(tmp_path / "b.Dockerfile", "FROM vulcanbox-a\n")
+    with pytest.raises(VulcanBoxInputError, match="circular"):
+        plan_builds([a, b], DockerImage.get_repository)
+
+
+def test_plan_builds_rejects_duplicate_names(tmp_path: Path) -> None:
+    first = __write(tmp_path / "one" / "app.Dockerfile", "FROM alpine\n")
+    second = __write(tmp_path / "two" / "app.Dockerfile", "FROM alpine\n")
+    with pytest.raises(VulcanBoxInputError, match="would both build image 'app'"):
+        plan_builds([first, second], DockerImage.get_repository)
+
+
+def __nodes(edges: dict) -> dict:
+    return {
+        name: BuildNode(name, f"{name}.Dockerfile", f"vulcanbox-{name}", [], set(p))
+        for name, p in edges.items()
+    }
+
+
+def test_run_builds_respects_dependencies_and_parallelism() -> None:
+    nodes = __nodes({"base": [], "api": ["base"], "worker": ["base"], "solo": []})
+    finished: List[str] = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def build(node: BuildNode, dependencies: List[str]) -> str:
+        nonlocal active, peak
+        with lock:
+            for parent in node.parents:
+                assert parent in finished
+            assert dependencies == sorted(f"{p}:tag" for p in node.parents)
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+            finished.append(node.name)
+        return f"{node.name}:tag"
+
+    results = run_builds(nodes, build, workers=2)
+
+    assert {result.status for result in results.values()} == {"built"}
+    assert peak == 2
+    assert finished.index("base") < finished.index("api")
+
+
+def test_run_builds_skips_dependents_of_failures() -> None:
+    nodes = __nodes({"base": [], "api": ["base"], "app": ["api"], "solo": []})
+
+    def build(node: BuildNode, dependencies: List[str]) -> str:
+        if node.name == "base":
+            raise RuntimeError("boom")
+        return f"{node.name}:tag"
+
+    results = run_builds(nodes, build, workers=4)
+
+    assert results["base"].status == "failed"
+    assert results["base"].error == "boom"
+    assert results["api"].status == "skipped"
+    assert results["app"].status == "skipped"
+    assert results["solo"].status == "built"
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+STARTUP_BUDGET_ENV_VAR = "VULCANBOX_STARTUP_BUDGET_MS"
+DEFAULT_STARTUP_BUDGET_MS = 100
+HEAVY_MODULES = ["docker", "requests", "jinja2"]
+DOCKER_MODULES = ["docker", "requests"]
+PROJECT_DIR = str(Path(__file__).parents[1])
+
+
+def __run_cli(
+    args: List[str], *python_flags: str, cwd: Optional[str] = None
+) -> subprocess.CompletedProcess:
+    code = (
+        "import sys\n"
+        "from vulcanbox.main import cli\n"
+        "try:\n"
+        f"    cli({args!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    return subprocess.run(
+        [sys.executable, *python_flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": PROJECT_DIR},
+    )
+
+
+def __parse_import_times(stderr: str) -> Dict[str, int]:
+    """Map module name to cumulative import time in microseconds."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative.strip())
+    return times
+
+
+@pytest.mark.parametrize("args", [["--version"], ["--help"], ["new", "--help"]])
+def test_startup_does_not_import_heavy_modules(args: List[str]) -> None:
+    result = __run_cli(args)
+    assert result.stdout.strip().endswith("[]"), result.stdout
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["new", "compose", "--help"],
+        ["new", "image", "--name", "app.Dockerfile", "--base", "alpine"],
+        ["new", "compose", "--image", "app.Dockerfile", "--tag", "app:latest"]
+        + ["--expose", "8080", "--count", "2"],
+    ],
+)
+def test_templating_does_not_import_docker(args: List[str], tmp_path: Path) -> None:
+    result = __run_cli(args, cwd=str(tmp_path))
+    loaded = result.stdout.strip().splitlines()[-1]
+    assert not any(f"'{module}'" in loaded for module in DOCKER_MODULES), loaded
+    if "--help" not in args:
+        assert os.listdir(tmp_path), result.stderr
+
+
+def test_version_import_time_within_budget() -> None:
+    budget_ms = int(
+        os.environ.get(STARTUP_BUDGET_ENV_VAR, str(DEFAULT_STARTUP_BUDGET_MS))
+    )
+    result = __run_cli(["--version"], "-X", "importtime")
+    import_times = __parse_import_times(result.stderr)
+    if "vulcanbox.main" not in import_times:
+        pytest.fail("Import time of vulcanbox.main was not reported")
+    elapsed_ms = import_times["vulcanbox.main"] / 1000
+    assert (
+        elapsed_ms <= budget_ms
+    ), f"Importing vulcanbox.main took {elapsed_ms:.1f}ms (budget {budget_ms}ms)"
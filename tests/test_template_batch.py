@@ -0,0 +1,153 @@
+import json
+import os
+from pathlib import Path
+
+from pytest import LogCaptureFixture, MonkeyPatch
+
+from tests.conftest import TestRunner
+from tests.helpers import assert_files_created, assert_lines_in_file
+
+
+def test_template_batch_sane(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    manifest = Path(os.path.join(str(tmp_path), "envs.yaml"))
+    manifest.write_text(
+        """
+- name: api.Dockerfile
+  tag: null
+  context:
+    base_image: python:3.11
+    ports: [8000]
+- name: envs/worker.Dockerfile
+  context:
+    base_image: ubuntu:22.04
+- name: staging.docker-compose.yml
+  context:
+    image: api.Dockerfile
+    count: 2
+    port: 8000
+    with_network: true
+"""
+    )
+    expected_files = [
+        "api.Dockerfile",
+        "envs/worker.Dockerfile",
+        "staging.docker-compose.yml",
+    ]
+
+    result = runner.run_cli(
+        ["-vv", "new", "batch", "--manifest", str(manifest), "--workers", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert_files_created(str(tmp_path), expected_files)
+    assert_lines_in_file("api.Dockerfile", ["FROM python:3.11", "EXPOSE 8000"])
+    assert_lines_in_file("staging.docker-compose.yml", ["app-2", "private-network"])
+    for file in expected_files:
+        assert file in result.output
+    assert "Rendered 3/3 files" in result.output
+
+
+def test_template_batch_accepts_exported_config(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    exported = {
+        "name": "test.Dockerfile",
+        "tag": None,
+        "context": {"base_image": "ubuntu:20.04", "ports": [5050]},
+    }
+    manifest = Path(os.path.join(str(tmp_path), "envs.json"))
+    manifest.write_text(json.dumps({"files": [exported]}))
+
+    result = runner.run_cli(["new", "batch", "--manifest", str(manifest)])
+
+    assert result.exit_code == 0, result.output
+    assert_lines_in_file("test.Dockerfile", ["FROM ubuntu:20.04", "EXPOSE 5050"])
+
+
+def test_template_batch_invalid_entry(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    manifest = Path(os.path.join(str(tmp_path), "envs.yaml"))
+    manifest.write_text("- name: good.Dockerfile\n- name: bad.txt\n")
+
+    result = runner.run_cli(["new", "batch", "--manifest", str(manifest)])
+
+    assert result.exit_code == 1
+    assert "FAILED" in result.output
+    assert "Rendered 1/2 files" in result.output
+
+
+def test_template_batch_duplicate_names(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+    caplog: LogCaptureFixture,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    manifest = Path(os.path.join(str(tmp_path), "envs.yaml"))
+    manifest.write_text("- name: a.Dockerfile\n- name: a.Dockerfile\n")
+
+    result = runner.run_cli(["-vv", "new", "batch", "--manifest", str(manifest)])
+
+    assert result.exit_code == 2
+    assert "Manifest lists files more than once" in caplog.text
+
+
+def test_template_batch_rerun_unchanged(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    manifest = Path(os.path.join(str(tmp_path), "envs.yaml"))
+    manifest.write_text("- name: a.Dockerfile\n  context:\n    base_image: alpine\n")
+
+    first = runner.run_cli(["new", "batch", "--manifest", str(manifest)])
+    second = runner.run_cli(["new", "batch", "--manifest", str(manifest)])
+
+    assert first.exit_code == second.exit_code == 0
+    assert "(1 written)" in first.output
+    assert "unchanged" in second.output
+    assert "(0 written)" in second.output
+
+
+def test_template_batch_workers_relay_events_and_logs(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+    caplog: LogCaptureFixture,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    manifest = Path(os.path.join(str(tmp_path), "envs.yaml"))
+    manifest.write_text(
+        "".join(
+            f"- name: {name}.Dockerfile\n  context:\n    base_image: alpine\n"
+            for name in ("a", "b", "c", "d")
+        )
+    )
+
+    result = runner.run_cli(
+        ["--output", "ndjson", "-v", "new", "batch", "--manifest", str(manifest)]
+        + ["--workers", "2"]
+    )
+
+    assert result.exit_code == 0, result.stderr
+    events = [json.loads(line) for line in result.output.splitlines()]
+    written = sorted(
+        os.path.basename(event["path"])
+        for event in events
+        if event["event"] == "file_written"
+    )
+    assert written == ["a.Dockerfile", "b.Dockerfile", "c.Dockerfile", "d.Dockerfile"]
+    assert "Wrote to file" in caplog.text
@@ -1,10 +1,12 @@
 import os
 from pathlib import Path
 
+import yaml
 from pytest import LogCaptureFixture, MonkeyPatch
 
 from tests.conftest import TestRunner
 from tests.helpers import assert_files_created, assert_lines_in_file
+from vulcanbox.core import ports
 
 
 def test_template_new_compose_file_sane(
@@ -13,6 +15,7 @@ def test_template_new_compose_file_sane(
     runner: TestRunner,
 ) -> None:
     monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ports, "get_listening_ports", lambda: set())
     dockerfile_mock = Path(os.path.join(str(tmp_path), "mock.Dockerfile"))
     generated_compose = Path(os.path.join(str(tmp_path), "docker-compose.yml"))
     generated_files = [str(dockerfile_mock), str(generated_compose)]
@@ -114,3 +117,109 @@ def test_template_new_compose_priviledged_port(
 
     assert result.exit_code == 2
     assert "Cannot expose port 100 (privileged)" in caplog.text
+
+
+def test_template_new_compose_shared_build(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ports, "get_listening_ports", lambda: set())
+    Path(os.path.join(str(tmp_path), "api.Dockerfile")).touch()
+    generated_compose = os.path.join(str(tmp_path), "docker-compose.yml")
+
+    result = runner.run_cli(
+        [
+            "new",
+            "compose",
+            "--image",
+            "api.Dockerfile",
+            "--count",
+            "50",
+            "--expose",
+            "8080",
+            "--build-mode",
+            "shared",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    with open(generated_compose, "r") as compose_file:
+        services = yaml.safe_load(compose_file)["services"]
+    labels = {
+        "io.vulcanbox.managed": "true",
+        "io.vulcanbox.project": tmp_path.name,
+    }
+    assert services == {
+        "app": {
+            "image": "vulcanbox-api:latest",
+            "build": {
+                "context": ".",
+                "dockerfile": "api.Dockerfile",
+                "labels": labels,
+            },
+            "labels": {**labels, "io.vulcanbox.service": "app"},
+            "deploy": {"replicas": 50},
+            "ports": ["5050-5099:8080"],
+        }
+    }
+
+
+def test_template_new_compose_existing_tag(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    generated_compose = os.path.join(str(tmp_path), "docker-compose.yml")
+
+    result = runner.run_cli(
+        [
+            "new",
+            "compose",
+            "--image",
+            "missing.Dockerfile",
+            "--count",
+            "2",
+            "--tag",
+            "vulcanbox-api:0123456789ab",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    with open(generated_compose, "r") as compose_file:
+        services = yaml.safe_load(compose_file)["services"]
+    assert sorted(services) == ["app-1", "app-2"]
+    for service in services.values():
+        assert service["image"] == "vulcanbox-api:0123456789ab"
+        assert "build" not in service
+
+
+def test_template_new_compose_port_range(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path(os.path.join(str(tmp_path), "api.Dockerfile")).touch()
+    generated_compose = os.path.join(str(tmp_path), "docker-compose.yml")
+    monkeypatch.setattr(ports, "get_listening_ports", lambda: {40001})
+
+    result = runner.run_cli(
+        [
+            "new",
+            "compose",
+            "--image",
+            "api.Dockerfile",
+            "--count",
+            "3",
+            "--port-range",
+            "40000-40010",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert_lines_in_file(
+        generated_compose, ["- 40000:22\n", "- 40002:22\n", "- 40003:22\n"]
+    )
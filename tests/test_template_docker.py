@@ -1,8 +1,10 @@
 import json
 import os
 from pathlib import Path
+from typing import List, Optional
 from unittest.mock import MagicMock
 
+import pytest
 from pytest import LogCaptureFixture, MonkeyPatch
 
 from tests.conftest import TestRunner
@@ -122,8 +124,7 @@ def test_template_new_image_file_already_exists(
 
 
 def test_template_new_image_with_build(
-    mock_datetime: MagicMock,
-    mock_docker: MagicMock,
+    mock_client: MagicMock,
     tmp_path: Path,
     monkeypatch: MonkeyPatch,
     runner: TestRunner,
@@ -131,18 +132,6 @@ def test_template_new_image_with_build(
     monkeypatch.chdir(tmp_path)
     dockerfile_name = "test.Dockerfile"
 
-    # Mock datetime
-    fixed_timestamp = "20240801-123456"
-    mock_datetime_instance = MagicMock()
-    mock_datetime_instance.strftime.return_value = fixed_timestamp
-    mock_datetime.now.return_value = mock_datetime_instance
-
-    # Mock Docker client
-    mock_docker_client = MagicMock()
-    mock_image = MagicMock()
-    mock_docker_client.images.build.return_value = (mock_image, ["some logs"])
-    mock_docker.from_env.return_value = mock_docker_client
-
     result = runner.run_cli(
         [
             "-vv",
@@ -160,6 +149,37 @@ def test_template_new_image_with_build(
     )
 
     assert result.exit_code == 0
+    mock_client.api.build.assert_called_once()
+    _, kwargs = mock_client.api.build.call_args
+    assert kwargs["tag"].startswith("vulcanbox-testing:")
+    assert kwargs["nocache"] is False
+
+
+def test_template_new_image_invalid_cache_mode(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+    caplog: LogCaptureFixture,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    result = runner.run_cli(
+        [
+            "-vv",
+            "new",
+            "image",
+            "--name",
+            "test.Dockerfile",
+            "--build",
+            "testing",
+            "--cache",
+            "sometimes",
+        ]
+    )
+
+    assert result.exit_code == 2
+    assert "Invalid cache mode 'sometimes'" in caplog.text
+    assert not os.path.exists(os.path.join(str(tmp_path), "test.Dockerfile"))
 
 
 def test_template_new_image_json_exported(
@@ -198,3 +218,108 @@ def test_template_new_image_json_exported(
         }
         json_data = json.load(config_file)
         assert json_data == expected_json
+
+
+@pytest.mark.parametrize(
+    "base, manifest, install",
+    [
+        (
+            "python:3.12-slim",
+            "COPY requirements.txt /app/",
+            "--mount=type=cache,target=/root/.cache/pip",
+        ),
+        (
+            "node:20",
+            "COPY package.json package-lock.json* /app/",
+            "--mount=type=cache,target=/root/.npm",
+        ),
+        ("ubuntu:24.04", None, "--mount=type=cache,target=/var/cache/apt"),
+        ("alpine:3.20", None, "--mount=type=cache,target=/etc/apk/cache"),
+    ],
+)
+def test_template_new_image_optimized(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+    base: str,
+    manifest: Optional[str],
+    install: str,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    result = runner.run_cli(
+        [
+            "new",
+            "image",
+            "--name",
+            "test.Dockerfile",
+            "--base",
+            base,
+            "--optimize",
+            "auto",
+            "--package",
+            "curl",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    lines = Path(tmp_path, "test.Dockerfile").read_text().splitlines()
+    assert lines[0] == "# syntax=docker/dockerfile:1"
+    source_copy = lines.index("COPY . /app")
+    assert "curl" in "\n".join(lines[:source_copy])
+    assert any(install in line for line in lines[:source_copy])
+    if manifest is not None:
+        assert lines.index(manifest) < source_copy
+
+
+def test_template_new_image_optimized_without_cache_mounts(
+    mock_client: MagicMock,
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    result = runner.run_cli(
+        [
+            "new",
+            "image",
+            "--name",
+            "test.Dockerfile",
+            "--base",
+            "python:3.12-alpine",
+            "--optimize",
+            "python",
+            "--build",
+            "testing",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    contents = Path(tmp_path, "test.Dockerfile").read_text()
+    assert "--mount" not in contents
+    assert "syntax=" not in contents
+    assert "RUN pip install --no-cache-dir -r requirements.txt" in contents
+    assert contents.index("requirements.txt") < contents.index("COPY . /app")
+    assert 'CMD ["/bin/sh"]' in contents
+
+
+@pytest.mark.parametrize(
+    "args, message",
+    [
+        (["--base", "scratch", "--optimize", "auto"], "Cannot tell the family"),
+        (["--base", "ubuntu:24.04", "--package", "curl"], "only be installed"),
+    ],
+)
+def test_template_new_image_optimized_invalid(
+    tmp_path: Path,
+    monkeypatch: MonkeyPatch,
+    runner: TestRunner,
+    caplog: LogCaptureFixture,
+    args: List[str],
+    message: str,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    result = runner.run_cli(["new", "image", "--name", "test.Dockerfile", *args])
+
+    assert result.exit_code == 2
+    assert message in caplog.text
+    assert not Path(tmp_path, "test.Dockerfile").exists()
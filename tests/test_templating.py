@@ -0,0 +1,248 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from jinja2 import Environment, FileSystemLoader, ModuleLoader
+from pytest import MonkeyPatch
+
+from vulcanbox.core import template_loader
+from vulcanbox.core.files import write_if_changed
+from vulcanbox.core.models import DockerCompose, DockerImage
+from vulcanbox.core.template_loader import (
+    MANIFEST_FILE,
+    TEMPLATE_DIR_ENV_VAR,
+    compile_templates,
+    get_loader,
+)
+from vulcanbox.core.templating import (
+    BaseTemplatedFile,
+    RenderCache,
+    coalesce_chunks,
+    collapse_whitespace,
+    ensure_trailing_newline,
+    get_environment,
+    render_cache,
+)
+
+
+def test_environment_shared_between_files() -> None:
+    image = DockerImage(name="test.Dockerfile", context={})
+    compose = DockerCompose(context={})
+    assert image.env is compose.env
+
+
+def test_bytecode_cache_persisted(
+    tmp_path: Path, monkeypatch: MonkeyPatch, cache_dir: str
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(template_loader, "COMPILED_TEMPLATE_DIR", str(tmp_path))
+    get_environment.cache_clear()
+    render_cache.clear()
+    image = DockerImage(name="test.Dockerfile", context={"base_image": "alpine"})
+    image.write()
+    bytecode_files = os.listdir(os.path.join(cache_dir, "templates"))
+    assert bytecode_files, "No compiled templates were written to the cache dir"
+
+
+def test_render_memoized_for_same_context(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    render_cache.clear()
+    context = {"base_image": "ubuntu:22.04", "ports": [8080]}
+    DockerImage(name="a.Dockerfile", context=context).write()
+    cached_entries = len(render_cache)
+    DockerImage(name="b.Dockerfile", context=dict(context)).write()
+    assert len(render_cache) == cached_entries == 1
+    assert Path("a.Dockerfile").read_text() == Path("b.Dockerfile").read_text()
+
+    DockerImage(name="c.Dockerfile", context={"base_image": "alpine"}).write()
+    assert len(render_cache) == 2
+
+
+def test_render_cache_evicts_least_recently_used() -> None:
+    cache = RenderCache(maxsize=2)
+    cache.put(("a", "1"), "first")
+    cache.put(("b", "2"), "second")
+    assert cache.get(("a", "1")) == "first"
+    cache.put(("c", "3"), "third")
+    assert cache.get(("b", "2")) is None
+    assert cache.get(("a", "1")) == "first"
+    assert cache.get(("c", "3")) == "third"
+
+
+def test_write_skips_unchanged_file(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    image = DockerImage(name="test.Dockerfile", context={"base_image": "alpine"})
+    assert image.write()
+    first_stat = os.stat(image.destination)
+
+    assert not image.write()
+    second_stat = os.stat(image.destination)
+    assert second_stat.st_mtime_ns == first_stat.st_mtime_ns
+    assert second_stat.st_ino == first_stat.st_ino
+
+
+def test_write_replaces_changed_file(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    destination = Path(tmp_path, "test.Dockerfile")
+    destination.write_text("FROM scratch\n")
+    destination.chmod(0o600)
+
+    image = DockerImage(name="test.Dockerfile", context={"base_image": "alpine"})
+    assert image.write()
+    assert "FROM alpine" in destination.read_text()
+    assert destination.stat().st_mode & 0o777 == 0o600
+    assert sorted(os.listdir(tmp_path)) == [".dockerignore", "test.Dockerfile"]
+
+
+def test_precompiled_templates_skip_parsing(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    compiled_dir = str(tmp_path / "compiled")
+    assert compile_templates(compiled_dir) == 2
+    context = {"base_image": "alpine", "ports": [8080]}
+    expected = (
+        Environment(loader=get_loader(compiled_dir=str(tmp_path / "missing")))
+        .get_template("docker/Dockerfile.j2")
+        .render(context)
+    )
+
+    def fail(*_) -> None:
+        raise AssertionError("bundled template source was read")
+
+    monkeypatch.setattr(FileSystemLoader, "get_source", fail)
+    loader = get_loader(compiled_dir=compiled_dir)
+    assert isinstance(loader.loaders[0], ModuleLoader)
+    template = Environment(loader=loader).get_template("docker/Dockerfile.j2")
+    assert template.render(context) == expected
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("version", "0.0.0"), ("digests", {"docker/Dockerfile.j2": "0" * 64})],
+)
+def test_outdated_precompiled_templates_ignored(
+    tmp_path: Path, field: str, value
+) -> None:
+    compiled_dir = tmp_path / "compiled"
+    compile_templates(str(compiled_dir))
+    manifest_file = compiled_dir / MANIFEST_FILE
+    manifest = json.loads(manifest_file.read_text())
+    manifest[field] = value
+    manifest_file.write_text(json.dumps(manifest))
+
+    loader = get_loader(compiled_dir=str(compiled_dir))
+    assert not any(isinstance(each, ModuleLoader) for each in loader.loaders)
+
+
+def test_precompiled_templates_ignored_after_same_size_edit(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    template_dir = tmp_path / "templates"
+    shutil.copytree(template_loader.TEMPLATE_DIR, template_dir)
+    monkeypatch.setattr(template_loader, "TEMPLATE_DIR", str(template_dir))
+    compiled_dir = str(tmp_path / "compiled")
+    compile_templates(compiled_dir)
+
+    dockerfile = template_dir / "docker" / "Dockerfile.j2"
+    source = dockerfile.read_text()
+    edited = source.replace('CMD ["/bin/bash"]', 'CMD ["/bin/zsh" ]')
+    assert edited != source and len(edited) == len(source)
+    dockerfile.write_text(edited)
+
+    loader = get_loader(compiled_dir=compiled_dir)
+    assert not any(isinstance(each, ModuleLoader) for each in loader.loaders)
+
+
+def test_user_template_overrides_bundled(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    override_dir = tmp_path / "templates"
+    (override_dir / "docker").mkdir(parents=True)
+    (override_dir / "docker" / "Dockerfile.j2").write_text(
+        "FROM {{ base_image }}-custom\n"
+    )
+    monkeypatch.setenv(TEMPLATE_DIR_ENV_VAR, str(override_dir))
+    monkeypatch.chdir(tmp_path)
+
+    DockerImage(name="test.Dockerfile", context={"base_image": "alpine"}).write()
+    assert Path("test.Dockerfile").read_text() == "FROM alpine-custom\n"
+    DockerCompose(context={"image": "test.Dockerfile", "count": 1}).write()
+    assert "services:" in Path("docker-compose.yml").read_text()
+
+
+def test_collapse_whitespace() -> None:
+    chunks = ["\n\nFROM alpine  \n", "\n \n", "\nRUN ", "make\t\nCMD", " sh  "]
+    assert "".join(collapse_whitespace(chunks)) == "FROM alpine\n\nRUN make\nCMD sh"
+
+
+def test_coalesce_chunks() -> None:
+    assert list(coalesce_chunks(["ab", "c", "de", "f"], 3)) == ["abc", "def"]
+    assert list(coalesce_chunks(["abcd", "e"], 3)) == ["abcd", "e"]
+
+
+@pytest.mark.parametrize(
+    "chunks, expected",
+    [(["a", "b"], "ab\n"), (["a\n", ""], "a\n"), ([], "\n")],
+)
+def test_ensure_trailing_newline(chunks: list, expected: str) -> None:
+    assert "".join(ensure_trailing_newline(chunks)) == expected
+
+
+@pytest.mark.parametrize(
+    "existing, chunks",
+    [
+        (b"abcdef", [b"abc", b"xyz"]),
+        (b"abcdef", [b"abc"]),
+        (b"abc", [b"abc", b"def"]),
+        (None, [b"abc", b"def"]),
+    ],
+)
+def test_write_if_changed_replaces(tmp_path: Path, existing, chunks) -> None:
+    path = Path(tmp_path, "out.txt")
+    if existing is not None:
+        path.write_bytes(existing)
+    assert write_if_changed(str(path), iter(chunks))
+    assert path.read_bytes() == b"".join(chunks)
+    assert os.listdir(tmp_path) == ["out.txt"]
+
+
+def test_write_if_changed_keeps_identical_file(tmp_path: Path) -> None:
+    path = Path(tmp_path, "out.txt")
+    path.write_bytes(b"abcdef")
+    before = path.stat()
+    assert not write_if_changed(str(path), iter([b"ab", b"cd", b"ef"]))
+    after = path.stat()
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+
+def test_large_render_not_memoized(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    render_cache.clear()
+    context = {"image": "test.Dockerfile", "count": 2000, "port": 8000}
+    compose = DockerCompose(context=context)
+    assert compose.write()
+    assert len(render_cache) == 0
+    assert (
+        Path(compose.destination).read_text().count("dockerfile: test.Dockerfile")
+        == 2000
+    )
+    assert not compose.write()
+
+
+def test_render_cache_keyed_by_whitespace(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    render_cache.clear()
+    context = {"base_image": "alpine", "ports": [8080]}
+    DockerImage(name="a.Dockerfile", context=context).write()
+    BaseTemplatedFile(
+        "b.Dockerfile", "docker", "Dockerfile", context, whitespace=True
+    ).write()
+
+    assert len(render_cache) == 2
+    assert Path("a.Dockerfile").read_text() != Path("b.Dockerfile").read_text()
@@ -0,0 +1,114 @@
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+from vulcanbox.core.errors import VulcanBoxInputError, VulcanBoxRuntimeError
+from vulcanbox.core.output import echo, emit_event, print_success, print_warning
+
+logger = logging.getLogger(__name__)
+
+
+@click.command("build")
+@click.argument(
+    "dockerfiles",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Maximum number of concurrent builds.",
+)
+@click.option(
+    "--cache",
+    type=str,
+    help="Layer cache mode: on, off or from:<image>",
+    default="on",
+    show_default=True,
+)
+@click.option(
+    "--build-report",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File to write a JSON report of per-step build timings to",
+)
+def build(
+    dockerfiles: Tuple[str, ...],
+    workers: int,
+    cache: str,
+    build_report: Optional[str],
+) -> None:
+    """Build Dockerfiles in dependency order, in parallel.
+
+    Dockerfiles that build FROM another one's vulcanbox image are built
+    after it; independent ones are built concurrently.
+    """
+    from vulcanbox.core.buildlog import BuildReport, write_build_report
+    from vulcanbox.core.models import BuildCachePolicy, DockerImage
+    from vulcanbox.core.scheduler import BuildNode, plan_builds, run_builds
+
+    cache_policy = BuildCachePolicy.parse(cache)
+    context_dir = os.getcwd()
+    for dockerfile in dockerfiles:
+        relative_path = os.path.relpath(os.path.abspath(dockerfile), context_dir)
+        if relative_path.startswith(os.pardir):
+            raise VulcanBoxInputError(
+                f"Dockerfile must be inside the build context {context_dir}: {dockerfile}"
+            )
+
+    nodes = plan_builds(dockerfiles, DockerImage.get_repository)
+    for node in nodes.values():
+        parents = ", ".join(sorted(node.parents)) or "-"
+        logger.info(f"Planned {node.name} ({node.dockerfile}), depends on: {parents}")
+
+    reports: Dict[str, BuildReport] = {}
+
+    def build_node(node: BuildNode, dependencies: List[str]) -> str:
+        image = DockerImage(node.dockerfile, context={})
+        image.build(
+            node.name, cache=cache_policy, dependencies=dependencies, echo=False
+        )
+        reports[node.name] = image.build_report
+        return image.image_tag
+
+    start = time.perf_counter()
+    results = run_builds(nodes, build_node, workers)
+    elapsed = time.perf_counter() - start
+
+    statuses: Dict[str, str] = {}
+    for name in nodes:
+        result = results[name]
+        # Images found in the build index or by tag were not rebuilt
+        reused = result.status == "built" and name in reports and reports[name].skipped
+        statuses[name] = "reused" if reused else result.status
+        emit_event(
+            "build_result",
+            name=name,
+            status=statuses[name],
+            seconds=round(result.seconds, 3),
+            tag=result.tag,
+            error=result.error,
+        )
+        echo(f"{result.seconds:8.1f}s  {statuses[name]:<8}  {name}  {result.tag or ''}")
+    if build_report:
+        write_build_report(
+            build_report, [reports[name] for name in nodes if name in reports]
+        )
+    failures = [result for result in results.values() if result.status != "built"]
+    for result in failures:
+        print_warning(f"{result.name}: {result.error}")
+
+    reused_count = sum(1 for status in statuses.values() if status == "reused")
+    echo("-" * 20)
+    echo(
+        f"Built {len(results) - len(failures)}/{len(results)} images "
+        f"({reused_count} reused) in {elapsed:.1f}s ({workers} workers)"
+    )
+    if failures:
+        raise VulcanBoxRuntimeError(f"{len(failures)} images were not built")
+    print_success(f"All {len(results)} images built")
@@ -0,0 +1,97 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import click
+
+from vulcanbox.core.errors import VulcanBoxInputError, VulcanBoxRuntimeError
+from vulcanbox.core.output import echo, emit_event, format_age, print_success
+
+
+@click.group("builds")
+def builds_group() -> None:
+    """Query the local index of built images."""
+    pass
+
+
+@contextmanager
+def __open_index() -> Iterator:
+    import sqlite3
+
+    from vulcanbox.core.index import BuildIndex
+
+    try:
+        yield BuildIndex()
+    except sqlite3.Error as err:
+        raise VulcanBoxRuntimeError(f"Could not read the build index: {err}")
+
+
+def __echo_records(records: List, output_format: str) -> None:
+    for record in records:
+        emit_event("build", **record.to_dict())
+    if output_format == "json":
+        echo(json.dumps([record.to_dict() for record in records], indent=4))
+        return
+    now = time.time()
+    echo(f"{'DIGEST':<12}  {'BUILD':>8}  {'USED':>5}  TAG")
+    for record in records:
+        seconds = "-" if record.seconds is None else f"{record.seconds:.1f}s"
+        echo(
+            f"{record.digest[:12]:<12}  {seconds:>8}  "
+            f"{format_age(now - record.last_used):>5}  {record.tag}"
+        )
+
+
+@builds_group.command("list")
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="Number of builds to show, most recently used first.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "json"]),
+    default="table",
+    show_default=True,
+    help="Output format.",
+)
+def list_builds(limit: int, output_format: str) -> None:
+    """List indexed builds."""
+    with __open_index() as index:
+        records = index.list(limit)
+    __echo_records(records, output_format)
+
+
+@builds_group.command("show")
+@click.argument("reference", type=str)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "json"]),
+    default="table",
+    show_default=True,
+    help="Output format.",
+)
+def show_build(reference: str, output_format: str) -> None:
+    """Show builds by image tag, or by digest or image ID prefix."""
+    with __open_index() as index:
+        records = index.find(reference)
+    if not records:
+        raise VulcanBoxInputError(f"No indexed build matches '{reference}'")
+    __echo_records(records, output_format)
+
+
+@builds_group.command("forget")
+@click.argument("reference", type=str)
+def forget_build(reference: str) -> None:
+    """Remove builds from the index, so their inputs are built again."""
+    with __open_index() as index:
+        records = index.find(reference)
+        if not records:
+            raise VulcanBoxInputError(f"No indexed build matches '{reference}'")
+        removed = index.remove([record.digest for record in records])
+    print_success(f"Removed {removed} builds from the index")
@@ -0,0 +1,238 @@
+"""Streaming build output."""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, Final, List, Optional, Sequence
+
+from vulcanbox.core.files import atomic_write
+from vulcanbox.core.output import echo, emit_event
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAIL_LINES: Final[int] = 50
+DEFAULT_REFRESH_INTERVAL: Final[float] = 0.1
+LOG_BUFFER_SIZE: Final[int] = 64 * 1024
+SUCCESS_PATTERN: Final[re.Pattern] = re.compile(r"^Successfully built ([0-9a-f]+)$")
+STEP_PATTERN: Final[re.Pattern] = re.compile(r"^Step (\d+)/(\d+) : (.*)$")
+INSTRUCTION_WIDTH: Final[int] = 60
+
+
+@dataclass
+class BuildStep:
+    """Timing of one Dockerfile instruction.
+
+    `cached` is None when the builder did not say whether the layer
+    cache was used (e.g. for FROM).
+    """
+
+    number: int
+    total: int
+    instruction: str
+    seconds: float = 0.0
+    cached: Optional[bool] = None
+
+
+class StepTimer:
+    """Times build steps from the classic builder's 'Step N/M' lines."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.steps: List[BuildStep] = []
+        self.__clock = clock
+        self.__started_at: Optional[float] = None
+
+    def observe(self, line: str) -> None:
+        now = self.__clock()
+        match = STEP_PATTERN.match(line)
+        if match:
+            self.__finish_step(now)
+            number, total, instruction = match.groups()
+            self.steps.append(BuildStep(int(number), int(total), instruction))
+            self.__started_at = now
+            return
+        if not self.steps:
+            return
+        text = line.strip()
+        if text == "---> Using cache":
+            self.steps[-1].cached = True
+        elif text.startswith("---> Running in"):
+            self.steps[-1].cached = False
+        elif text.startswith("Successfully built"):
+            self.__finish_step(now)
+
+    def finish(self) -> None:
+        """End timing of the current step, if any."""
+        self.__finish_step(self.__clock())
+
+    def __finish_step(self, now: float) -> None:
+        if self.__started_at is not None and self.steps:
+            self.steps[-1].seconds = now - self.__started_at
+        self.__started_at = None
+
+
+@dataclass
+class BuildReport:
+    """Per-step timing of one image build."""
+
+    image: str
+    dockerfile: str
+    seconds: float
+    skipped: bool = False
+    steps: List[BuildStep] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def format_table(self) -> str:
+        """Format the steps as a table, with a total line."""
+        rows = [f"{'Step':<7} {'Time':>8}  {'Cache':<5}  Instruction"]
+        for step in self.steps:
+            cache = {True: "hit", False: "miss", None: "-"}[step.cached]
+            instruction = step.instruction
+            if len(instruction) > INSTRUCTION_WIDTH:
+                instruction = instruction[: INSTRUCTION_WIDTH - 3] + "..."
+            rows.append(
+                f"{step.number:>3}/{step.total:<3} {step.seconds:>7.2f}s  "
+                f"{cache:<5}  {instruction}"
+            )
+        cached = sum(1 for step in self.steps if step.cached)
+        rows.append(
+            f"{'Total':<7} {self.seconds:>7.2f}s  "
+            f"({cached}/{len(self.steps)} steps cached)"
+        )
+        return "\n".join(rows)
+
+
+def write_build_report(path: str, reports: Sequence[BuildReport]) -> None:
+    """Write build reports as a JSON list, for diffing across runs."""
+    content = json.dumps([report.to_dict() for report in reports], indent=4)
+    atomic_write(path, (content + "\n").encode("utf-8"))
+    logger.info(f"Build report written: {path}")
+
+
+class BuildOutput:
+    """Consumes streamed build events as they arrive.
+
+    Lines are echoed to the terminal in batches, at most once per refresh
+    interval. A timer flushes lines that arrive between events. The last
+    few lines are kept in a bounded tail for error reports. The full log
+    is written to a file rather than kept in memory.
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[str] = None,
+        echo: bool = True,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        image: Optional[str] = None,
+    ) -> None:
+        self.log_path = log_path
+        self.echo = echo
+        self.image = image
+        self.refresh_interval = refresh_interval
+        self.tail: Optional[Deque[str]] = (
+            deque(maxlen=tail_lines) if tail_lines else None
+        )
+        self.image_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.line_count = 0
+        self.steps = StepTimer()
+        self.__log_file = (
+            open(log_path, "w", buffering=LOG_BUFFER_SIZE) if log_path else None
+        )
+        self.__partial = ""
+        self.__pending: List[str] = []
+        self.__last_flush = time.monotonic()
+        self.__flush_lock = threading.Lock()
+        self.__flush_timer: Optional[threading.Timer] = None
+
+    def feed(self, event: Dict[str, Any]) -> None:
+        """Handle one decoded event from the build API."""
+        aux = event.get("aux")
+        if isinstance(aux, dict) and "ID" in aux:
+            self.image_id = aux["ID"]
+        if "error" in event:
+            self.error = str(event["error"]).strip()
+            self.__write(f"ERROR: {self.error}\n")
+        elif "stream" in event:
+            self.__write(event["stream"])
+        elif "status" in event and "progress" not in event:
+            prefix = f"{event['id']}: " if "id" in event else ""
+            self.__write(f"{prefix}{event['status']}\n")
+
+    def flush(self) -> None:
+        """Echo any lines waiting for the next refresh."""
+        with self.__flush_lock:
+            if self.__flush_timer is not None:
+                self.__flush_timer.cancel()
+                self.__flush_timer = None
+            if self.__pending:
+                echo("\n".join(self.__pending))
+                self.__pending.clear()
+            self.__last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self.__partial:
+            self.__write_line(self.__partial)
+            self.__partial = ""
+        self.steps.finish()
+        if self.echo:
+            self.flush()
+        if self.__log_file is not None:
+            self.__log_file.close()
+            self.__log_file = None
+
+    def __enter__(self) -> "BuildOutput":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __write(self, text: str) -> None:
+        """Split streamed text into lines, holding back an unfinished line."""
+        lines = (self.__partial + text).split("\n")
+        self.__partial = lines.pop()
+        for line in lines:
+            self.__write_line(line.rstrip("\r"))
+
+    def __write_line(self, line: str) -> None:
+        self.line_count += 1
+        step_count = len(self.steps.steps)
+        self.steps.observe(line)
+        if len(self.steps.steps) > step_count:
+            step = self.steps.steps[-1]
+            emit_event(
+                "build_step",
+                image=self.image,
+                number=step.number,
+                total=step.total,
+                instruction=step.instruction,
+            )
+        if self.image_id is None:
+            match = SUCCESS_PATTERN.match(line.strip())
+            if match:
+                self.image_id = match.group(1)
+        if self.__log_file is not None:
+            self.__log_file.write(line + "\n")
+        if self.tail is not None:
+            self.tail.append(line)
+        if self.echo:
+            self.__echo_line(line)
+
+    def __echo_line(self, line: str) -> None:
+        """Queue a line, flushing now or arming a timer for the next refresh."""
+        with self.__flush_lock:
+            self.__pending.append(line)
+            wait = self.refresh_interval - (time.monotonic() - self.__last_flush)
+            if wait > 0:
+                if self.__flush_timer is None:
+                    self.__flush_timer = threading.Timer(wait, self.flush)
+                    self.__flush_timer.daemon = True
+                    self.__flush_timer.start()
+                return
+        self.flush()
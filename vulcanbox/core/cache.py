@@ -0,0 +1,46 @@
+"""On-disk cache locations for VulcanBox."""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Final, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV_VAR: Final[str] = "VULCANBOX_CACHE_DIR"
+
+
+def get_cache_root() -> str:
+    """Get the root VulcanBox cache directory.
+
+    Uses VULCANBOX_CACHE_DIR if set, otherwise the XDG user cache dir.
+    """
+    root = os.environ.get(CACHE_DIR_ENV_VAR)
+    if root:
+        return root
+    user_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(user_cache, "vulcanbox")
+
+
+def get_cache_dir(*subdirs: str) -> Optional[str]:
+    """Get a cache subdirectory, creating it if needed.
+
+    Returns None if the directory cannot be created, so callers can run
+    without a persistent cache on read-only hosts.
+    """
+    path = os.path.join(get_cache_root(), *subdirs)
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as err:
+        logger.debug(f"Cache directory unavailable ({path}): {err}")
+        return None
+    return path
+
+
+def hash_json(data: Any) -> str:
+    """Get a stable SHA-256 digest of JSON-serializable data."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
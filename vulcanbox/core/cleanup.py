@@ -0,0 +1,184 @@
+"""Finding and removing the Docker objects VulcanBox created."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Final, List, Optional, Set
+
+from docker.errors import APIError, NotFound
+
+from vulcanbox.core.constants import VulcanBoxLabels
+from vulcanbox.core.output import emit_event
+
+logger = logging.getLogger(__name__)
+
+CONTAINER: Final[str] = "container"
+NETWORK: Final[str] = "network"
+IMAGE: Final[str] = "image"
+DEFAULT_STOP_TIMEOUT: Final[int] = 10
+COMPOSE_FILES_LABEL: Final[str] = "com.docker.compose.project.config_files"
+
+
+@dataclass(frozen=True)
+class Resource:
+    """A labelled container, network or image on the Docker host.
+
+    `compose_file` is set for containers started from a Compose file.
+    """
+
+    kind: str
+    id: str
+    name: str
+    size: int = 0
+    running: bool = False
+    compose_file: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Removal:
+    resource: Resource
+    error: Optional[str] = None
+
+    @property
+    def removed(self) -> bool:
+        return self.error is None
+
+
+def get_label_filters(
+    fleet: Optional[str] = None, project: Optional[str] = None
+) -> List[str]:
+    """Get the label filters matching vulcanbox objects, optionally narrowed."""
+    filters = [f"{VulcanBoxLabels.MANAGED}=true"]
+    if fleet:
+        filters.append(f"{VulcanBoxLabels.FLEET}={fleet}")
+    if project:
+        filters.append(f"{VulcanBoxLabels.PROJECT}={project}")
+    return filters
+
+
+def find_resources(
+    client: Any, label_filters: List[str], include_images: bool
+) -> List[Resource]:
+    """List matching objects with one filtered API call per object type.
+
+    Args:
+        client (docker.DockerClient): Client of the daemon to search.
+        label_filters (List[str]): Labels, as 'key=value', that must all match.
+        include_images (bool): Whether to list images as well.
+    """
+    filters = {"label": label_filters}
+    resources = [
+        Resource(
+            CONTAINER,
+            container["Id"],
+            (container.get("Names") or [container["Id"][:12]])[0].lstrip("/"),
+            size=container.get("SizeRw") or 0,
+            running=container.get("State") == "running",
+            compose_file=__get_compose_file(container),
+        )
+        for container in client.api.containers(all=True, size=True, filters=filters)
+    ]
+    resources.extend(
+        Resource(NETWORK, network["Id"], network["Name"])
+        for network in client.api.networks(filters=filters)
+    )
+    if include_images:
+        resources.extend(
+            Resource(
+                IMAGE,
+                image["Id"],
+                (image.get("RepoTags") or [image["Id"]])[0],
+                size=image.get("Size") or 0,
+            )
+            for image in client.api.images(filters=filters)
+        )
+    return resources
+
+
+def get_released_compose_files(removals: List["Removal"]) -> Set[str]:
+    """Get the compose files whose containers were all removed."""
+    removed, kept = set(), set()
+    for removal in removals:
+        if removal.resource.compose_file:
+            (removed if removal.removed else kept).add(removal.resource.compose_file)
+    return removed - kept
+
+
+def __get_compose_file(container: Dict[str, Any]) -> Optional[str]:
+    config_files = (container.get("Labels") or {}).get(COMPOSE_FILES_LABEL)
+    return config_files.split(",")[0] if config_files else None
+
+
+def remove_resources(
+    client: Any,
+    resources: List[Resource],
+    workers: int,
+    stop_timeout: int = DEFAULT_STOP_TIMEOUT,
+) -> List[Removal]:
+    """Stop and remove objects concurrently.
+
+    Containers go first, since networks and images cannot be removed
+    while containers use them. Images that still have child images are
+    retried once their children are gone.
+    """
+
+    def remove_container(resource: Resource) -> None:
+        if resource.running:
+            client.api.stop(resource.id, timeout=stop_timeout)
+        client.api.remove_container(resource.id, v=True)
+
+    def remove_network(resource: Resource) -> None:
+        client.api.remove_network(resource.id)
+
+    def remove_image(resource: Resource) -> None:
+        client.api.remove_image(resource.id, force=True)
+
+    removals: List[Removal] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def remove_all(
+            batch: List[Resource], remove: Callable[[Resource], None]
+        ) -> List[Removal]:
+            return list(executor.map(lambda item: __remove(item, remove), batch))
+
+        containers = [item for item in resources if item.kind == CONTAINER]
+        removals.extend(remove_all(containers, remove_container))
+        networks = [item for item in resources if item.kind == NETWORK]
+        removals.extend(remove_all(networks, remove_network))
+
+        pending = [item for item in resources if item.kind == IMAGE]
+        while pending:
+            results = remove_all(pending, remove_image)
+            failed = [removal.resource for removal in results if not removal.removed]
+            if len(failed) == len(pending):
+                removals.extend(results)
+                break
+            removals.extend(removal for removal in results if removal.removed)
+            pending = failed
+    return removals
+
+
+def __remove(resource: Resource, remove: Callable[[Resource], None]) -> Removal:
+    try:
+        remove(resource)
+    except NotFound:
+        logger.debug(f"{resource.kind.capitalize()} {resource.name} is already gone")
+    except APIError as err:
+        logger.debug(f"Failed to remove {resource.kind} {resource.name}", exc_info=True)
+        __emit_removal(resource, str(err))
+        return Removal(resource, error=str(err))
+    logger.info(f"Removed {resource.kind} {resource.name}")
+    __emit_removal(resource, None)
+    return Removal(resource)
+
+
+def __emit_removal(resource: Resource, error: Optional[str]) -> None:
+    emit_event(
+        "resource_removed",
+        kind=resource.kind,
+        id=resource.id,
+        name=resource.name,
+        size=resource.size,
+        removed=error is None,
+        error=error,
+    )
@@ -0,0 +1,67 @@
+"""Shared Docker client for VulcanBox."""
+
+import logging
+import os
+import threading
+from typing import Final, Optional
+
+import docker
+from docker.errors import DockerException
+
+from vulcanbox.core.errors import VulcanBoxInputError, VulcanBoxRuntimeError
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE_ENV_VAR: Final[str] = "VULCANBOX_DOCKER_POOL_SIZE"
+DEFAULT_POOL_SIZE: Final[int] = 10
+
+__client: Optional[docker.DockerClient] = None
+__client_lock = threading.Lock()
+
+
+def get_pool_size() -> int:
+    """Get the HTTP connection pool size for the Docker client."""
+    value = os.environ.get(POOL_SIZE_ENV_VAR, "")
+    if not value:
+        return DEFAULT_POOL_SIZE
+    try:
+        pool_size = int(value)
+    except ValueError:
+        raise VulcanBoxInputError(
+            f"{POOL_SIZE_ENV_VAR} must be an integer but got '{value}'"
+        )
+    if pool_size < 1:
+        raise VulcanBoxInputError(
+            f"{POOL_SIZE_ENV_VAR} must be at least 1 but got {pool_size}"
+        )
+    return pool_size
+
+
+def get_client() -> docker.DockerClient:
+    """Get the process-wide Docker client, connecting on first use."""
+    global __client
+    if __client is None:
+        with __client_lock:
+            if __client is None:
+                __client = __create_client(get_pool_size())
+    return __client
+
+
+def close_client() -> None:
+    """Close the shared Docker client, if one was opened."""
+    global __client
+    with __client_lock:
+        if __client is not None:
+            __client.close()
+            __client = None
+
+
+def __create_client(pool_size: int) -> docker.DockerClient:
+    logger.debug(f"Connecting to Docker daemon (pool size {pool_size})")
+    try:
+        return docker.from_env(max_pool_size=pool_size)
+    except DockerException as err:
+        raise VulcanBoxRuntimeError(
+            f"Could not connect to the Docker daemon: {err}",
+            help_text="Make sure Docker is installed and running; see 'vulcanbox doctor'.",
+        )
@@ -1,6 +1,6 @@
 import logging
 from dataclasses import dataclass
-from typing import Final
+from typing import Final, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -19,3 +19,53 @@ class ConsoleIcons:
 
     CHECK: Final[str] = "\u2713"
     CROSS: Final[str] = "\u2715"
+
+
+@dataclass(frozen=True)
+class VulcanBoxLabels:
+    """Labels put on the Docker objects VulcanBox creates."""
+
+    MANAGED: Final[str] = "io.vulcanbox.managed"
+    IMAGE: Final[str] = "io.vulcanbox.image"
+    FLEET: Final[str] = "io.vulcanbox.fleet"
+    REPLICA: Final[str] = "io.vulcanbox.replica"
+    CONTEXT: Final[str] = "io.vulcanbox.context"
+    PROJECT: Final[str] = "io.vulcanbox.project"
+    SERVICE: Final[str] = "io.vulcanbox.service"
+
+
+@dataclass(frozen=True)
+class BaseImageFamily:
+    """Base image families with an optimized Dockerfile layout."""
+
+    PYTHON: Final[str] = "python"
+    NODE: Final[str] = "node"
+    APT: Final[str] = "apt"
+    APK: Final[str] = "apk"
+
+
+BASE_IMAGE_FAMILIES: Final[Tuple[str, ...]] = (
+    BaseImageFamily.PYTHON,
+    BaseImageFamily.NODE,
+    BaseImageFamily.APT,
+    BaseImageFamily.APK,
+)
+
+DEFAULT_DOCKERIGNORE: Final[Tuple[str, ...]] = (
+    "# Generated by VulcanBox",
+    ".git",
+    ".hg",
+    ".svn",
+    "**/__pycache__",
+    "**/*.py[cod]",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    "node_modules",
+    "*.log",
+    ".DS_Store",
+    "vulcanbox-*.json",
+)
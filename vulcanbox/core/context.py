@@ -0,0 +1,183 @@
+"""Docker build context packing."""
+
+import hashlib
+import io
+import logging
+import os
+import tarfile
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import IO, Final, Iterator, List, Tuple
+
+from vulcanbox.core.constants import DEFAULT_DOCKERIGNORE
+from vulcanbox.core.errors import VulcanBoxRuntimeError
+from vulcanbox.core.files import DIGEST_CHUNK_SIZE, atomic_write
+from vulcanbox.core.output import format_size
+
+logger = logging.getLogger(__name__)
+
+DOCKERIGNORE_FILE: Final[str] = ".dockerignore"
+SPOOL_MAX_SIZE: Final[int] = 16 * 1024 * 1024
+
+
+class _HashingReader:
+    """File wrapper that feeds everything read through a digest."""
+
+    def __init__(self, fileobj: IO[bytes], digest: "hashlib._Hash") -> None:
+        self.fileobj = fileobj
+        self.digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.digest.update(data)
+        return data
+
+
+@dataclass
+class BuildContext:
+    """A packed build context, ready to be streamed to the daemon."""
+
+    fileobj: IO[bytes]
+    dockerfile: str
+    digest: str
+    size: int
+    file_count: int
+    seconds: float
+
+    def close(self) -> None:
+        self.fileobj.close()
+
+    def __enter__(self) -> "BuildContext":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def read_dockerignore(root: str) -> List[str]:
+    """Read the .dockerignore patterns in a context directory."""
+    path = os.path.join(root, DOCKERIGNORE_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        lines = [line.strip() for line in f.read().splitlines()]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def write_default_dockerignore(directory: str) -> bool:
+    """Create a default .dockerignore if the directory does not have one.
+
+    Returns:
+        bool: True if a new .dockerignore was written.
+    """
+    path = os.path.join(directory, DOCKERIGNORE_FILE)
+    if os.path.exists(path):
+        return False
+    content = "\n".join(DEFAULT_DOCKERIGNORE) + "\n"
+    atomic_write(path, content.encode("utf-8"))
+    logger.info(f"Wrote default {DOCKERIGNORE_FILE}: {path}")
+    return True
+
+
+def digest_build_context(root: str, dockerfile: str) -> str:
+    """Get the digest of a build context without packing it.
+
+    Gives the same digest as pack_build_context, so a build can be looked
+    up before its context is packed.
+
+    Args:
+        root (str): The build context directory.
+        dockerfile (str): Path of the Dockerfile, relative to root.
+    """
+    root = os.path.abspath(root)
+    digest = __new_digest(dockerfile)
+    try:
+        # Only used to describe entries, nothing is written to it
+        with tarfile.open(mode="w", fileobj=io.BytesIO()) as archive:
+            for path, info in __list_entries(archive, root, dockerfile):
+                digest.update(__describe_entry(path, info))
+                if info.isfile():
+                    with open(os.path.join(root, path), "rb") as f:
+                        for chunk in iter(lambda: f.read(DIGEST_CHUNK_SIZE), b""):
+                            digest.update(chunk)
+    except OSError as err:
+        raise VulcanBoxRuntimeError(f"Could not read build context {root}: {err}")
+    return digest.hexdigest()
+
+
+def pack_build_context(root: str, dockerfile: str) -> BuildContext:
+    """Pack a build context directory into a tar stream.
+
+    Files matched by .dockerignore are left out (the Dockerfile is always
+    kept). The archive is spooled to a temporary file, so large contexts
+    are uploaded from disk instead of being held in memory.
+
+    While packing, a digest of the context is computed from each entry's
+    path, type, mode and contents. Timestamps and ownership are left out,
+    so identical inputs give the same digest on any checkout.
+
+    Args:
+        root (str): The build context directory.
+        dockerfile (str): Path of the Dockerfile, relative to root.
+    """
+    start = time.perf_counter()
+    root = os.path.abspath(root)
+    fileobj = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    digest = __new_digest(dockerfile)
+    file_count = 0
+    try:
+        with tarfile.open(mode="w", fileobj=fileobj) as archive:
+            for path, info in __list_entries(archive, root, dockerfile):
+                digest.update(__describe_entry(path, info))
+                if info.isfile():
+                    with open(os.path.join(root, path), "rb") as f:
+                        archive.addfile(info, _HashingReader(f, digest))
+                    file_count += 1
+                else:
+                    archive.addfile(info)
+    except OSError as err:
+        fileobj.close()
+        raise VulcanBoxRuntimeError(f"Could not pack build context {root}: {err}")
+
+    size = fileobj.tell()
+    fileobj.seek(0)
+    context = BuildContext(
+        fileobj=fileobj,
+        dockerfile=dockerfile,
+        digest=digest.hexdigest(),
+        size=size,
+        file_count=file_count,
+        seconds=time.perf_counter() - start,
+    )
+    logger.info(
+        f"Packed build context: {file_count} files, {format_size(size)} "
+        f"in {context.seconds * 1000:.1f}ms"
+    )
+    return context
+
+
+def __new_digest(dockerfile: str) -> "hashlib._Hash":
+    return hashlib.sha256(f"dockerfile\0{dockerfile}\0".encode("utf-8"))
+
+
+def __list_entries(
+    archive: tarfile.TarFile, root: str, dockerfile: str
+) -> Iterator[Tuple[str, tarfile.TarInfo]]:
+    """List the context's entries, in order, as normalized tar headers."""
+    from docker.utils.build import exclude_paths
+
+    paths = sorted(exclude_paths(root, read_dockerignore(root), dockerfile=dockerfile))
+    for path in paths:
+        info = archive.gettarinfo(os.path.join(root, path), arcname=path)
+        if info is None:
+            # Sockets and other special files cannot be archived
+            continue
+        info.uid = info.gid = 0
+        info.uname = info.gname = ""
+        yield path, info
+
+
+def __describe_entry(path: str, info: tarfile.TarInfo) -> bytes:
+    entry = (path, info.type.decode(), f"{info.mode:o}", info.linkname)
+    return ("\0".join(entry) + "\0").encode("utf-8")
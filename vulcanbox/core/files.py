@@ -0,0 +1,92 @@
+"""File helpers shared by VulcanBox writers."""
+
+import itertools
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Final, Iterable, Iterator, Optional
+
+DEFAULT_FILE_MODE: Final[int] = 0o644
+DIGEST_CHUNK_SIZE: Final[int] = 64 * 1024
+
+
+def atomic_write(path: str, content: bytes) -> None:
+    """Write a file via a temporary file and rename.
+
+    Readers see either the old or the new contents, never a partial write.
+    Permissions of an existing file are preserved.
+    """
+    with __temp_file(path) as f:
+        f.write(content)
+
+
+def write_if_changed(path: str, chunks: Iterable[bytes]) -> bool:
+    """Stream chunks to a file, replacing it only if its contents change.
+
+    Chunks are compared against the existing file as they arrive. Nothing
+    is written while they match; on the first difference the matching
+    prefix is copied to a temporary file, which then receives the rest of
+    the chunks and replaces the file atomically as in atomic_write. Only
+    one chunk is held in memory at a time.
+
+    Returns:
+        bool: True if the file was written, False if it was unchanged.
+    """
+    try:
+        existing: Optional[BinaryIO] = open(path, "rb")
+    except (FileNotFoundError, IsADirectoryError):
+        existing = None
+    try:
+        chunks = iter(chunks)
+        matched = 0
+        if existing is not None:
+            for chunk in chunks:
+                if existing.read(len(chunk)) != chunk:
+                    chunks = itertools.chain([chunk], chunks)
+                    break
+                matched += len(chunk)
+            else:
+                if not existing.read(1):
+                    return False
+        with __temp_file(path) as f:
+            if existing is not None:
+                existing.seek(0)
+                __copy_prefix(existing, f, matched)
+            for chunk in chunks:
+                f.write(chunk)
+        return True
+    finally:
+        if existing is not None:
+            existing.close()
+
+
+def __copy_prefix(source: BinaryIO, target: BinaryIO, size: int) -> None:
+    while size > 0:
+        chunk = source.read(min(size, DIGEST_CHUNK_SIZE))
+        target.write(chunk)
+        size -= len(chunk)
+
+
+@contextmanager
+def __temp_file(path: str) -> Iterator[BinaryIO]:
+    """Open a temporary file that replaces path when the block completes."""
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = DEFAULT_FILE_MODE
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,99 @@
+"""Concurrent startup of container fleets."""
+
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from docker.errors import APIError
+
+from vulcanbox.core.constants import VulcanBoxLabels
+from vulcanbox.core.output import emit_event
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ContainerStart:
+    """Outcome of starting one replica."""
+
+    name: str
+    replica: int
+    seconds: float
+    container_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def started(self) -> bool:
+        return self.error is None
+
+
+def get_container_labels(image: str, fleet: str, replica: int) -> Dict[str, str]:
+    """Get the labels of one replica of a fleet."""
+    return {
+        VulcanBoxLabels.MANAGED: "true",
+        VulcanBoxLabels.IMAGE: image,
+        VulcanBoxLabels.FLEET: fleet,
+        VulcanBoxLabels.REPLICA: str(replica),
+    }
+
+
+def get_container_name(image: str, fleet: str, replica: int) -> str:
+    """Name a replica after its image repository, e.g. 'vulcanbox-app-1a2b3c4d-0'."""
+    repository = image.split("@", 1)[0].rsplit(":", 1)[0].rsplit("/", 1)[-1]
+    repository = re.sub(r"[^a-zA-Z0-9_.-]", "-", repository).strip("-.") or "vulcanbox"
+    return f"{repository}-{fleet}-{replica}"
+
+
+def start_containers(
+    client: Any, image: str, replicas: int, fleet: str, workers: int
+) -> List[ContainerStart]:
+    """Create and start replicas of an image concurrently.
+
+    At most `workers` containers are created at once. A replica that
+    fails to start is reported rather than stopping the others.
+
+    Args:
+        client (docker.DockerClient): Client of the daemon to run on.
+        image (str): Tag or ID of the image.
+        replicas (int): Number of containers to start.
+        fleet (str): ID shared by the containers, used in names and labels.
+        workers (int): Maximum number of concurrent starts.
+    """
+
+    def start(replica: int) -> ContainerStart:
+        name = get_container_name(image, fleet, replica)
+        begin = time.perf_counter()
+        try:
+            container = client.containers.run(
+                image,
+                name=name,
+                detach=True,
+                labels=get_container_labels(image, fleet, replica),
+            )
+        except APIError as err:
+            logger.debug(f"Failed to start {name}", exc_info=True)
+            seconds = time.perf_counter() - begin
+            emit_event(
+                "container_failed",
+                name=name,
+                replica=replica,
+                seconds=round(seconds, 3),
+                error=str(err),
+            )
+            return ContainerStart(name, replica, seconds, error=str(err))
+        seconds = time.perf_counter() - begin
+        logger.info(f"Started {name} ({container.id[:12]}) in {seconds:.2f}s")
+        emit_event(
+            "container_started",
+            name=name,
+            replica=replica,
+            seconds=round(seconds, 3),
+            id=container.id,
+        )
+        return ContainerStart(name, replica, seconds, container_id=container.id)
+
+    with ThreadPoolExecutor(max_workers=min(workers, replicas)) as executor:
+        return list(executor.map(start, range(replicas)))
@@ -1,16 +1,65 @@
+import importlib
 import logging
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import click
 
 from vulcanbox.core.errors import ExitCode, VulcanBoxBaseError
-from vulcanbox.core.output import print_warning
+from vulcanbox.core.output import emit_event, is_ndjson, print_warning
 
 logger = logging.getLogger(__name__)
 
 
-class VulcanBoxCliHandler(click.Group):
+class LazyGroup(click.Group):
+    """A command group that imports its subcommands only when they are used.
+
+    Subcommands are given as a mapping of command name to the dotted import
+    path of the command object, e.g. ``{"doctor": "vulcanbox.doctor.doctor"}``.
+    """
+
+    def __init__(
+        self, *args: Any, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        """List both eagerly registered and lazily loaded commands."""
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Resolve a command, importing its module on first lookup."""
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self.__load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def __load_command(self, cmd_name: str) -> click.Command:
+        import_path = self.lazy_subcommands[cmd_name]
+        module_name, attribute = import_path.rsplit(".", 1)
+        logger.debug(f"Loading command '{cmd_name}' from {module_name}")
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise TypeError(f"Lazy command '{import_path}' is not a click command")
+        return command
+
+
+class InteractiveOption(click.Option):
+    """An option that prompts for a missing value in text output mode only.
+
+    In ndjson mode stdout carries only events, so a missing value is a
+    usage error instead of a prompt.
+    """
+
+    def prompt_for_value(self, ctx: click.Context) -> Any:
+        if is_ndjson():
+            raise click.MissingParameter(
+                "Prompts are disabled with --output ndjson.", ctx=ctx, param=self
+            )
+        return super().prompt_for_value(ctx)
+
+
+class VulcanBoxCliHandler(LazyGroup):
     """A wrapped around CLI invocation that handles related errors."""
 
     AUTHOR_DETAILS: Dict[str, str] = {
@@ -26,12 +75,39 @@ class VulcanBoxCliHandler(click.Group):
         except VulcanBoxBaseError as err:
             logger.exception(err)
             print_warning(f"{err.help_text}")
+            emit_event(
+                "error",
+                message=err.message,
+                exit_code=err.exit_code,
+                help=err.help_text,
+            )
             sys.exit(err.exit_code)
 
         except click.UsageError as err:
             err.show()
+            emit_event(
+                "error", message=err.format_message(), exit_code=ExitCode.RUNTIME_ERROR
+            )
             sys.exit(ExitCode.RUNTIME_ERROR)
 
+        except click.exceptions.Exit:
+            raise
+
+        except click.Abort:
+            emit_event("error", message="Aborted", exit_code=ExitCode.RUNTIME_ERROR)
+            raise
+
+        except Exception as err:
+            # Unexpected errors still end the event stream with an error
+            exit_code = getattr(err, "exit_code", ExitCode.RUNTIME_ERROR)
+            emit_event(
+                "error",
+                message=str(err) or type(err).__name__,
+                exit_code=exit_code,
+                type=type(err).__name__,
+            )
+            raise
+
     def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
         """Customize help info."""
         super().format_help(ctx, formatter)
@@ -0,0 +1,140 @@
+"""Local index of built images, keyed by build input digest."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, Final, Iterator, List, Optional, Tuple
+
+from vulcanbox.core.cache import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE: Final[str] = "builds.db"
+SCHEMA: Final[Tuple[str, ...]] = (
+    "CREATE TABLE IF NOT EXISTS builds ("
+    " digest TEXT PRIMARY KEY,"
+    " image_id TEXT NOT NULL,"
+    " tag TEXT NOT NULL,"
+    " dockerfile TEXT NOT NULL,"
+    " seconds REAL,"
+    " built_at REAL NOT NULL,"
+    " last_used REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS builds_tag ON builds (tag)",
+    "CREATE INDEX IF NOT EXISTS builds_last_used ON builds (last_used)",
+)
+COLUMNS: Final[str] = "digest, image_id, tag, dockerfile, seconds, built_at, last_used"
+
+
+@dataclass(frozen=True)
+class BuildRecord:
+    """A built image and the digest of the inputs it was built from.
+
+    `seconds` is None for images found by tag rather than built.
+    """
+
+    digest: str
+    image_id: str
+    tag: str
+    dockerfile: str
+    seconds: Optional[float]
+    built_at: float
+    last_used: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class BuildIndex:
+    """SQLite index mapping build input digests to images.
+
+    Each operation opens its own connection, so one index can be shared
+    by concurrent builds. Operations raise sqlite3.Error when the index
+    cannot be read or written.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        if path is None:
+            cache_dir = get_cache_dir()
+            path = os.path.join(cache_dir, INDEX_FILE) if cache_dir else None
+        self.path = path
+        self.__schema_lock = threading.Lock()
+        self.__has_schema = False
+
+    def get(self, digest: str) -> Optional[BuildRecord]:
+        """Get the record of a digest, marking it as used."""
+        now = time.time()
+        with self.__connect() as connection:
+            row = connection.execute(
+                f"SELECT {COLUMNS} FROM builds WHERE digest = ?", (digest,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE builds SET last_used = ? WHERE digest = ?", (now, digest)
+            )
+        return replace(BuildRecord(*row), last_used=now)
+
+    def find(self, reference: str) -> List[BuildRecord]:
+        """Find records by tag, digest prefix or image ID prefix."""
+        with self.__connect() as connection:
+            rows = connection.execute(
+                f"SELECT {COLUMNS} FROM builds WHERE tag = ? OR digest LIKE ? "
+                "OR image_id LIKE ? ORDER BY last_used DESC",
+                (reference, f"{reference}%", f"{reference}%"),
+            ).fetchall()
+        return [BuildRecord(*row) for row in rows]
+
+    def put(
+        self,
+        digest: str,
+        image_id: str,
+        tag: str,
+        dockerfile: str,
+        seconds: Optional[float],
+    ) -> None:
+        """Record the image built from a digest."""
+        now = time.time()
+        with self.__connect() as connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO builds ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (digest, image_id, tag, dockerfile, seconds, now, now),
+            )
+
+    def remove(self, digests: List[str]) -> int:
+        """Remove records, returning how many were removed."""
+        with self.__connect() as connection:
+            cursor = connection.executemany(
+                "DELETE FROM builds WHERE digest = ?",
+                [(digest,) for digest in digests],
+            )
+            return max(cursor.rowcount, 0)
+
+    def list(self, limit: int = 50) -> List[BuildRecord]:
+        """List the most recently used records."""
+        with self.__connect() as connection:
+            rows = connection.execute(
+                f"SELECT {COLUMNS} FROM builds ORDER BY last_used DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [BuildRecord(*row) for row in rows]
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        if self.path is None:
+            raise sqlite3.OperationalError("No cache directory for the build index")
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            with self.__schema_lock:
+                if not self.__has_schema:
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    for statement in SCHEMA:
+                        connection.execute(statement)
+                    self.__has_schema = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
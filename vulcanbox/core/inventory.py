@@ -0,0 +1,104 @@
+"""Paged listing of the Docker objects VulcanBox created."""
+
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, TypeVar
+
+from vulcanbox.core.constants import VulcanBoxLabels
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ImageEntry:
+    id: str
+    tags: List[str]
+    size: int
+    created: int
+    context: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ContainerEntry:
+    id: str
+    name: str
+    image: str
+    state: str
+    status: str
+    size: int
+    created: int
+    context: Optional[str]
+    fleet: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def __get_page(items: Sequence[T], page: int, per_page: int) -> List[T]:
+    start = (page - 1) * per_page
+    return list(items[start : start + per_page])
+
+
+def list_images(
+    client: Any, label_filters: List[str], page: int = 1, per_page: int = 50
+) -> List[ImageEntry]:
+    """List one page of labelled images, newest first.
+
+    Args:
+        client (docker.DockerClient): Client of the daemon to query.
+        label_filters (List[str]): Labels, as 'key=value', that must all match.
+        page (int): 1-based page number.
+        per_page (int): Number of images per page.
+    """
+    images = client.api.images(filters={"label": label_filters})
+    images.sort(key=lambda image: image.get("Created", 0), reverse=True)
+    logger.debug(f"Daemon returned {len(images)} images for {label_filters}")
+    return [
+        ImageEntry(
+            id=image["Id"],
+            tags=image.get("RepoTags") or [],
+            size=image.get("Size") or 0,
+            created=image.get("Created", 0),
+            context=(image.get("Labels") or {}).get(VulcanBoxLabels.CONTEXT),
+        )
+        for image in __get_page(images, page, per_page)
+    ]
+
+
+def list_containers(
+    client: Any, label_filters: List[str], page: int = 1, per_page: int = 50
+) -> List[ContainerEntry]:
+    """List one page of labelled containers, newest first.
+
+    The daemon is asked for only as many of the newest containers as
+    the requested page needs.
+    """
+    containers = client.api.containers(
+        all=True,
+        size=True,
+        limit=page * per_page,
+        filters={"label": label_filters},
+    )
+    containers.sort(key=lambda container: container.get("Created", 0), reverse=True)
+    entries = []
+    for container in __get_page(containers, page, per_page):
+        labels = container.get("Labels") or {}
+        entries.append(
+            ContainerEntry(
+                id=container["Id"],
+                name=(container.get("Names") or [container["Id"][:12]])[0].lstrip("/"),
+                image=container.get("Image", ""),
+                state=container.get("State", ""),
+                status=container.get("Status", ""),
+                size=container.get("SizeRw") or 0,
+                created=container.get("Created", 0),
+                context=labels.get(VulcanBoxLabels.CONTEXT),
+                fleet=labels.get(VulcanBoxLabels.FLEET),
+            )
+        )
+    return entries
@@ -1,22 +1,65 @@
-import datetime as dt
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+import os
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Final, List, Optional, Sequence, Tuple
 
-import click
-import docker
-from tqdm import tqdm
-
-from vulcanbox.core.constants import VulcanBoxFileType
+from vulcanbox.core.cache import get_cache_dir
+from vulcanbox.core.constants import VulcanBoxFileType, VulcanBoxLabels
+from vulcanbox.core.context import write_default_dockerignore
+from vulcanbox.core.errors import VulcanBoxInputError, VulcanBoxRuntimeError
+from vulcanbox.core.output import emit_event
 from vulcanbox.core.templating import BaseTemplatedFile
 
+if TYPE_CHECKING:
+    # Docker and the build modules are imported by the methods that use
+    # them, so commands that only render templates do not load them
+    import docker
+    from docker.models.containers import Container
+
+    from vulcanbox.core.buildlog import BuildReport
+    from vulcanbox.core.index import BuildIndex
+
 logger = logging.getLogger(__name__)
 
+CACHE_FROM_LIMIT: Final[int] = 5
+
+
+@dataclass(frozen=True)
+class BuildCachePolicy:
+    """How a build may use the layer cache.
+
+    Modes are "on" (reuse layers and seed from earlier vulcanbox images),
+    "off" (build every layer from scratch) and "from" (seed the cache from
+    a given image).
+    """
+
+    mode: str = "on"
+    image: Optional[str] = None
+
+    @classmethod
+    def parse(cls, value: str) -> "BuildCachePolicy":
+        """Parse a policy from 'on', 'off' or 'from:<image>'."""
+        if value in ("on", "off"):
+            return cls(mode=value)
+        if value.startswith("from:") and value[len("from:") :]:
+            return cls(mode="from", image=value[len("from:") :])
+        raise VulcanBoxInputError(
+            f"Invalid cache mode '{value}', expected on, off or from:<image>"
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
 
 class DockerImage(BaseTemplatedFile):
     """Template engine for repositories."""
 
     def __init__(self, name: str, context: Dict[str, str]) -> None:
-        self.client = docker.from_env()
         super().__init__(
             name=name,
             src="docker",
@@ -25,10 +68,23 @@ class DockerImage(BaseTemplatedFile):
             whitespace=False,
         )
         self.image_tag = None
+        self.build_report: Optional["BuildReport"] = None
+
+    @property
+    def client(self) -> "docker.DockerClient":
+        from vulcanbox.core.client import get_client
+
+        return get_client()
 
     def is_built(self) -> bool:
         return self.image_tag is not None
 
+    def write(self) -> bool:
+        """Write the Dockerfile, with a default .dockerignore if there is none."""
+        written = super().write()
+        write_default_dockerignore(os.path.dirname(self.destination))
+        return written
+
     def json(self) -> Dict[str, Any]:
         return {
             "name": self.name,
@@ -37,45 +93,257 @@ class DockerImage(BaseTemplatedFile):
         }
 
     @staticmethod
-    def __get_image_name(base_name: str) -> str:
-        now = dt.datetime.now()
-        formatted_time = now.strftime("%Y%m%d-%H%M%S")
+    def get_repository(base_name: str) -> str:
+        """Get the image repository VulcanBox uses for an image name."""
         sanitized_name = base_name.replace(" ", "-").replace(":", "-").replace("/", "-")
-        return f"vulcanbox-{sanitized_name}-{formatted_time}"
-
-    def build(self, name: Optional[str] = ""):
-        """Build the Docker image."""
-        self.image_tag = self.__get_image_name(name)
-        image, logs = self.client.images.build(
-            path=".",
-            dockerfile=self.destination,
-            tag=self.image_tag,
-            nocache=True,
-            rm=True,
-            forcerm=True,
+        return f"vulcanbox-{sanitized_name.lower()}"
+
+    @staticmethod
+    def __get_image_name(base_name: str, digest: str) -> str:
+        repository = DockerImage.get_repository(base_name)
+        return f"{repository}:{digest[:12]}"
+
+    def __get_cache_from(self, repository: str, cache: BuildCachePolicy) -> List[str]:
+        """List images to seed the layer cache with."""
+        if cache.mode == "from":
+            return [cache.image]
+        if cache.mode == "off":
+            return []
+        images = self.client.images.list(name=repository)
+        images.sort(key=lambda image: image.attrs.get("Created", ""), reverse=True)
+        tags = [tag for image in images for tag in image.tags]
+        return tags[:CACHE_FROM_LIMIT]
+
+    def build(
+        self,
+        name: Optional[str] = "",
+        cache: Optional[BuildCachePolicy] = None,
+        dependencies: Sequence[str] = (),
+        log_file: Optional[str] = None,
+        echo: bool = True,
+    ):
+        """Build the Docker image.
+
+        The image is tagged from a digest of the Dockerfile and build
+        context, so unchanged inputs map to an existing image and the
+        build is skipped unless the cache is turned off. The digest is
+        looked up before the context is packed, so reusing an image only
+        costs reading the context. The image is also tagged 'latest' so
+        other Dockerfiles can build FROM it.
+
+        Args:
+            name (str): Name of the image.
+            cache (BuildCachePolicy): How to use the layer cache.
+            dependencies (Sequence[str]): Tags of base images this build
+                depends on; they are folded into the digest so the image
+                is rebuilt when a base image changes.
+            log_file (str, optional): Where to write the full build log.
+                Defaults to a file in the VulcanBox cache dir.
+            echo (bool): Whether to stream build output to the terminal.
+        """
+        from docker.errors import APIError
+
+        from vulcanbox.core.buildlog import BuildOutput, BuildReport
+        from vulcanbox.core.context import digest_build_context, pack_build_context
+        from vulcanbox.core.index import BuildIndex
+
+        cache = cache or BuildCachePolicy()
+        repository = self.get_repository(name)
+        context_dir = os.getcwd()
+        dockerfile = os.path.relpath(self.destination, context_dir)
+        index = BuildIndex()
+        if cache.enabled:
+            # Look the build up before paying for packing the context
+            context_digest = digest_build_context(context_dir, dockerfile)
+            digest = self.__get_build_digest(context_digest, dependencies)
+            self.image_tag = self.__get_image_name(name, digest)
+            image = self.__reuse_image(index, repository, digest, dockerfile)
+            if image is not None:
+                return image
+
+        with pack_build_context(context_dir, dockerfile) as context:
+            digest = self.__get_build_digest(context.digest, dependencies)
+            self.image_tag = self.__get_image_name(name, digest)
+
+            cache_from = self.__get_cache_from(repository, cache)
+            logger.debug(
+                f"Building {self.image_tag} (cache {cache.mode}: {cache_from})"
+            )
+            log_path = log_file or self.__get_log_path(self.image_tag)
+            start = time.perf_counter()
+            with BuildOutput(
+                log_path=log_path, echo=echo, image=self.image_tag
+            ) as output:
+                try:
+                    events = self.client.api.build(
+                        fileobj=context.fileobj,
+                        custom_context=True,
+                        dockerfile=context.dockerfile,
+                        tag=self.image_tag,
+                        labels={
+                            VulcanBoxLabels.MANAGED: "true",
+                            VulcanBoxLabels.IMAGE: repository,
+                            VulcanBoxLabels.CONTEXT: digest,
+                        },
+                        nocache=not cache.enabled,
+                        cache_from=cache_from or None,
+                        rm=True,
+                        forcerm=True,
+                        decode=True,
+                    )
+                    for event in events:
+                        output.feed(event)
+                except APIError as err:
+                    output.feed({"error": str(err)})
+            self.build_report = BuildReport(
+                self.image_tag,
+                dockerfile,
+                seconds=time.perf_counter() - start,
+                steps=output.steps.steps,
+            )
+
+        if output.error is not None or output.image_id is None:
+            tail = "\n".join(output.tail or [])
+            raise VulcanBoxRuntimeError(
+                f"Failed to build {self.image_tag}: {output.error or 'no image ID'}",
+                help_text=f"{tail}\nFull build log: {log_path}",
+            )
+        logger.info(f"Built {self.image_tag} ({output.line_count} log lines)")
+        if log_path:
+            logger.info(f"Full build log: {log_path}")
+        image = self.client.images.get(output.image_id)
+        image.tag(repository, tag="latest")
+        self.__index_image(
+            index, digest, image.id, dockerfile, self.build_report.seconds
+        )
+        emit_event(
+            "build_finished",
+            image=self.image_tag,
+            image_id=image.id,
+            seconds=round(self.build_report.seconds, 3),
+            skipped=False,
+        )
+        return image
+
+    @staticmethod
+    def __get_build_digest(context_digest: str, dependencies: Sequence[str]) -> str:
+        """Fold the tags of base images into the build context digest."""
+        if not dependencies:
+            return context_digest
+        inputs = "\0".join([context_digest, *dependencies]).encode("utf-8")
+        return hashlib.sha256(inputs).hexdigest()
+
+    def __reuse_image(
+        self, index: "BuildIndex", repository: str, digest: str, dockerfile: str
+    ) -> Optional[Any]:
+        """Reuse an image built from the same digest, if there is one."""
+        from vulcanbox.core.buildlog import BuildReport
+
+        image, indexed = self.__find_image(index, digest)
+        if image is None:
+            return None
+        logger.info(f"Image is up to date, skipping build: {self.image_tag}")
+        self.build_report = BuildReport(
+            self.image_tag, dockerfile, seconds=0.0, skipped=True
+        )
+        if self.image_tag not in image.tags:
+            image.tag(repository, tag=digest[:12])
+        image.tag(repository, tag="latest")
+        if not indexed:
+            self.__index_image(index, digest, image.id, dockerfile, None)
+        emit_event(
+            "build_finished",
+            image=self.image_tag,
+            image_id=image.id,
+            seconds=0.0,
+            skipped=True,
         )
-        for log in tqdm(logs, desc=f"Building [{self.image_tag}]"):
-            if "stream" in log:
-                click.echo(log["stream"].strip())
         return image
 
-    def start(self) -> None:
-        """Run the Docker container."""
+    def __find_image(self, index: "BuildIndex", digest: str) -> Tuple[Any, bool]:
+        """Find an image built from a digest, via the build index or by tag.
+
+        Returns the image, or None, and whether it was found in the index.
+        """
+        from docker.errors import ImageNotFound
+
+        try:
+            record = index.get(digest)
+        except sqlite3.Error as err:
+            logger.debug(f"Build index unavailable: {err}")
+            record = None
+        if record is not None:
+            try:
+                return self.client.images.get(record.image_id), True
+            except ImageNotFound:
+                logger.debug(f"Indexed image {record.image_id} no longer exists")
+        try:
+            return self.client.images.get(self.image_tag), False
+        except ImageNotFound:
+            return None, False
+
+    def __index_image(
+        self,
+        index: "BuildIndex",
+        digest: str,
+        image_id: str,
+        dockerfile: str,
+        seconds: Optional[float],
+    ) -> None:
+        try:
+            index.put(digest, image_id, self.image_tag, dockerfile, seconds)
+        except sqlite3.Error as err:
+            logger.debug(f"Could not record {self.image_tag} in the build index: {err}")
+
+    @staticmethod
+    def __get_log_path(image_tag: str) -> Optional[str]:
+        log_dir = get_cache_dir("logs")
+        if log_dir is None:
+            return None
+        file_name = image_tag.replace(":", "-").replace("/", "-")
+        return os.path.join(log_dir, f"{file_name}.log")
+
+    def start(self) -> "Container":
+        """Start a detached, labelled container of the built image."""
+        from vulcanbox.core.fleet import get_container_labels, get_container_name
+
+        if not self.is_built():
+            raise VulcanBoxRuntimeError(
+                f"Image {self.name} has not been built",
+                help_text="Call build() before start().",
+            )
+        fleet = uuid.uuid4().hex[:8]
         container = self.client.containers.run(
-            self.name, name=self.container_name, remove=True, detach=True
+            self.image_tag,
+            name=get_container_name(self.image_tag, fleet, 0),
+            detach=True,
+            labels=get_container_labels(self.image_tag, fleet, 0),
         )
-        print(container.logs().decode("utf-8"))
+        logger.info(f"Started container {container.name} of {self.image_tag}")
         return container
 
 
 class DockerCompose(BaseTemplatedFile):
     """Template engine for Docker Compose YAML."""
 
-    def __init__(self, context: Dict[str, str]) -> None:
-        self.client = docker.from_env()
+    def __init__(
+        self, context: Dict[str, str], name: str = VulcanBoxFileType.DOCKER_COMPOSE
+    ) -> None:
         super().__init__(
-            name="docker-compose.yml",
+            name=name,
             src="compose",
             file_type=VulcanBoxFileType.DOCKER_COMPOSE,
             context=context,
         )
+
+    @property
+    def client(self) -> "docker.DockerClient":
+        from vulcanbox.core.client import get_client
+
+        return get_client()
+
+    def json(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "context": self.context,
+        }
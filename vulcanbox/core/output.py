@@ -1,21 +1,92 @@
+import json
 import logging
+import sys
+import threading
+import time
+from typing import Any, Dict, Final, Optional, TextIO, Tuple
 
 import click
 from colorama import Fore, Style
 
+OUTPUT_MODES: Final[Tuple[str, ...]] = ("text", "ndjson")
+
+__output_mode = "text"
+__event_lock = threading.Lock()
+
+LEVEL_COLORS: Final[Dict[int, str]] = {
+    logging.DEBUG: Fore.CYAN,
+    logging.INFO: Fore.GREEN,
+    logging.WARNING: Fore.YELLOW,
+    logging.ERROR: Fore.RED,
+    logging.CRITICAL: Fore.RED,
+}
+
 
 class ColorHandler(logging.StreamHandler):
-    def emit(self, record: logging.LogRecord) -> None:
-        colors = {
-            logging.DEBUG: Fore.CYAN,
-            logging.INFO: Fore.GREEN,
-            logging.WARNING: Fore.YELLOW,
-            logging.ERROR: Fore.RED,
-            logging.CRITICAL: Fore.RED,
-        }
-        color = colors.get(record.levelno, Fore.WHITE)
-        record.msg = f"{color}{record.msg}{Style.RESET_ALL}"
-        super().emit(record)
+    """Stream handler that colors each formatted line by its level.
+
+    Records are left untouched, so they can be passed on to other
+    handlers. Pass use_color=False for streams that are not a terminal.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, use_color: bool = True):
+        super().__init__(stream)
+        self.use_color = use_color
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        if not self.use_color:
+            return message
+        color = LEVEL_COLORS.get(record.levelno, Fore.WHITE)
+        return f"{color}{message}{Style.RESET_ALL}"
+
+
+def set_output_mode(mode: str) -> None:
+    """
+    Set how commands report progress: "text" for people or "ndjson" for tools.
+
+    In ndjson mode, stdout carries only events, one JSON object per line,
+    and human-readable output moves to stderr.
+
+    Args:
+        mode (str): One of OUTPUT_MODES.
+    """
+    global __output_mode
+    if mode not in OUTPUT_MODES:
+        raise ValueError(f"Unknown output mode: {mode}")
+    __output_mode = mode
+
+
+def is_ndjson() -> bool:
+    """Check whether events are being emitted as NDJSON."""
+    return __output_mode == "ndjson"
+
+
+def emit_event(event: str, **fields: Any) -> None:
+    """
+    Write an event to stdout as one JSON line, in ndjson mode only.
+
+    Args:
+        event (str): The event type, e.g. "file_written".
+        **fields: The event's data; must be JSON serializable.
+    """
+    if not is_ndjson():
+        return
+    line = json.dumps({"event": event, "time": round(time.time(), 3), **fields})
+    with __event_lock:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+
+def echo(message: str = "", **styles: Any) -> None:
+    """
+    Print human-readable output, on stderr in ndjson mode.
+
+    Args:
+        message (str): The text to print.
+        **styles: Styles passed to click.secho, e.g. fg="green".
+    """
+    click.secho(message, err=is_ndjson(), **styles)
 
 
 def print_error(message: str) -> None:
@@ -25,7 +96,8 @@ def print_error(message: str) -> None:
     Args:
         message (str): The error message to print.
     """
-    click.echo(f"{Fore.RED}{Style.BRIGHT}{message}{Style.RESET_ALL}")
+    echo(f"{Fore.RED}{Style.BRIGHT}{message}{Style.RESET_ALL}")
+    emit_event("message", level="error", text=message)
 
 
 def print_warning(message: str) -> None:
@@ -35,7 +107,8 @@ def print_warning(message: str) -> None:
     Args:
         message (str): The warning message to print.
     """
-    click.echo(f"{Fore.YELLOW}{Style.BRIGHT}{message}{Style.RESET_ALL}")
+    echo(f"{Fore.YELLOW}{Style.BRIGHT}{message}{Style.RESET_ALL}")
+    emit_event("message", level="warning", text=message)
 
 
 def print_success(message: str) -> None:
@@ -45,4 +118,34 @@ def print_success(message: str) -> None:
     Args:
         message (str): The success message to print.
     """
-    click.echo(f"{Fore.GREEN}{Style.BRIGHT}{message}{Style.RESET_ALL}")
+    echo(f"{Fore.GREEN}{Style.BRIGHT}{message}{Style.RESET_ALL}")
+    emit_event("message", level="success", text=message)
+
+
+def format_size(num_bytes: float) -> str:
+    """
+    Format a byte count as a human-readable size.
+
+    Args:
+        num_bytes (float): The size in bytes.
+    """
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(num_bytes) < 1024 or unit == "TB":
+            break
+        num_bytes /= 1024
+    if unit == "B":
+        return f"{int(num_bytes)} {unit}"
+    return f"{num_bytes:.1f} {unit}"
+
+
+def format_age(seconds: float) -> str:
+    """
+    Format a duration as a short age, e.g. '45s', '3m', '2h' or '5d'.
+
+    Args:
+        seconds (float): The age in seconds.
+    """
+    for unit, length in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= length:
+            return f"{int(seconds // length)}{unit}"
+    return f"{max(int(seconds), 0)}s"
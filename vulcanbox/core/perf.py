@@ -0,0 +1,156 @@
+"""Performance checks of the Docker host."""
+
+import logging
+import math
+import os
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Final, List, Optional, Sequence
+
+import requests
+
+from vulcanbox.core.errors import VulcanBoxRuntimeError
+from vulcanbox.core.output import format_size
+
+logger = logging.getLogger(__name__)
+
+SLOW_PING_MS: Final[float] = 50.0
+MIN_FREE_RATIO: Final[float] = 0.1
+BUILDKIT_ENV_VAR: Final[str] = "DOCKER_BUILDKIT"
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Get the nearest-rank percentile of some values, e.g. pct=95 for p95."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class HostReport:
+    """Latency, disk usage and build settings of a Docker host."""
+
+    server_version: str
+    storage_driver: str
+    docker_root: str
+    builder_version: Optional[str]
+    buildkit: bool
+    ping_ms: List[float]
+    image_count: int
+    image_bytes: int
+    build_cache_bytes: int
+    build_cache_reclaimable_bytes: int
+    root_free_bytes: Optional[int] = None
+    root_total_bytes: Optional[int] = None
+    warnings: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["ping_p50_ms"] = percentile(self.ping_ms, 50)
+        data["ping_p95_ms"] = percentile(self.ping_ms, 95)
+        return data
+
+    def format_table(self) -> str:
+        """Format the report as a two-column table."""
+        if self.root_free_bytes is None:
+            free_space = "unknown (daemon root is not on this host)"
+        else:
+            free_space = (
+                f"{format_size(self.root_free_bytes)} of "
+                f"{format_size(self.root_total_bytes or 0)}"
+            )
+        rows = [
+            ("Server version", self.server_version),
+            ("Storage driver", self.storage_driver),
+            ("Docker root", self.docker_root),
+            ("Free space", free_space),
+            ("BuildKit", "enabled" if self.buildkit else "disabled"),
+            (
+                "Ping (p50/p95)",
+                f"{percentile(self.ping_ms, 50):.1f} / "
+                f"{percentile(self.ping_ms, 95):.1f} ms "
+                f"over {len(self.ping_ms)} pings",
+            ),
+            ("Images", f"{self.image_count} ({format_size(self.image_bytes)})"),
+            (
+                "Build cache",
+                f"{format_size(self.build_cache_bytes)} "
+                f"({format_size(self.build_cache_reclaimable_bytes)} reclaimable)",
+            ),
+        ]
+        width = max(len(name) for name, _ in rows)
+        return "\n".join(f"{name:<{width}}  {value}" for name, value in rows)
+
+
+def measure_host(client: Any, pings: int) -> HostReport:
+    """Measure a Docker host through its API.
+
+    Args:
+        client (docker.DockerClient): Client of the daemon to measure.
+        pings (int): Number of round trips to time.
+    """
+    ping_ms: List[float] = []
+    builder_version: Optional[str] = None
+    for _ in range(pings):
+        start = time.perf_counter()
+        try:
+            response = client.api.get(f"{client.api.base_url}/_ping")
+            response.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            raise VulcanBoxRuntimeError(f"Could not ping the Docker daemon: {err}")
+        ping_ms.append((time.perf_counter() - start) * 1000)
+        builder_version = response.headers.get("Builder-Version")
+
+    info = client.info()
+    usage = client.df()
+    docker_root = info.get("DockerRootDir", "")
+    build_cache = usage.get("BuildCache") or []
+    buildkit_env = os.environ.get(BUILDKIT_ENV_VAR)
+    if buildkit_env is not None:
+        buildkit = buildkit_env not in ("0", "false")
+    else:
+        buildkit = builder_version == "2"
+
+    report = HostReport(
+        server_version=info.get("ServerVersion", "unknown"),
+        storage_driver=info.get("Driver", "unknown"),
+        docker_root=docker_root,
+        builder_version=builder_version,
+        buildkit=buildkit,
+        ping_ms=[round(value, 3) for value in ping_ms],
+        image_count=len(usage.get("Images") or []),
+        image_bytes=usage.get("LayersSize") or 0,
+        build_cache_bytes=sum(entry.get("Size", 0) for entry in build_cache),
+        build_cache_reclaimable_bytes=sum(
+            entry.get("Size", 0) for entry in build_cache if not entry.get("InUse")
+        ),
+    )
+    try:
+        disk = shutil.disk_usage(docker_root)
+    except OSError:
+        logger.debug(f"Docker root {docker_root} is not readable from this host")
+    else:
+        report.root_free_bytes = disk.free
+        report.root_total_bytes = disk.total
+    report.warnings = __get_warnings(report)
+    return report
+
+
+def __get_warnings(report: HostReport) -> List[str]:
+    warnings = []
+    p95 = percentile(report.ping_ms, 95)
+    if p95 > SLOW_PING_MS:
+        warnings.append(
+            f"Daemon round trips are slow: p95 {p95:.1f} ms (> {SLOW_PING_MS:g} ms)"
+        )
+    if report.root_free_bytes is not None and report.root_total_bytes:
+        if report.root_free_bytes / report.root_total_bytes < MIN_FREE_RATIO:
+            warnings.append(
+                f"Less than {MIN_FREE_RATIO:.0%} free on {report.docker_root}"
+            )
+    if not report.buildkit:
+        warnings.append("BuildKit is disabled, builds use the legacy builder")
+    return warnings
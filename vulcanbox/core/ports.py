@@ -0,0 +1,211 @@
+"""Host port allocation for Compose fleets."""
+
+import json
+import logging
+import os
+import socket
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Final, Iterator, List, Optional, Set
+
+from vulcanbox.core.cache import get_cache_dir
+from vulcanbox.core.errors import VulcanBoxInputError, VulcanBoxRuntimeError
+from vulcanbox.core.files import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PROC_NET_FILES: Final[List[str]] = ["/proc/net/tcp", "/proc/net/tcp6"]
+TCP_LISTEN_STATE: Final[str] = "0A"
+STATE_FILE: Final[str] = "ports.json"
+DEFAULT_PORT_RANGE: Final[str] = "5050-32767"
+
+
+@dataclass(frozen=True)
+class PortRange:
+    start: int
+    end: int
+
+    @classmethod
+    def parse(cls, value: str) -> "PortRange":
+        """Parse an inclusive range such as '5050-6000'."""
+        try:
+            start, end = (int(part) for part in value.split("-", 1))
+        except ValueError:
+            raise VulcanBoxInputError(
+                f"Invalid port range '{value}', expected <start>-<end>"
+            )
+        if not 1 <= start <= end <= 65535:
+            raise VulcanBoxInputError(f"Invalid port range '{value}'")
+        return cls(start, end)
+
+    def __len__(self) -> int:
+        return self.end - self.start + 1
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.start, self.end + 1))
+
+    def __contains__(self, port: object) -> bool:
+        return isinstance(port, int) and self.start <= port <= self.end
+
+
+def get_listening_ports(proc_files: List[str] = PROC_NET_FILES) -> Optional[Set[int]]:
+    """Get all TCP ports with a listening socket on the host.
+
+    Reads the kernel socket tables in one pass. Returns None where they
+    are not available (non-Linux hosts).
+    """
+    ports: Set[int] = set()
+    found = False
+    for path in proc_files:
+        try:
+            with open(path, "r") as f:
+                lines = f.read().splitlines()[1:]
+        except OSError:
+            continue
+        found = True
+        for line in lines:
+            fields = line.split()
+            if len(fields) > 3 and fields[3] == TCP_LISTEN_STATE:
+                ports.add(int(fields[1].rsplit(":", 1)[1], 16))
+    return ports if found else None
+
+
+def is_port_free(port: int) -> bool:
+    """Check a single port by binding to it."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("", port))
+        except OSError:
+            return False
+    return True
+
+
+class PortAllocator:
+    """Allocates host ports that are neither bound nor reserved.
+
+    Allocations are remembered per project in a state file, so a fleet
+    gets the same ports when regenerated and different fleets do not
+    overlap even while some of them are stopped. They are released when
+    the fleet is removed, or when its compose file no longer exists.
+    """
+
+    def __init__(self, port_range: PortRange, state_dir: Optional[str] = None) -> None:
+        self.port_range = port_range
+        state_dir = state_dir or get_cache_dir()
+        self.state_path = os.path.join(state_dir, STATE_FILE) if state_dir else None
+
+    def allocate(self, project: str, count: int, contiguous: bool = False) -> List[int]:
+        """Allocate host ports for a project.
+
+        Args:
+            project (str): Key of the fleet, e.g. the compose file path.
+            count (int): Number of ports needed.
+            contiguous (bool): Whether the ports must form one range.
+        """
+        with self.__locked_state() as state:
+            previous = state.pop(project, [])
+            previous_ports = set(previous)
+            reserved = {port for ports in state.values() for port in ports}
+            listening = get_listening_ports()
+            if listening is None:
+                logger.debug("Socket tables unavailable, probing ports one by one")
+
+            def available(port: int) -> bool:
+                if port in reserved:
+                    return False
+                if port in previous_ports:
+                    # Most likely bound by this project's own running fleet
+                    return True
+                if listening is None:
+                    return is_port_free(port)
+                return port not in listening
+
+            if contiguous:
+                ports = self.__find_block(count, available, previous)
+            else:
+                ports = self.__find_ports(count, available, previous)
+            state[project] = ports
+        logger.debug(f"Allocated {count} ports for {project}: {ports[0]}-{ports[-1]}")
+        return ports
+
+    def release(self, project: str) -> bool:
+        """Release a project's ports, returning whether it had any."""
+        with self.__locked_state() as state:
+            released = state.pop(project, None) is not None
+        if released:
+            logger.debug(f"Released ports of {project}")
+        return released
+
+    def __find_ports(
+        self, count: int, available: Callable[[int], bool], previous: List[int]
+    ) -> List[int]:
+        kept = [
+            port for port in previous if port in self.port_range and available(port)
+        ]
+        ports = kept[:count]
+        taken = set(ports)
+        for port in self.port_range:
+            if len(ports) == count:
+                break
+            if port not in taken and available(port):
+                ports.append(port)
+        if len(ports) < count:
+            raise VulcanBoxRuntimeError(
+                f"Only {len(ports)} of {count} ports are free in "
+                f"{self.port_range.start}-{self.port_range.end}",
+                help_text="Use --port-range to choose a larger range.",
+            )
+        return ports
+
+    def __find_block(
+        self, count: int, available: Callable[[int], bool], previous: List[int]
+    ) -> List[int]:
+        if previous and len(previous) == count:
+            block = list(range(previous[0], previous[0] + count))
+            in_range = block[0] in self.port_range and block[-1] in self.port_range
+            if block == previous and in_range and all(map(available, block)):
+                return block
+        run_start, run_length = self.port_range.start, 0
+        for port in self.port_range:
+            if available(port):
+                run_length += 1
+                if run_length == count:
+                    return list(range(run_start, run_start + count))
+            else:
+                run_start, run_length = port + 1, 0
+        raise VulcanBoxRuntimeError(
+            f"No block of {count} consecutive free ports in "
+            f"{self.port_range.start}-{self.port_range.end}",
+            help_text="Use --port-range to choose a larger range.",
+        )
+
+    @staticmethod
+    def __is_deleted_file(project: str) -> bool:
+        """Check whether a project keyed by compose file path was deleted."""
+        return os.path.isabs(project) and not os.path.exists(project)
+
+    @contextmanager
+    def __locked_state(self) -> Iterator[Dict[str, List[int]]]:
+        """Load the state file under an exclusive lock and save it after."""
+        if self.state_path is None:
+            yield {}
+            return
+        with open(f"{self.state_path}.lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                with open(self.state_path, "r") as f:
+                    state = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                state = {}
+            for project in [key for key in state if self.__is_deleted_file(key)]:
+                logger.debug(f"Dropping ports of deleted compose file {project}")
+                del state[project]
+            yield state
+            content = json.dumps(state, sort_keys=True)
+            atomic_write(self.state_path, content.encode("utf-8"))
@@ -0,0 +1,207 @@
+"""Dependency-aware scheduling of image builds."""
+
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Final, List, Optional, Sequence, Set
+
+from vulcanbox.core.constants import VulcanBoxFileType
+from vulcanbox.core.errors import VulcanBoxInputError
+
+logger = logging.getLogger(__name__)
+
+FROM_PATTERN: Final[re.Pattern] = re.compile(
+    r"^\s*FROM\s+(?:--\S+\s+)*(?P<image>\S+)(?:\s+AS\s+(?P<stage>\S+))?",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class BuildNode:
+    """A Dockerfile to build and the other nodes it is built FROM."""
+
+    name: str
+    dockerfile: str
+    repository: str
+    base_images: List[str]
+    parents: Set[str] = field(default_factory=set)
+
+
+@dataclass(frozen=True)
+class BuildResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    tag: Optional[str] = None
+    error: Optional[str] = None
+
+
+def get_image_name(dockerfile: str) -> str:
+    """Derive an image name from a Dockerfile path.
+
+    'api.Dockerfile' and 'Dockerfile.api' give 'api'; a plain 'Dockerfile'
+    takes the name of its directory.
+    """
+    path = os.path.abspath(dockerfile)
+    base_name = os.path.basename(path).replace(VulcanBoxFileType.DOCKERFILE, "")
+    base_name = base_name.strip(".-_")
+    return base_name or os.path.basename(os.path.dirname(path))
+
+
+def parse_base_images(dockerfile: str) -> List[str]:
+    """List the external images a Dockerfile builds FROM.
+
+    References to earlier stages of the same Dockerfile are left out.
+    """
+    base_images: List[str] = []
+    stages: Set[str] = set()
+    with open(dockerfile, "r") as f:
+        for line in f:
+            match = FROM_PATTERN.match(line)
+            if match is None:
+                continue
+            image = match.group("image")
+            if image.lower() not in stages:
+                base_images.append(image)
+            if match.group("stage"):
+                stages.add(match.group("stage").lower())
+    return base_images
+
+
+def __get_repository(image: str) -> str:
+    """Strip the tag or digest from an image reference."""
+    image = image.split("@", 1)[0]
+    name, _, tag = image.rpartition(":")
+    if name and "/" not in tag:
+        return name
+    return image
+
+
+def plan_builds(
+    dockerfiles: Sequence[str], get_repository: Callable[[str], str]
+) -> Dict[str, BuildNode]:
+    """Build the dependency graph between a set of Dockerfiles.
+
+    A Dockerfile depends on another when it builds FROM the other's
+    repository. Duplicate image names and dependency cycles are rejected.
+    """
+    nodes: Dict[str, BuildNode] = {}
+    for dockerfile in dockerfiles:
+        name = get_image_name(dockerfile)
+        if name in nodes:
+            raise VulcanBoxInputError(
+                f"Dockerfiles {nodes[name].dockerfile} and {dockerfile} "
+                f"would both build image '{name}'"
+            )
+        nodes[name] = BuildNode(
+            name=name,
+            dockerfile=dockerfile,
+            repository=get_repository(name),
+            base_images=parse_base_images(dockerfile),
+        )
+
+    by_repository = {node.repository: node.name for node in nodes.values()}
+    for node in nodes.values():
+        for image in node.base_images:
+            parent = by_repository.get(__get_repository(image))
+            if parent is not None and parent != node.name:
+                node.parents.add(parent)
+
+    __check_acyclic(nodes)
+    return nodes
+
+
+def __check_acyclic(nodes: Dict[str, BuildNode]) -> None:
+    remaining = {name: set(node.parents) for name, node in nodes.items()}
+    while remaining:
+        ready = [name for name, parents in remaining.items() if not parents]
+        if not ready:
+            raise VulcanBoxInputError(
+                f"Dockerfiles have circular FROM dependencies: {sorted(remaining)}"
+            )
+        for name in ready:
+            del remaining[name]
+        for parents in remaining.values():
+            parents.difference_update(ready)
+
+
+def run_builds(
+    nodes: Dict[str, BuildNode],
+    build: Callable[[BuildNode, List[str]], str],
+    workers: int,
+) -> Dict[str, BuildResult]:
+    """Run builds concurrently in dependency order.
+
+    A node starts as soon as all of its parents have built; at most
+    `workers` builds run at once. If a build fails, everything that
+    depends on it is skipped.
+
+    Args:
+        nodes (Dict[str, BuildNode]): The planned builds.
+        build (Callable): Builds one node given its parents' image tags,
+            and returns the resulting tag.
+        workers (int): Maximum number of concurrent builds.
+    """
+    children: Dict[str, List[str]] = defaultdict(list)
+    waiting = {name: set(node.parents) for name, node in nodes.items()}
+    for name, node in nodes.items():
+        for parent in node.parents:
+            children[parent].append(name)
+
+    results: Dict[str, BuildResult] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running: Dict[Future, str] = {}
+
+        def submit(name: str) -> None:
+            node = nodes[name]
+            parent_tags = sorted(results[parent].tag for parent in node.parents)
+            logger.debug(f"Scheduling build of {name} ({node.dockerfile})")
+            running[executor.submit(__timed_build, build, node, parent_tags)] = name
+
+        for name in sorted(name for name, parents in waiting.items() if not parents):
+            submit(name)
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                if results[name].status != "built":
+                    __skip_descendants(name, children, results)
+                    continue
+                for child in children[name]:
+                    waiting[child].discard(name)
+                    if not waiting[child] and child not in results:
+                        submit(child)
+    return results
+
+
+def __timed_build(
+    build: Callable[[BuildNode, List[str]], str],
+    node: BuildNode,
+    parent_tags: List[str],
+) -> BuildResult:
+    start = time.perf_counter()
+    try:
+        tag = build(node, parent_tags)
+    except Exception as err:
+        logger.debug(f"Build of {node.name} failed", exc_info=True)
+        return BuildResult(
+            node.name, "failed", time.perf_counter() - start, error=str(err)
+        )
+    return BuildResult(node.name, "built", time.perf_counter() - start, tag=tag)
+
+
+def __skip_descendants(
+    name: str, children: Dict[str, List[str]], results: Dict[str, BuildResult]
+) -> None:
+    for child in children[name]:
+        if child not in results:
+            results[child] = BuildResult(
+                child, "skipped", error=f"base image '{name}' did not build"
+            )
+            __skip_descendants(child, children, results)
@@ -0,0 +1,101 @@
+"""Loading of bundled, precompiled and user override templates.
+
+This module only depends on Jinja2, so the package build script can
+import it to precompile the bundled templates.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from typing import Any, Dict, Final, List, Optional
+
+from jinja2 import BaseLoader, ChoiceLoader, Environment, FileSystemLoader, ModuleLoader
+
+from vulcanbox import __version__
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR: Final[str] = os.path.join(os.path.dirname(__file__), "templates")
+COMPILED_TEMPLATE_DIR: Final[str] = os.path.join(
+    os.path.dirname(__file__), "templates_compiled"
+)
+TEMPLATE_DIR_ENV_VAR: Final[str] = "VULCANBOX_TEMPLATE_DIR"
+MANIFEST_FILE: Final[str] = "manifest.json"
+ENVIRONMENT_OPTIONS: Final[Dict[str, Any]] = {
+    "trim_blocks": False,
+    "lstrip_blocks": False,
+}
+
+
+def get_override_dir() -> Optional[str]:
+    """Get the user's template override directory, if one is set."""
+    return os.environ.get(TEMPLATE_DIR_ENV_VAR) or None
+
+
+def get_loader(
+    override_dir: Optional[str] = None, compiled_dir: Optional[str] = None
+) -> BaseLoader:
+    """Get the loader for the template environment.
+
+    Templates are looked up in the user's override directory first, then
+    in the precompiled modules, so bundled templates are not parsed at
+    runtime. The bundled sources are only read when the package was not
+    built with precompiled templates, or they are out of date.
+
+    Args:
+        override_dir (str, optional): Directory of user templates that
+            replace bundled templates of the same name.
+        compiled_dir (str, optional): Directory of precompiled template
+            modules, by default the one built with the package.
+    """
+    compiled_dir = compiled_dir or COMPILED_TEMPLATE_DIR
+    loaders: List[BaseLoader] = []
+    if override_dir is not None:
+        loaders.append(FileSystemLoader(override_dir))
+    if __is_compiled(compiled_dir):
+        loaders.append(ModuleLoader(compiled_dir))
+    else:
+        logger.debug("No up-to-date precompiled templates, parsing bundled sources")
+    loaders.append(FileSystemLoader(TEMPLATE_DIR))
+    return ChoiceLoader(loaders)
+
+
+def compile_templates(target: str = COMPILED_TEMPLATE_DIR) -> int:
+    """Compile the bundled templates to Python modules.
+
+    The target directory is replaced, and a manifest of the package version
+    and source digests is written so outdated modules are not loaded after
+    a template changes.
+
+    Args:
+        target (str): Directory to write the compiled modules to.
+
+    Returns:
+        int: Number of templates compiled.
+    """
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), **ENVIRONMENT_OPTIONS)
+    names = env.list_templates(extensions=["j2"])
+    shutil.rmtree(target, ignore_errors=True)
+    env.compile_templates(target, zip=None, filter_func=lambda name: name in names)
+    with open(os.path.join(target, MANIFEST_FILE), "w", encoding="utf-8") as file:
+        json.dump(__get_manifest(names), file, indent=2, sort_keys=True)
+    return len(names)
+
+
+def __get_manifest(names: List[str]) -> Dict[str, Any]:
+    digests = {}
+    for name in names:
+        with open(os.path.join(TEMPLATE_DIR, name), "rb") as file:
+            digests[name] = hashlib.sha256(file.read()).hexdigest()
+    return {"version": __version__, "digests": digests}
+
+
+def __is_compiled(compiled_dir: str) -> bool:
+    try:
+        with open(os.path.join(compiled_dir, MANIFEST_FILE), encoding="utf-8") as file:
+            manifest = json.load(file)
+        return manifest == __get_manifest(list(manifest["digests"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
@@ -1,13 +1,138 @@
 import logging
 import os
-from typing import Dict, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Final, Iterable, Iterator, List, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache
 
+from vulcanbox.core.cache import get_cache_dir, hash_json
 from vulcanbox.core.errors import VulcanBoxInputError
+from vulcanbox.core.files import write_if_changed
+from vulcanbox.core.output import emit_event
+from vulcanbox.core.template_loader import (
+    ENVIRONMENT_OPTIONS,
+    TEMPLATE_DIR,
+    get_loader,
+    get_override_dir,
+)
 
 logger = logging.getLogger(__name__)
 
+RENDER_CACHE_SIZE: Final[int] = 128
+RENDER_CACHE_MAX_CHARS: Final[int] = 64 * 1024
+WRITE_BLOCK_CHARS: Final[int] = 64 * 1024
+
+
+@lru_cache(maxsize=None)
+def get_environment(
+    bytecode_cache_dir: Optional[str] = None, override_dir: Optional[str] = None
+) -> Environment:
+    """Get the shared template environment.
+
+    One environment is kept per bytecode cache and override directory, so
+    compiled templates are reused by every templated file in the process.
+    Bundled templates load from precompiled modules when available; the
+    bytecode cache persists any templates parsed from source across runs.
+    """
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    return Environment(
+        loader=get_loader(override_dir),
+        bytecode_cache=bytecode_cache,
+        **ENVIRONMENT_OPTIONS,
+    )
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered templates keyed by (template, context hash)."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.__entries: OrderedDict[Tuple[str, str], str] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[str]:
+        with self.__lock:
+            if key not in self.__entries:
+                return None
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+    def put(self, key: Tuple[str, str], value: str) -> None:
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+render_cache = RenderCache(RENDER_CACHE_SIZE)
+
+
+def collapse_whitespace(chunks: Iterable[str]) -> Iterator[str]:
+    """Strip trailing whitespace and collapse runs of blank lines.
+
+    Leading blank lines are dropped and blank lines between content are
+    collapsed to one. Yields one line at a time, so only the current line
+    is kept in memory.
+    """
+    pending = ""
+    blank_lines = 0
+    started = False
+    for chunk in chunks:
+        *lines, pending = (pending + chunk).split("\n")
+        for line in lines:
+            line = line.rstrip()
+            if not line:
+                blank_lines += 1
+                continue
+            if started and blank_lines:
+                yield "\n"
+            started = True
+            blank_lines = 0
+            yield line + "\n"
+    pending = pending.rstrip()
+    if pending:
+        if started and blank_lines:
+            yield "\n"
+        yield pending
+
+
+def coalesce_chunks(chunks: Iterable[str], size: int) -> Iterator[str]:
+    """Join small chunks into blocks of at least size characters."""
+    block: List[str] = []
+    block_chars = 0
+    for chunk in chunks:
+        block.append(chunk)
+        block_chars += len(chunk)
+        if block_chars >= size:
+            yield "".join(block)
+            block = []
+            block_chars = 0
+    if block:
+        yield "".join(block)
+
+
+def ensure_trailing_newline(chunks: Iterable[str]) -> Iterator[str]:
+    """Pass chunks through, adding a final newline if the output lacks one."""
+    last = ""
+    for chunk in chunks:
+        if chunk:
+            last = chunk
+            yield chunk
+    if not last.endswith("\n"):
+        yield "\n"
+
 
 class BaseTemplatedFile:
     """Base class for templated files."""
@@ -25,13 +150,10 @@ class BaseTemplatedFile:
         self.__name = name
         self.__file_type = file_type
         self.template_src = src
-        self.template_dir = os.path.join(os.path.dirname(__file__), "templates")
+        self.template_dir = TEMPLATE_DIR
         self.source = os.path.join(self.template_dir, src)
-        self.env = Environment(
-            loader=FileSystemLoader(self.template_dir),
-            trim_blocks=False,
-            lstrip_blocks=False,
-        )
+        self.override_dir = get_override_dir()
+        self.env = get_environment(get_cache_dir("templates"), self.override_dir)
         self.context = context
         self.whitespace = whitespace
         self.__destination = os.path.join(os.getcwd(), self.__name)
@@ -44,21 +166,62 @@ class BaseTemplatedFile:
     def destination(self) -> str:
         return self.__destination
 
-    def __render_template(self, file: str) -> str:
-        """Render a template file with the given context."""
+    def __render_template(self, file: str) -> Iterator[str]:
+        """Render a template file with the given context, chunk by chunk.
+
+        Chunks pass through the output filters as they are generated.
+        Renders up to RENDER_CACHE_MAX_CHARS long are memoized, so larger
+        outputs are never held in memory as a whole.
+        """
+        try:
+            cache_key = (
+                os.path.join(self.override_dir or TEMPLATE_DIR, file),
+                hash_json([self.whitespace, self.context]),
+            )
+        except TypeError:
+            logger.debug(f"Context for {file} is not hashable, skipping render cache")
+            cache_key = None
+        if cache_key is not None:
+            cached_content = render_cache.get(cache_key)
+            if cached_content is not None:
+                logger.debug(f"Render cache hit: {file}")
+                yield cached_content
+                return
+
         template = self.env.get_template(file)
-        rendered_content = template.render(self.context)
+        chunks = template.generate(self.context)
         if not self.whitespace:
-            rendered_content.replace("\n", "")
-        if not rendered_content.endswith("\n"):
-            rendered_content += "\n"
-        return rendered_content
-
-    def write(self) -> None:
-        """Write the contents to file."""
-        with open(self.__destination, "w") as f:
-            file_content = self.__render_template(
-                f"{self.template_src}/{self.__file_type}.j2"
-            )
-            f.write(file_content)
+            chunks = collapse_whitespace(chunks)
+        chunks = coalesce_chunks(ensure_trailing_newline(chunks), WRITE_BLOCK_CHARS)
+
+        buffer: Optional[List[str]] = [] if cache_key is not None else None
+        buffered_chars = 0
+        for chunk in chunks:
+            if buffer is not None:
+                buffer.append(chunk)
+                buffered_chars += len(chunk)
+                if buffered_chars > RENDER_CACHE_MAX_CHARS:
+                    buffer = None
+            yield chunk
+        if buffer is not None:
+            render_cache.put(cache_key, "".join(buffer))
+
+    def write(self) -> bool:
+        """Write the contents to file.
+
+        The render is streamed to disk, and the file is replaced atomically
+        only if its contents change, keeping its mtime otherwise.
+
+        Returns:
+            bool: True if the file was written, False if it was unchanged.
+        """
+        chunks = self.__render_template(f"{self.template_src}/{self.__file_type}.j2")
+        written = write_if_changed(
+            self.__destination, (chunk.encode("utf-8") for chunk in chunks)
+        )
+        if written:
             logger.info(f"Wrote to file: {self.__destination}")
+        else:
+            logger.info(f"File unchanged, skipped writing: {self.__destination}")
+        emit_event("file_written", path=self.__destination, written=written)
+        return written
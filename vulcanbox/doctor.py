@@ -1,15 +1,34 @@
+import json
 import logging
+import os
+import shutil
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, Final, List, Optional, Tuple
 
 import click
 
+from vulcanbox.core.cache import get_cache_dir
 from vulcanbox.core.constants import ConsoleIcons
 from vulcanbox.core.errors import VulcanBoxRuntimeError
+from vulcanbox.core.files import atomic_write
+from vulcanbox.core.output import echo, emit_event, print_success, print_warning
 
 logger = logging.getLogger(__name__)
 
+CACHE_FILE: Final[str] = "doctor.json"
+DEFAULT_CACHE_TTL: Final[int] = 3600
+DEFAULT_TIMEOUT: Final[float] = 5.0
+DEFAULT_PINGS: Final[int] = 10
+DOCKER_PLUGIN_DIRS: Final[List[str]] = [
+    "/usr/local/lib/docker/cli-plugins",
+    "/usr/local/libexec/docker/cli-plugins",
+    "/usr/lib/docker/cli-plugins",
+    "/usr/libexec/docker/cli-plugins",
+]
+
 
 @dataclass(frozen=True)
 class CliDependency:
@@ -17,63 +36,238 @@ class CliDependency:
     command: str
     version_flag: str
     install_guide: str
+    plugin: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    tool: CliDependency
+    installed: bool
+    version: str = ""
+    timed_out: bool = False
+    cached: bool = False
+
+
+DEPENDENCIES: Final[List[CliDependency]] = [
+    CliDependency(
+        name="Docker",
+        command="docker",
+        version_flag="--version",
+        install_guide="https://docs.docker.com/get-started/get-docker/",
+    ),
+    CliDependency(
+        name="Docker Compose",
+        command="docker compose",
+        version_flag="version",
+        install_guide="https://docs.docker.com/compose/install/",
+        plugin="docker-compose",
+    ),
+    CliDependency(
+        name="Git",
+        command="git",
+        version_flag="--version",
+        install_guide="https://git-scm.com/book/en/v2/Getting-Started-Installing-Git",
+    ),
+]
 
 
 @click.command("doctor")
-def doctor():
-    tools = [
-        CliDependency(
-            name="Docker",
-            command="docker",
-            version_flag="--version",
-            install_guide="https://docs.docker.com/get-started/get-docker/",
-        ),
-        CliDependency(
-            name="Docker Compose",
-            command="docker compose",
-            version_flag="version",
-            install_guide="https://docs.docker.com/compose/install/",
-        ),
-        CliDependency(
-            name="Git",
-            command="git",
-            version_flag="--version",
-            install_guide="https://git-scm.com/book/en/v2/Getting-Started-Installing-Git",
-        ),
-    ]
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Ignore cached results and check every dependency again.",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_TIMEOUT,
+    show_default=True,
+    help="Seconds to wait for each check.",
+)
+@click.option(
+    "--perf",
+    is_flag=True,
+    help="Measure the Docker host's latency, disk usage and build settings.",
+)
+@click.option(
+    "--pings",
+    type=click.IntRange(min=1),
+    default=DEFAULT_PINGS,
+    show_default=True,
+    help="Number of daemon round trips to time with --perf.",
+)
+@click.option(
+    "--perf-report",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File to write the --perf results to as JSON",
+)
+def doctor(
+    no_cache: bool,
+    timeout: float,
+    perf: bool,
+    pings: int,
+    perf_report: Optional[str],
+):
+    """Check that VulcanBox's dependencies are installed.
+
+    Checks run concurrently. Successful results are cached for an hour,
+    keyed by the resolved binary path and its modification time. With
+    --perf, the Docker host is measured through its API instead.
+    """
+    if perf:
+        __check_performance(pings, perf_report)
+        return
+
+    tools = DEPENDENCIES
+    cache = {} if no_cache else __load_cache()
+
+    with ThreadPoolExecutor(max_workers=len(tools)) as executor:
+        results = list(executor.map(lambda tool: __check(tool, cache, timeout), tools))
 
     missing_dependencies: List[CliDependency] = []
-    click.echo("Vulcanbox Doctor:")
-    for tool in tools:
-        installed, version = __get_bin_version(f"{tool.command} {tool.version_flag}")
-        if installed:
-            click.secho(f"[{ConsoleIcons.CHECK}] {version}", fg="green")
+    echo("Vulcanbox Doctor:")
+    for result in results:
+        emit_event(
+            "dependency_checked",
+            name=result.tool.name,
+            installed=result.installed,
+            version=result.version,
+            cached=result.cached,
+            timed_out=result.timed_out,
+        )
+        if result.installed:
+            suffix = " (cached)" if result.cached else ""
+            echo(f"[{ConsoleIcons.CHECK}] {result.version}{suffix}", fg="green")
+        elif result.timed_out:
+            echo(
+                f"[{ConsoleIcons.CROSS}] {result.tool.name} did not respond "
+                f"within {timeout:g}s",
+                fg="red",
+            )
+            missing_dependencies.append(result.tool)
         else:
-            click.secho(f"[{ConsoleIcons.CROSS}] {tool.name} not installed", fg="red")
-            missing_dependencies.append(tool)
+            echo(f"[{ConsoleIcons.CROSS}] {result.tool.name} not installed", fg="red")
+            missing_dependencies.append(result.tool)
+    __save_cache(cache)
 
-    print("-" * 20)
+    echo("-" * 20)
     if missing_dependencies:
-        click.secho(
+        echo(
             f"Vulcanbox Doctor found {len(missing_dependencies)} missing dependencies!",
             fg="yellow",
         )
         for dep in missing_dependencies:
-            click.echo(f"- Install {dep.name} from {dep.install_guide}")
+            echo(f"- Install {dep.name} from {dep.install_guide}")
     else:
-        click.echo(f"All {len(tools)} dependencies ready!")
+        echo(f"All {len(tools)} dependencies ready!")
+
+
+def __check_performance(pings: int, perf_report: Optional[str]) -> None:
+    from vulcanbox.core.client import get_client
+    from vulcanbox.core.perf import measure_host
+
+    report = measure_host(get_client(), pings)
+    emit_event("host_report", **report.to_dict())
+    echo("Vulcanbox Doctor (performance):")
+    echo(report.format_table())
+    if perf_report:
+        content = json.dumps(report.to_dict(), indent=4)
+        atomic_write(perf_report, (content + "\n").encode("utf-8"))
+        logger.info(f"Performance report written: {perf_report}")
+
+    echo("-" * 20)
+    for warning in report.warnings:
+        print_warning(warning)
+    if not report.warnings:
+        print_success("Docker host looks healthy")
+
+
+def __check(tool: CliDependency, cache: Dict[str, Dict], timeout: float) -> CheckResult:
+    """Check one dependency, using the cache when its binary is unchanged."""
+    command = f"{tool.command} {tool.version_flag}"
+    cache_key = __get_cache_key(command, tool.plugin)
+    entry = cache.get(cache_key) if cache_key else None
+    if entry and time.time() - entry["checked_at"] < DEFAULT_CACHE_TTL:
+        logger.debug(f"Using cached result for '{command}'")
+        return CheckResult(tool, installed=True, version=entry["version"], cached=True)
+
+    try:
+        installed, version = __get_bin_version(command, timeout)
+    except subprocess.TimeoutExpired:
+        logger.warning(f"Running '{command}' timed out after {timeout:g}s")
+        return CheckResult(tool, installed=False, timed_out=True)
+    if installed and cache_key:
+        cache[cache_key] = {"version": version, "checked_at": time.time()}
+    return CheckResult(tool, installed=installed, version=version)
+
+
+def __get_cache_key(command: str, plugin: Optional[str] = None) -> Optional[str]:
+    """Key a check by its command, resolved binaries and their mtimes.
+
+    Docker CLI plugins such as 'docker compose' are keyed on the plugin
+    binary as well, so upgrading the plugin alone invalidates the result.
+    Checks are not cached if a binary cannot be found.
+    """
+    paths = [shutil.which(command.split()[0])]
+    if plugin is not None:
+        paths.append(__find_docker_plugin(plugin))
+    key = [command]
+    for path in paths:
+        if path is None:
+            return None
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        key.extend([os.path.realpath(path), str(mtime)])
+    return "|".join(key)
+
+
+def __find_docker_plugin(name: str) -> Optional[str]:
+    """Find a Docker CLI plugin binary in the directories the CLI searches."""
+    config_dir = os.environ.get("DOCKER_CONFIG") or os.path.expanduser("~/.docker")
+    for plugin_dir in [os.path.join(config_dir, "cli-plugins"), *DOCKER_PLUGIN_DIRS]:
+        path = os.path.join(plugin_dir, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def __load_cache() -> Dict[str, Dict]:
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return {}
+    try:
+        with open(os.path.join(cache_dir, CACHE_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def __save_cache(cache: Dict[str, Dict]) -> None:
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return
+    content = json.dumps(cache, indent=4, sort_keys=True)
+    try:
+        atomic_write(os.path.join(cache_dir, CACHE_FILE), content.encode("utf-8"))
+    except OSError as err:
+        logger.debug(f"Could not save doctor cache: {err}")
 
 
-def __get_bin_version(command: str) -> Tuple[bool, str]:
-    """Split the input string by spaces and return the rightmost substring."""
+def __get_bin_version(command: str, timeout: float) -> Tuple[bool, str]:
+    """Run a version command and return whether it succeeded, and its output."""
     try:
         result = subprocess.run(
-            command.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            command.split(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=timeout,
         )
         if result.returncode != 0:
             raise VulcanBoxRuntimeError(
-                f"Running '{command}' returned exit code: {result.exit_code}"
+                f"Running '{command}' returned exit code: {result.returncode}"
             )
         return True, result.stdout.decode("utf-8").strip()
-    except (subprocess.CalledProcessError, VulcanBoxRuntimeError):
+    except (subprocess.CalledProcessError, OSError, VulcanBoxRuntimeError):
         return False, ""
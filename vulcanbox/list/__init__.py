@@ -0,0 +1,18 @@
+"""Init list command group."""
+
+import click
+
+from vulcanbox.core.handler import LazyGroup
+
+
+@click.group(
+    "list",
+    cls=LazyGroup,
+    lazy_subcommands={
+        "images": "vulcanbox.list.docker.list_images",
+        "containers": "vulcanbox.list.docker.list_containers",
+    },
+)
+def list_group() -> None:
+    """List images and containers created by VulcanBox."""
+    pass
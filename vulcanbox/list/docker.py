@@ -0,0 +1,125 @@
+import json
+import time
+from typing import Callable, List, Optional
+
+import click
+
+from vulcanbox.core.output import echo, emit_event, format_age, format_size
+
+
+def __list_options(command: Callable) -> Callable:
+    """Options shared by the list commands."""
+    options = [
+        click.option(
+            "--project", type=str, help="Only list this Compose project's objects."
+        ),
+        click.option(
+            "--page",
+            type=click.IntRange(min=1),
+            default=1,
+            show_default=True,
+            help="Page of results to show, newest first.",
+        ),
+        click.option(
+            "--per-page",
+            type=click.IntRange(min=1),
+            default=50,
+            show_default=True,
+            help="Number of results per page.",
+        ),
+        click.option(
+            "--format",
+            "output_format",
+            type=click.Choice(["table", "json"]),
+            default="table",
+            show_default=True,
+            help="Output format.",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def __echo_table(rows: List[List[str]]) -> None:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        echo(
+            "  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+        )
+
+
+@click.command("images")
+@__list_options
+def list_images(
+    project: Optional[str],
+    page: int,
+    per_page: int,
+    output_format: str,
+) -> None:
+    """List images built by VulcanBox."""
+    from vulcanbox.core import inventory
+    from vulcanbox.core.cleanup import get_label_filters
+    from vulcanbox.core.client import get_client
+
+    entries = inventory.list_images(
+        get_client(), get_label_filters(None, project), page, per_page
+    )
+    for entry in entries:
+        emit_event("image", **entry.to_dict())
+    if output_format == "json":
+        echo(json.dumps([entry.to_dict() for entry in entries], indent=4))
+        return
+    now = time.time()
+    rows = [["IMAGE", "ID", "SIZE", "AGE", "CONTEXT"]]
+    for entry in entries:
+        rows.append(
+            [
+                ", ".join(entry.tags) or "<none>",
+                entry.id.split(":", 1)[-1][:12],
+                format_size(entry.size),
+                format_age(now - entry.created),
+                (entry.context or "-")[:12],
+            ]
+        )
+    __echo_table(rows)
+
+
+@click.command("containers")
+@click.option("--fleet", type=str, help="Only list this fleet's containers.")
+@__list_options
+def list_containers(
+    fleet: Optional[str],
+    project: Optional[str],
+    page: int,
+    per_page: int,
+    output_format: str,
+) -> None:
+    """List containers started by VulcanBox."""
+    from vulcanbox.core import inventory
+    from vulcanbox.core.cleanup import get_label_filters
+    from vulcanbox.core.client import get_client
+
+    entries = inventory.list_containers(
+        get_client(), get_label_filters(fleet, project), page, per_page
+    )
+    for entry in entries:
+        emit_event("container", **entry.to_dict())
+    if output_format == "json":
+        echo(json.dumps([entry.to_dict() for entry in entries], indent=4))
+        return
+    now = time.time()
+    rows = [["NAME", "IMAGE", "STATUS", "SIZE", "AGE", "FLEET", "CONTEXT"]]
+    for entry in entries:
+        rows.append(
+            [
+                entry.name,
+                entry.image,
+                entry.status or entry.state,
+                format_size(entry.size),
+                format_age(now - entry.created),
+                entry.fleet or "-",
+                (entry.context or "-")[:12],
+            ]
+        )
+    __echo_table(rows)
@@ -1,13 +1,15 @@
+import atexit
 import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
 
 import click
 import colorama
 
 from vulcanbox import __version__
 from vulcanbox.core.handler import VulcanBoxCliHandler
-from vulcanbox.core.output import ColorHandler
-from vulcanbox.doctor import doctor
-from vulcanbox.new import new_group
+from vulcanbox.core.output import OUTPUT_MODES, ColorHandler, set_output_mode
 
 colorama.init(autoreset=True)
 
@@ -18,21 +20,40 @@ def __get_log_level(verbosity: int) -> int:
 
 
 def __set_logger(level: int):
+    """Log through a queue, so formatting and terminal writes happen on a
+    background thread instead of the thread doing the work."""
     logger = logging.getLogger(__package__)
     log_level = __get_log_level(level)
     logger.setLevel(log_level)
-    handler = ColorHandler()
+    if logger.hasHandlers():
+        return
+    handler = ColorHandler(use_color=sys.stderr.isatty())
     handler.setLevel(log_level)
     formatter = logging.Formatter(
         fmt="[%(asctime)s][%(levelname)s] %(name)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
     handler.setFormatter(formatter)
-    if not logger.hasHandlers():
-        logger.addHandler(handler)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(log_queue))
 
 
-@click.group(cls=VulcanBoxCliHandler)
+@click.group(
+    cls=VulcanBoxCliHandler,
+    lazy_subcommands={
+        "build": "vulcanbox.build.build",
+        "builds": "vulcanbox.builds.builds_group",
+        "doctor": "vulcanbox.doctor.doctor",
+        "down": "vulcanbox.prune.down",
+        "list": "vulcanbox.list.list_group",
+        "new": "vulcanbox.new.new_group",
+        "prune": "vulcanbox.prune.prune",
+        "run": "vulcanbox.run.run",
+    },
+)
 @click.pass_context
 @click.version_option(version=__version__)
 @click.option(
@@ -41,11 +62,15 @@ def __set_logger(level: int):
     count=True,
     help="Increase verbosity. Use multiple times for more detail (e.g., -vv for debug).",
 )
-def cli(context: click.Context, verbose: int):
+@click.option(
+    "--output",
+    type=click.Choice(OUTPUT_MODES),
+    default="text",
+    show_default=True,
+    help="Output mode. 'ndjson' prints one JSON event per line on stdout.",
+)
+def cli(context: click.Context, verbose: int, output: str):
     """VulcanBox: CLI tool for managing containers and virtual machines."""
+    set_output_mode(output)
     __set_logger(verbose)
     context.ensure_object(dict)
-
-
-cli.add_command(new_group)
-cli.add_command(doctor)
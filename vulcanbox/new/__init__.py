@@ -1,14 +1,18 @@
 """Init docker command group."""
 import click
 
-from vulcanbox.new.docker import new_compose, new_image
+from vulcanbox.core.handler import LazyGroup
 
 
-@click.group("new")
+@click.group(
+    "new",
+    cls=LazyGroup,
+    lazy_subcommands={
+        "image": "vulcanbox.new.docker.new_image",
+        "compose": "vulcanbox.new.docker.new_compose",
+        "batch": "vulcanbox.new.batch.new_batch",
+    },
+)
 def new_group() -> None:
     """Create new images and configurations."""
     pass
-
-
-new_group.add_command(new_image)
-new_group.add_command(new_compose)
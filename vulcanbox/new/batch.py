@@ -0,0 +1,197 @@
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Final, List, Optional
+
+import click
+
+from vulcanbox.core.constants import VulcanBoxFileType
+from vulcanbox.core.errors import VulcanBoxInputError, VulcanBoxRuntimeError
+from vulcanbox.core.output import (
+    echo,
+    emit_event,
+    print_success,
+    print_warning,
+    set_output_mode,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS: Final[int] = os.cpu_count() or 1
+CHUNKS_PER_WORKER: Final[int] = 4
+
+
+@dataclass(frozen=True)
+class BatchEntry:
+    name: str
+    context: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    name: str
+    seconds: float
+    path: Optional[str] = None
+    written: bool = False
+    error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "FAILED"
+        return "written" if self.written else "unchanged"
+
+
+@click.command("batch")
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    help="YAML or JSON list of file configurations, as written by --export-config.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=DEFAULT_WORKERS,
+    show_default=True,
+    help="Number of processes rendering files in parallel.",
+)
+def new_batch(manifest: str, workers: int) -> None:
+    """Render many Dockerfiles and Compose files from a manifest.
+
+    Entries are rendered in chunks by a pool of worker processes, each
+    with its own template environment. With one worker, they are
+    rendered in this process.
+    """
+    entries = __load_manifest(manifest)
+    logger.debug(f"Rendering {len(entries)} files from {manifest} ({workers} workers)")
+
+    start = time.perf_counter()
+    if workers == 1 or len(entries) == 1:
+        results = [__render_entry(entry) for entry in entries]
+    else:
+        results = __render_in_processes(entries, min(workers, len(entries)))
+    elapsed = time.perf_counter() - start
+
+    failures = [result for result in results if result.error is not None]
+    for result in results:
+        echo(f"{result.seconds * 1000:9.1f}ms  {result.status:<9}  {result.name}")
+    for result in failures:
+        emit_event("render_failed", name=result.name, error=result.error)
+        print_warning(f"{result.name}: {result.error}")
+
+    cumulative = sum(result.seconds for result in results)
+    written = sum(1 for result in results if result.written)
+    echo("-" * 20)
+    echo(
+        f"Rendered {len(results) - len(failures)}/{len(results)} files "
+        f"({written} written) in {elapsed:.3f}s "
+        f"({cumulative:.3f}s cumulative, {workers} workers)"
+    )
+    if failures:
+        raise VulcanBoxRuntimeError(f"Failed to render {len(failures)} files")
+    print_success(f"Batch complete: {manifest}")
+
+
+def __load_manifest(manifest: str) -> List[BatchEntry]:
+    """Read and validate the manifest entries."""
+    import yaml
+
+    with open(manifest, "r") as manifest_file:
+        try:
+            data = yaml.safe_load(manifest_file)
+        except yaml.YAMLError as err:
+            raise VulcanBoxInputError(f"Could not parse manifest {manifest}: {err}")
+    if isinstance(data, dict):
+        data = data.get("files")
+    if not isinstance(data, list) or not data:
+        raise VulcanBoxInputError(
+            f"Manifest must be a non-empty list of file configurations: {manifest}"
+        )
+
+    entries: List[BatchEntry] = []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict) or not isinstance(item.get("name"), str):
+            raise VulcanBoxInputError(f"Manifest entry {index} has no 'name'")
+        context = item.get("context", {})
+        if not isinstance(context, dict):
+            raise VulcanBoxInputError(
+                f"Manifest entry '{item['name']}' has an invalid 'context'"
+            )
+        entries.append(BatchEntry(name=item["name"], context=context))
+
+    name_counts = Counter(entry.name for entry in entries)
+    duplicates = sorted(name for name, count in name_counts.items() if count > 1)
+    if duplicates:
+        raise VulcanBoxInputError(f"Manifest lists files more than once: {duplicates}")
+    return entries
+
+
+def __render_in_processes(entries: List[BatchEntry], workers: int) -> List[BatchResult]:
+    """Render entries in a process pool, relaying its logs and events."""
+    package_logger = logging.getLogger("vulcanbox")
+    log_queue = multiprocessing.Queue()
+    listener = QueueListener(log_queue, package_logger)
+    listener.start()
+    chunksize = max(1, len(entries) // (workers * CHUNKS_PER_WORKER))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=__init_worker,
+            initargs=(log_queue, package_logger.getEffectiveLevel()),
+        ) as executor:
+            results = list(executor.map(__render_entry, entries, chunksize=chunksize))
+    finally:
+        listener.stop()
+    for result in results:
+        if result.error is None:
+            emit_event("file_written", path=result.path, written=result.written)
+    return results
+
+
+def __init_worker(log_queue: multiprocessing.Queue, log_level: int) -> None:
+    """Prepare a worker process to render entries.
+
+    Logs are sent to the parent through the queue, and events are left
+    to the parent, so workers never write to stdout. The shared template
+    environment is loaded once, before the first entry.
+    """
+    from vulcanbox.core.cache import get_cache_dir
+    from vulcanbox.core.template_loader import get_override_dir
+    from vulcanbox.core.templating import get_environment
+
+    set_output_mode("text")
+    package_logger = logging.getLogger("vulcanbox")
+    package_logger.handlers = [QueueHandler(log_queue)]
+    package_logger.setLevel(log_level)
+    package_logger.propagate = False
+    get_environment(get_cache_dir("templates"), get_override_dir())
+
+
+def __render_entry(entry: BatchEntry) -> BatchResult:
+    """Template a single manifest entry and time it."""
+    from vulcanbox.core.models import DockerCompose, DockerImage
+
+    start = time.perf_counter()
+    try:
+        if VulcanBoxFileType.DOCKER_COMPOSE in entry.name:
+            templated_file = DockerCompose(entry.context, name=entry.name)
+        else:
+            templated_file = DockerImage(entry.name, entry.context)
+        parent_dir = os.path.dirname(templated_file.destination)
+        os.makedirs(parent_dir, exist_ok=True)
+        written = templated_file.write()
+    except Exception as err:
+        logger.debug(f"Failed to render {entry.name}", exc_info=True)
+        return BatchResult(entry.name, time.perf_counter() - start, error=str(err))
+    return BatchResult(
+        entry.name,
+        time.perf_counter() - start,
+        path=templated_file.destination,
+        written=written,
+    )
@@ -1,13 +1,24 @@
 import json
 import logging
 import os
-from typing import List
+from typing import List, Optional
 
 import click
 
+from vulcanbox.core.constants import (
+    BASE_IMAGE_FAMILIES,
+    BaseImageFamily,
+    VulcanBoxLabels,
+)
 from vulcanbox.core.errors import VulcanBoxInputError
-from vulcanbox.core.models import DockerCompose, DockerImage
-from vulcanbox.core.output import print_success, print_warning
+from vulcanbox.core.handler import InteractiveOption
+from vulcanbox.core.output import (
+    echo,
+    is_ndjson,
+    print_success,
+    print_warning,
+)
+from vulcanbox.core.ports import DEFAULT_PORT_RANGE
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +29,7 @@ logger = logging.getLogger(__name__)
     type=str,
     required=True,
     help="Name of Dockerfile",
+    cls=InteractiveOption,
     prompt="Set a name for the Dockerfile",
     default="new.Dockerfile",
 )
@@ -26,6 +38,7 @@ logger = logging.getLogger(__name__)
     type=str,
     required=True,
     help="Base image to use.",
+    cls=InteractiveOption,
     prompt="Choose a base image",
     default="ubuntu:20.04",
 )
@@ -35,16 +48,62 @@ logger = logging.getLogger(__name__)
     help="Build the image after templating",
     default="",
 )
+@click.option(
+    "--cache",
+    type=str,
+    help="Layer cache mode for --build: on, off or from:<image>",
+    default="on",
+    show_default=True,
+)
+@click.option(
+    "--build-log",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File to write the full build log to (default: VulcanBox cache dir)",
+)
+@click.option(
+    "--build-report",
+    type=click.Path(dir_okay=False, writable=True),
+    help="File to write a JSON report of per-step build timings to",
+)
 @click.option(
     "--expose", multiple=True, type=int, help="Ports to expose in the Dockerfile"
 )
+@click.option(
+    "--optimize",
+    type=click.Choice(["auto", *BASE_IMAGE_FAMILIES]),
+    help="Order layers for caching and use BuildKit cache mounts for this base image family",
+)
+@click.option(
+    "--package",
+    "packages",
+    multiple=True,
+    type=str,
+    help="System package to install, with --optimize",
+)
 @click.option(
     "--export-config",
     is_flag=True,
     help="Export the current configurations of the templated Dockerfile",
 )
-def new_image(name: str, base: str, expose: List[int], build: str, export_config: bool):
-    """Initialize a template Dockerfile."""
+def new_image(
+    name: str,
+    base: str,
+    expose: List[int],
+    build: str,
+    cache: str,
+    build_log: Optional[str],
+    build_report: Optional[str],
+    optimize: Optional[str],
+    packages: List[str],
+    export_config: bool,
+):
+    """Initialize a template Dockerfile.
+
+    With --optimize, dependency manifests are copied and installed before
+    the source, so source changes do not invalidate the dependency layers,
+    and package manager caches are kept in BuildKit cache mounts. Cache
+    mounts are left out with --build, which uses the classic builder.
+    """
     # Create project directory if it doesn't exist
     new_file = os.path.join(os.getcwd(), name)
     if os.path.exists(new_file):
@@ -53,7 +112,18 @@ def new_image(name: str, base: str, expose: List[int], build: str, export_config
     logger.debug(f"Creating new Dockerfile: {name} [base image {base}]")
     if build:
         logger.debug(f"Image will build automatically after {name} is created")
+    from vulcanbox.core.models import BuildCachePolicy, DockerImage
+
+    cache_policy = BuildCachePolicy.parse(cache)
     context = {"base_image": base, "ports": expose}
+    if packages and not optimize:
+        raise VulcanBoxInputError(
+            "System packages can only be installed with --optimize"
+        )
+    if optimize:
+        family = __detect_family(base) if optimize == "auto" else optimize
+        logger.debug(f"Optimizing Dockerfile for the {family} family")
+        context.update(optimize=family, packages=list(packages), cache_mounts=not build)
     image = DockerImage(name, context)
     image.write()
     print_success(f"Created new Dockerfile: {new_file}")
@@ -61,8 +131,14 @@ def new_image(name: str, base: str, expose: List[int], build: str, export_config
     if build:
         if image.is_built():
             raise VulcanBoxInputError(f"Image already built: {image.image_tag}")
-        built_image = image.build(build)
+        built_image = image.build(build, cache=cache_policy, log_file=build_log)
         logger.info(f"Finished building image: {built_image.id}")
+        if image.build_report.steps:
+            echo(image.build_report.format_table())
+        if build_report:
+            from vulcanbox.core.buildlog import write_build_report
+
+            write_build_report(build_report, [image.build_report])
 
     if export_config:
         base_image_used = base.replace(":", "-")
@@ -73,7 +149,24 @@ def new_image(name: str, base: str, expose: List[int], build: str, export_config
         logger.debug(f"Creating new config file at {exported_config_file}")
         with open(exported_config_file, "w") as json_file:
             json.dump(image.json(), json_file, indent=4)
-            click.echo(f"Config JSON exported: {exported_config_file}")
+            echo(f"Config JSON exported: {exported_config_file}")
+
+
+def __detect_family(base_image: str) -> str:
+    """Guess the base image family from its repository name."""
+    repository = base_image.split("@")[0].rsplit(":", 1)[0].rsplit("/", 1)[-1]
+    for family, keywords in (
+        (BaseImageFamily.PYTHON, ("python",)),
+        (BaseImageFamily.NODE, ("node",)),
+        (BaseImageFamily.APK, ("alpine",)),
+        (BaseImageFamily.APT, ("debian", "ubuntu")),
+    ):
+        if any(keyword in repository for keyword in keywords):
+            return family
+    raise VulcanBoxInputError(
+        f"Cannot tell the family of base image '{base_image}', "
+        f"use --optimize with one of: {', '.join(BASE_IMAGE_FAMILIES)}"
+    )
 
 
 @click.command("compose")
@@ -82,6 +175,7 @@ def new_image(name: str, base: str, expose: List[int], build: str, export_config
     type=str,
     required=True,
     help="Base Dockerfile to use as image.",
+    cls=InteractiveOption,
     prompt="Choose a target Dockerfile",
     default="Dockerfile",
 )
@@ -89,6 +183,7 @@ def new_image(name: str, base: str, expose: List[int], build: str, export_config
     "--expose",
     type=int,
     help="Port to expose.",
+    cls=InteractiveOption,
     prompt="Port to expose (22 for SSH)",
     default=22,
 )
@@ -97,6 +192,7 @@ def new_image(name: str, base: str, expose: List[int], build: str, export_config
     type=int,
     required=True,
     help="Replica count.",
+    cls=InteractiveOption,
     prompt="Set replica count",
     default=1,
 )
@@ -105,13 +201,59 @@ def new_image(name: str, base: str, expose: List[int], build: str, export_config
     is_flag=True,
     help="Link service instances with private network",
 )
-def new_compose(image: str, expose: int, count: str, with_network: bool) -> None:
-    """Initialize a template Docker Compose suite."""
+@click.option(
+    "--build-mode",
+    type=click.Choice(["per-service", "shared"]),
+    default="per-service",
+    show_default=True,
+    help="Build one image for each replica, or one shared image scaled to all replicas.",
+)
+@click.option(
+    "--tag",
+    type=str,
+    help="Use an existing image tag instead of building the Dockerfile.",
+)
+@click.option(
+    "--port-range",
+    type=str,
+    default=DEFAULT_PORT_RANGE,
+    show_default=True,
+    help="Range of host ports to map replicas to.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Overwrite an existing compose file without asking.",
+)
+def new_compose(
+    image: str,
+    expose: int,
+    count: str,
+    with_network: bool,
+    build_mode: str,
+    tag: Optional[str],
+    port_range: str,
+    force: bool,
+) -> None:
+    """Initialize a template Docker Compose suite.
+
+    In shared build mode, the image is built once (or taken from --tag)
+    and a single service is scaled to the replica count.
+
+    Host ports are picked from --port-range, skipping ports that are in
+    use on this host or already given to another vulcanbox fleet.
+    """
     # Set compose file path to current working dir
     compose_file = os.path.join(os.getcwd(), "docker-compose.yml")
 
     # Input validation
-    if os.path.exists(compose_file):
+    if os.path.exists(compose_file) and not force:
+        if is_ndjson():
+            # Prompts would write to stdout, which carries only events
+            raise VulcanBoxInputError(
+                f"Compose file already exists: {compose_file}",
+                help_text="Pass --force to overwrite it.",
+            )
         if not click.confirm(
             f"Compose file already exists in current directory, overwrite?",
             default=True,
@@ -119,20 +261,44 @@ def new_compose(image: str, expose: int, count: str, with_network: bool) -> None
             print_warning("[USER ABORTED] Compose generation cancelled.")
             return
     image_file = os.path.join(os.getcwd(), image)
-    if not os.path.exists(image_file):
+    if not tag and not os.path.exists(image_file):
         raise VulcanBoxInputError(f"Specified Dockerfile does not exist: {image_file}")
     if count < 1:
         raise VulcanBoxInputError(f"Replica count must at least 1 but got {count}")
     if expose < 1024 and expose != 22:
         raise VulcanBoxInputError(f"Cannot expose port {expose} (privileged)")
 
+    from vulcanbox.core.models import DockerCompose, DockerImage
+    from vulcanbox.core.ports import PortAllocator, PortRange
+    from vulcanbox.core.scheduler import get_image_name
+
+    allocator = PortAllocator(PortRange.parse(port_range))
+    host_ports = allocator.allocate(
+        compose_file, count, contiguous=build_mode == "shared"
+    )
+
+    image_tag = tag
+    if image_tag is None and build_mode == "shared":
+        image_tag = f"{DockerImage.get_repository(get_image_name(image))}:latest"
     context = {
         "image": image,
         "count": count,
         "port": expose,
         "with_network": with_network,
+        "host_ports": host_ports,
+        "build_mode": build_mode,
+        "image_tag": image_tag,
+        "build": tag is None,
+        "labels": {
+            VulcanBoxLabels.MANAGED: "true",
+            VulcanBoxLabels.PROJECT: os.path.basename(os.getcwd()),
+        },
+        "service_label": VulcanBoxLabels.SERVICE,
     }
-    logger.debug(f"Creating new Compose file: using '{image}', {count} replicas")
+    logger.debug(
+        f"Creating new Compose file: using '{image_tag or image}', {count} replicas "
+        f"({build_mode} build)"
+    )
     compose = DockerCompose(context)
     compose.write()
     print_success(f"Created new Docker Compose suite: {compose_file}")
@@ -0,0 +1,136 @@
+import logging
+from typing import Optional, Set
+
+import click
+
+from vulcanbox.core.errors import VulcanBoxRuntimeError
+from vulcanbox.core.output import (
+    echo,
+    emit_event,
+    format_size,
+    print_success,
+    print_warning,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def __cleanup_options(command):
+    """Options shared by 'down' and 'prune'."""
+    options = [
+        click.option("--fleet", type=str, help="Only remove this fleet's containers."),
+        click.option(
+            "--project", type=str, help="Only remove this Compose project's objects."
+        ),
+        click.option(
+            "--dry-run", is_flag=True, help="List what would be removed and exit."
+        ),
+        click.option(
+            "--workers",
+            type=click.IntRange(min=1),
+            default=8,
+            show_default=True,
+            help="Maximum number of objects removed concurrently.",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+@click.command("down")
+@__cleanup_options
+def down(
+    fleet: Optional[str], project: Optional[str], dry_run: bool, workers: int
+) -> None:
+    """Stop and remove vulcanbox containers and networks."""
+    __cleanup(False, fleet, project, dry_run, workers)
+
+
+@click.command("prune")
+@__cleanup_options
+def prune(
+    fleet: Optional[str], project: Optional[str], dry_run: bool, workers: int
+) -> None:
+    """Stop and remove vulcanbox containers and networks, and remove its images."""
+    __cleanup(True, fleet, project, dry_run, workers)
+
+
+def __cleanup(
+    include_images: bool,
+    fleet: Optional[str],
+    project: Optional[str],
+    dry_run: bool,
+    workers: int,
+) -> None:
+    from vulcanbox.core.cleanup import (
+        find_resources,
+        get_label_filters,
+        get_released_compose_files,
+        remove_resources,
+    )
+    from vulcanbox.core.client import get_client
+
+    client = get_client()
+    label_filters = get_label_filters(fleet, project)
+    resources = find_resources(client, label_filters, include_images)
+    logger.debug(f"Found {len(resources)} objects labelled {label_filters}")
+    if not resources:
+        echo("Nothing to remove")
+        return
+
+    if dry_run:
+        for resource in resources:
+            emit_event(
+                "resource_found",
+                kind=resource.kind,
+                id=resource.id,
+                name=resource.name,
+                size=resource.size,
+            )
+            echo(
+                f"would remove  {resource.kind:<9}  {resource.name}  "
+                f"{format_size(resource.size)}"
+            )
+        echo("-" * 20)
+        echo(
+            f"Would remove {__count(resources)}, reclaiming up to "
+            f"{format_size(sum(resource.size for resource in resources))}"
+        )
+        return
+
+    removals = remove_resources(client, resources, workers)
+    __release_ports(get_released_compose_files(removals))
+    for removal in removals:
+        status = "removed" if removal.removed else "failed"
+        echo(f"{status:<12}  {removal.resource.kind:<9}  {removal.resource.name}")
+    failures = [removal for removal in removals if not removal.removed]
+    for removal in failures:
+        print_warning(f"{removal.resource.name}: {removal.error}")
+
+    removed = [removal.resource for removal in removals if removal.removed]
+    echo("-" * 20)
+    echo(
+        f"Removed {__count(removed)}, reclaimed up to "
+        f"{format_size(sum(resource.size for resource in removed))}"
+    )
+    if failures:
+        raise VulcanBoxRuntimeError(f"{len(failures)} objects were not removed")
+    print_success("Cleanup complete")
+
+
+def __release_ports(compose_files: Set[str]) -> None:
+    """Free the host ports reserved for removed Compose fleets."""
+    if not compose_files:
+        return
+    from vulcanbox.core.ports import DEFAULT_PORT_RANGE, PortAllocator, PortRange
+
+    allocator = PortAllocator(PortRange.parse(DEFAULT_PORT_RANGE))
+    for compose_file in sorted(compose_files):
+        allocator.release(compose_file)
+
+
+def __count(resources) -> str:
+    kinds = ("container", "network", "image")
+    counts = {kind: sum(1 for item in resources if item.kind == kind) for kind in kinds}
+    return ", ".join(f"{count} {kind}s" for kind, count in counts.items() if count)
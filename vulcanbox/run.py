@@ -0,0 +1,75 @@
+import logging
+import time
+import uuid
+
+import click
+
+from vulcanbox.core.errors import VulcanBoxInputError, VulcanBoxRuntimeError
+from vulcanbox.core.output import echo, print_success, print_warning
+
+logger = logging.getLogger(__name__)
+
+
+@click.command("run")
+@click.option("--image", type=str, required=True, help="Tag or ID of the image to run")
+@click.option(
+    "--replicas",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of containers to start.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Maximum number of containers started concurrently.",
+)
+def run(image: str, replicas: int, workers: int) -> None:
+    """Start replicas of an image as detached containers.
+
+    Containers are labelled with the image and a fleet ID, and the
+    startup latency of each one is reported.
+    """
+    from docker.errors import ImageNotFound
+
+    from vulcanbox.core.client import get_client
+    from vulcanbox.core.fleet import start_containers
+    from vulcanbox.core.perf import percentile
+
+    client = get_client()
+    try:
+        client.images.get(image)
+    except ImageNotFound:
+        raise VulcanBoxInputError(
+            f"Image not found: {image}",
+            help_text="Build it first with 'vulcanbox build'.",
+        )
+
+    fleet = uuid.uuid4().hex[:8]
+    logger.info(f"Starting {replicas} replicas of {image} as fleet {fleet}")
+    start = time.perf_counter()
+    results = start_containers(client, image, replicas, fleet, workers)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        status = "started" if result.started else "failed"
+        echo(
+            f"{result.seconds:8.2f}s  {status:<8}  {result.name}  "
+            f"{(result.container_id or '')[:12]}"
+        )
+    failures = [result for result in results if not result.started]
+    for result in failures:
+        print_warning(f"{result.name}: {result.error}")
+
+    latencies = [result.seconds for result in results if result.started]
+    echo("-" * 20)
+    echo(
+        f"Started {len(latencies)}/{replicas} containers of fleet {fleet} in "
+        f"{elapsed:.2f}s (p50 {percentile(latencies, 50):.2f}s, "
+        f"p95 {percentile(latencies, 95):.2f}s)"
+    )
+    if failures:
+        raise VulcanBoxRuntimeError(f"{len(failures)} containers did not start")
+    print_success(f"All {replicas} containers started")